@@ -0,0 +1,96 @@
+"""Benchmark de la eliminación de contenido repetido del scraper.
+
+Uso:
+    python benchmarks/bench_dedup.py [--sections 3 10 30] [--paragraphs 40] [--repeat N]
+
+Genera resultados de scrape_site sintéticos en los que la página principal y
+sus secciones comparten cabecera, pie, aviso de cookies y párrafos casi
+iguales (con una palabra distinta), y mide el tiempo de dedupe_scrape y el
+tamaño del markdown resultante antes y después, en caracteres y en tokens
+aproximados (caracteres / 4).
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from content_dedup import dedupe_scrape  # noqa: E402
+from markdown_builder import build_markdown  # noqa: E402
+
+BOILERPLATE = [
+    {"type": "p", "content": "Utilizamos cookies propias y de terceros para mejorar nuestros servicios. "
+                             "Si continúa navegando, consideramos que acepta su uso."},
+    {"type": "p", "content": "Inicio Habitaciones Restaurantes Spa Ofertas Contacto"},
+    {"type": "h2", "content": "Síguenos en redes sociales"},
+    {"type": "p", "content": "© 2024 Hotel Playa. Todos los derechos reservados. Aviso legal y política de privacidad."},
+]
+
+
+def synthetic_result(sections, paragraphs, seed=0):
+    rng = random.Random(seed)
+    words = ['hotel', 'playa', 'suite', 'spa', 'reserva', 'oferta', 'cancún', 'vista', 'mar', 'restaurante',
+             'piscina', 'desayuno', 'familia', 'golf', 'traslado', 'terraza']
+
+    def paragraph():
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(15, 60)))
+
+    shared = [paragraph() for _ in range(paragraphs // 4)]
+
+    def page():
+        content = list(BOILERPLATE[:2])
+        for _ in range(paragraphs):
+            if shared and rng.random() < 0.3:
+                # Párrafo compartido con una palabra cambiada
+                text = rng.choice(shared).split()
+                text[rng.randrange(len(text))] = rng.choice(words)
+                content.append({"type": "p", "content": ' '.join(text)})
+            else:
+                content.append({"type": "p", "content": paragraph()})
+        return content + list(BOILERPLATE[2:])
+
+    return {
+        "url": "https://example.com/es",
+        "title": "Hotel Playa",
+        "main_content": page(),
+        "links": [],
+        "images": [],
+        "sections": [{"title": f"Sección {i}", "url": f"https://example.com/s/{i}", "content": page()}
+                     for i in range(sections)],
+    }
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sections', type=int, nargs='+', default=[3, 10, 30])
+    parser.add_argument('--paragraphs', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'secciones':>10}{'bloques':>10}{'tras dedup':>12}{'tokens':>10}{'tras dedup':>12}{'tiempo':>12}")
+    for sections in args.sections:
+        data = synthetic_result(sections, args.paragraphs)
+        deduped = dedupe_scrape(data)
+
+        def blocks(result):
+            return len(result['main_content']) + sum(len(section['content']) for section in result['sections'])
+
+        before = len(build_markdown(data)) // 4
+        after = len(build_markdown(deduped)) // 4
+        elapsed = best_of(lambda: dedupe_scrape(data), args.repeat)
+        print(f"{sections:>10}{blocks(data):>10}{blocks(deduped):>12}{before:>10}{after:>12}{elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
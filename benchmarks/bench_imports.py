@@ -0,0 +1,128 @@
+"""Presupuesto de tiempo de importación de los módulos de src/.
+
+Uso:
+    python benchmarks/bench_imports.py [--repeat N] [--scale X]
+
+Importa cada módulo en un intérprete nuevo con -X importtime, toma la mediana
+del tiempo acumulado de N repeticiones y la compara con su presupuesto
+(multiplicado por --scale en máquinas más lentas). Comprueba además que
+importar el módulo no carga dependencias pesadas que solo deberían cargarse
+al construir el equipo o al usar las herramientas. Termina con código 1 si
+algún módulo supera su presupuesto o carga una dependencia no permitida.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+# Presupuesto en milisegundos de cada módulo
+BUDGETS_MS = {
+    'artifact_store': 30,
+    'document_model': 40,
+    'markdown_parser': 20,
+    'markdown_builder': 10,
+    'revealjs_renderer': 20,
+    'slide_renderers': 50,
+    'deck_pipeline': 60,
+    'scrape_manifest': 20,
+    'deck_bundle': 60,
+    # Incluye la importación de Pillow cuando está instalado
+    'image_pipeline': 60,
+    'disk_cache': 30,
+    'context_budget': 100,  # incluye tiktoken si está instalado
+    'dag_scheduler': 40,
+    'crew_setup': 10,
+    'llm_replay': 10,
+    'batch_runner': 60,
+    'deck_service': 120,
+    'main': 20,
+    'market_research_crew': 50,
+    'web_to_revealjs_fixed2': 50,
+    'web_to_keynote': 60,
+    'html_parsers': 10,
+    'content_dedup': 20,
+    'crawl_frontier': 20,
+    'fetch_policy': 10,
+    'http_pool': 300,
+    'async_http_pool': 600,
+    'scraper': 600,
+    'llm_cache': None,  # importa crewai: se mide pero no tiene presupuesto
+}
+
+# Dependencias pesadas y módulos que pueden cargarlas al importarse
+HEAVY_MODULES = ['crewai', 'langchain', 'langchain_community', 'requests', 'bs4', 'lxml', 'selectolax', 'aiohttp']
+ALLOWED_HEAVY = {
+    'http_pool': {'requests'},
+    'async_http_pool': {'requests', 'aiohttp'},
+    'scraper': {'requests', 'aiohttp'},
+    'llm_cache': {'crewai', 'langchain', 'langchain_community', 'requests', 'aiohttp'},
+}
+
+# Con importlib.import_module -X importtime no registra el propio módulo
+PROBE = """
+import json, sys
+import {module}
+print(json.dumps(sorted(name for name in {heavy!r} if name in sys.modules)))
+"""
+
+
+def measure(module):
+    """Importa module en un intérprete nuevo; devuelve (milisegundos, dependencias pesadas cargadas)."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    # Formato: "import time:  self [us] | cumulative | imported package"
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line.split(':', 1)[1].split('|')]
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000.0, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplicador de los presupuestos')
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'módulo':<26}{'mediana':>10}{'presupuesto':>14}  dependencias pesadas")
+    for module, budget in BUDGETS_MS.items():
+        try:
+            runs = [measure(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module:<26}{'error':>10}{'':>14}  {e}")
+            failures += 1
+            continue
+
+        median = statistics.median(ms for ms, _ in runs)
+        heavy = runs[-1][1]
+        forbidden = [name for name in heavy if name not in ALLOWED_HEAVY.get(module, set())]
+        over = budget is not None and median > budget * args.scale
+        status = 'FALLO' if over or forbidden else 'ok'
+        failures += status != 'ok'
+
+        limit = f"{budget * args.scale:.0f} ms" if budget is not None else '-'
+        loaded = ', '.join(heavy) or '-'
+        if forbidden:
+            loaded += f" (no permitidas: {', '.join(forbidden)})"
+        print(f"{module:<26}{median:>7.1f} ms{limit:>14}  {loaded}  [{status}]")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
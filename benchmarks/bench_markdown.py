@@ -0,0 +1,122 @@
+"""Benchmark del parser de markdown de las diapositivas frente al bucle por líneas anterior.
+
+Uso:
+    python benchmarks/bench_markdown.py [--blocks 2000 20000 100000] [--repeat N]
+
+Genera documentos con build_markdown a partir de páginas sintéticas con el
+número de bloques indicado y mide el rendimiento (MB/s) de slides_from_markdown
+y del bucle por líneas de _markdown_to_slides. Comprueba además que el
+parser reconstruye las mismas diapositivas que slides_from_page.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from document_model import Page, slides_from_markdown, slides_from_page  # noqa: E402
+from markdown_builder import build_markdown  # noqa: E402
+
+
+def synthetic_page(blocks, seed=0):
+    """Genera el resultado de scrape_site de una página con secciones, imágenes y enlaces."""
+    rng = random.Random(seed)
+    words = ['hotel', 'playa', 'suite', 'spa', 'reserva', 'oferta', 'cancún', 'vista', 'mar', 'restaurante']
+    main_content = []
+    for i in range(blocks):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(5, 40)))
+        kind = rng.random()
+        if kind < 0.08:
+            main_content.append({"type": "h2", "content": text[:40].strip()})
+        elif kind < 0.15:
+            main_content.append({"type": "h3", "content": text[:30].strip()})
+        else:
+            main_content.append({"type": "p", "content": text})
+    sections = [
+        {"title": f"Sección {i}", "url": f"https://example.com/s/{i}",
+         "content": [{"type": "p", "content": ' '.join(rng.choice(words) for _ in range(20))} for _ in range(5)]}
+        for i in range(blocks // 50)
+    ]
+    return {
+        "url": "https://example.com/es",
+        "title": "Catálogo",
+        "main_content": main_content,
+        "links": [{"text": f"Enlace {i}", "href": f"/p/{i}"} for i in range(20)],
+        "images": [{"alt": f"Foto {i}", "src": f"https://example.com/img/{i}.jpg"} for i in range(blocks // 20)],
+        "sections": sections,
+    }
+
+
+def line_loop_slides(markdown_content):
+    """Bucle por líneas de la implementación anterior (split('\\n') y startswith)."""
+    lines = markdown_content.split('\n')
+    presentation_title = ""
+    slides = []
+    current_slide = None
+
+    for line in lines:
+        if line.startswith('# ') and not presentation_title:
+            presentation_title = line[2:].strip()
+            current_slide = {"title": presentation_title, "content": [], "type": "title"}
+            slides.append(current_slide)
+            continue
+        if line.startswith('## '):
+            current_slide = {"title": line[3:].strip(), "content": [], "type": "section"}
+            slides.append(current_slide)
+            continue
+        if line.startswith('### '):
+            current_slide = {"title": line[4:].strip(), "content": [], "type": "content"}
+            slides.append(current_slide)
+            continue
+        if current_slide and line.strip():
+            if line.startswith('!['):
+                img_parts = line.split('](')
+                if len(img_parts) > 1:
+                    current_slide["content"].append({"type": "image", "alt": img_parts[0][2:], "src": img_parts[1][:-1]})
+            elif line.startswith('- ['):
+                link_parts = line[3:].split('](')
+                if len(link_parts) > 1:
+                    current_slide["content"].append({"type": "link", "text": link_parts[0][1:], "href": link_parts[1][:-1]})
+            else:
+                current_slide["content"].append({"type": "text", "text": line})
+
+    slides.append({
+        "title": "¡Gracias!",
+        "content": [{"type": "text", "text": "Presentación generada automáticamente basada en " + presentation_title}],
+        "type": "end"
+    })
+    return presentation_title, slides
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blocks', type=int, nargs='+', default=[2000, 20000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'bloques':>9}{'tamaño':>10}{'por líneas':>14}{'parser':>14}  igual que la página")
+    for blocks in args.blocks:
+        data = synthetic_page(blocks)
+        markdown = build_markdown(data)
+        megabytes = len(markdown.encode('utf-8')) / 1e6
+        same = slides_from_markdown(markdown) == slides_from_page(Page.from_scrape(data))
+
+        loop_s = best_of(lambda: line_loop_slides(markdown), args.repeat)
+        parser_s = best_of(lambda: slides_from_markdown(markdown), args.repeat)
+        print(f"{blocks:>9}{megabytes:>7.1f} MB{megabytes / loop_s:>9.1f} MB/s{megabytes / parser_s:>9.1f} MB/s"
+              f"  {'sí' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
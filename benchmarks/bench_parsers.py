@@ -0,0 +1,120 @@
+"""Benchmark de los backends de parseo HTML del scraper.
+
+Uso:
+    python benchmarks/bench_parsers.py [--corpus DIR] [--pages N] [--repeat N]
+
+Sin --corpus genera páginas sintéticas bien formadas (cabecera con scripts y
+estilos, navegación, párrafos con enlaces y entidades, listas, tablas,
+bloques <pre> e imágenes, con el sangrado habitual). Con --corpus recorre los
+ficheros .html guardados en DIR. Mide el tiempo de extract_page con cada
+backend instalado y compara el JSON con el de html.parser. En páginas reales
+mal formadas las diferencias son las que enumera src/html_parsers.py.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from html_parsers import BACKENDS, available_backends  # noqa: E402
+from scraper import MAIN_TAGS, SECTION_TAGS, extract_page  # noqa: E402
+
+
+def synthetic_corpus(count=20, blocks=300, seed=0):
+    """Genera páginas bien formadas con la estructura habitual de una web."""
+    rng = random.Random(seed)
+    words = ['hotel', 'playa', 'suite', 'spa', 'reserva', 'oferta', 'cancún', 'vista', 'mar', 'restaurante',
+             'piscina', 'desayuno', 'familia', 'golf', 'traslado', 'terraza']
+
+    def sentence(low=5, high=40):
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(low, high)))
+
+    pages = []
+    for page in range(count):
+        parts = [f'<!DOCTYPE html>\n<html lang="es">\n<head>\n  <meta charset="utf-8">\n'
+                 f'  <title>Página {page} &ndash; Hotel</title>\n'
+                 f'  <style>body {{ margin: 0 }} p > a {{ color: red }}</style>\n'
+                 f'  <script>window.dataLayer = []; if (a < b && c > d) {{ track("<p>"); }}</script>\n'
+                 f'</head>\n<body>\n  <nav>\n    <ul>\n']
+        parts += [f'      <li><a href="/seccion-{i}">Sección {i}</a></li>\n' for i in range(12)]
+        parts.append('    </ul>\n  </nav>\n  <main>\n')
+        for block in range(blocks):
+            kind = rng.random()
+            if kind < 0.1:
+                parts.append(f'    <h2>{sentence(2, 6)}</h2>\n')
+            elif kind < 0.15:
+                parts.append(f'    <h3>{sentence(2, 5)}</h3>\n')
+            elif kind < 0.22:
+                parts.append(f'    <figure>\n      <img src="/img/{block}.jpg" alt="{sentence(1, 4)}">\n'
+                             f'    </figure>\n')
+            elif kind < 0.27:
+                items = ''.join(f'      <li>{sentence(2, 8)}</li>\n' for _ in range(rng.randint(2, 6)))
+                parts.append(f'    <ul>\n{items}    </ul>\n')
+            elif kind < 0.3:
+                rows = ''.join(f'      <tr><td>{sentence(1, 3)}</td><td>{rng.randint(50, 500)} &euro;</td></tr>\n'
+                               for _ in range(rng.randint(2, 5)))
+                parts.append(f'    <table>\n{rows}    </table>\n')
+            elif kind < 0.32:
+                parts.append(f'    <pre>\n  {sentence(3, 8)}\n    {sentence(3, 8)}\n</pre>\n')
+            else:
+                parts.append(f'    <p>{sentence()} <a href="/p/{block}">ver <b>más</b></a>\n'
+                             f'      &amp; {sentence(1, 10)}&nbsp;&copy;</p>\n')
+        parts.append('  </main>\n  <footer>\n    <p>&copy; Grand Oasis</p>\n  </footer>\n</body>\n</html>\n')
+        pages.append((f'sintetica-{page}', ''.join(parts)))
+    return pages
+
+
+def load_corpus(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', help='Directorio con páginas .html guardadas')
+    parser.add_argument('--pages', type=int, default=20, help='Páginas sintéticas sin --corpus')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+        if not pages:
+            sys.exit(f"No hay páginas .html en {args.corpus}")
+    else:
+        pages = synthetic_corpus(args.pages)
+    total_bytes = sum(len(html.encode('utf-8')) for _, html in pages)
+    print(f"{len(pages)} páginas, {total_bytes / 1024:.0f} KiB\n")
+
+    reference = None
+    # html.parser va primero y sirve de referencia para el resto
+    for name in sorted(available_backends(), key=lambda backend_name: backend_name != 'html.parser'):
+        backend = BACKENDS[name][0]()
+        outputs = {}
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for page_name, html in pages:
+                outputs[page_name] = json.dumps([
+                    extract_page(html, MAIN_TAGS, backend=backend),
+                    extract_page(html, SECTION_TAGS, per_tag_limit=5, backend=backend),
+                ], indent=2)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        if reference is None:
+            reference, reference_time = outputs, best
+        mismatches = [page_name for page_name in outputs if outputs[page_name] != reference[page_name]]
+        status = 'idéntico' if not mismatches else f"{len(mismatches)} páginas distintas: {', '.join(mismatches[:5])}"
+        print(f"{name:<12} {best * 1000:9.1f} ms  {total_bytes / best / 1024 / 1024:7.1f} MiB/s  "
+              f"x{reference_time / best:5.1f}  {status}")
+
+
+if __name__ == '__main__':
+    main()
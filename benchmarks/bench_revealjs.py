@@ -0,0 +1,124 @@
+"""Benchmark del renderizador RevealJS frente a la concatenación de cadenas anterior.
+
+Uso:
+    python benchmarks/bench_revealjs.py [--slides 1000 5000 20000] [--repeat N]
+
+Genera presentaciones sintéticas con el número de diapositivas indicado y
+mide el tiempo de generar el HTML de las diapositivas con html += (como hacía
+_generate_revealjs_html) y con las plantillas de revealjs_renderer, además de
+render_revealjs y write_revealjs completos. Comprueba que el HTML es idéntico
+cuando el contenido no tiene caracteres que escapar.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from revealjs_renderer import render_revealjs, render_slide, write_revealjs  # noqa: E402
+
+
+def synthetic_deck(count, seed=0):
+    """Genera diapositivas de catálogo con textos, imágenes y enlaces."""
+    rng = random.Random(seed)
+    words = ['hotel', 'playa', 'suite', 'spa', 'reserva', 'oferta', 'cancún', 'vista', 'mar', 'restaurante']
+    slides = [{"title": "Catálogo", "type": "title", "content": [{"type": "text", "text": "Catálogo generado"}]}]
+    for i in range(count):
+        content = []
+        for _ in range(rng.randint(2, 8)):
+            kind = rng.random()
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(5, 30)))
+            if kind < 0.1:
+                content.append({"type": "image", "alt": text[:30], "src": f"https://example.com/img/{i}.jpg"})
+            elif kind < 0.25:
+                content.append({"type": "link", "text": text[:30], "href": f"https://example.com/{i}"})
+            else:
+                content.append({"type": "text", "text": text})
+        slides.append({"title": f"Producto {i}", "type": "content" if i % 10 else "section", "content": content})
+    slides.append({"title": "¡Gracias!", "type": "end", "content": [{"type": "text", "text": "Fin"}]})
+    return slides
+
+
+def concat_slides(slides):
+    """Bucle de diapositivas de la implementación anterior (html += f'...', sin escapar)."""
+    html = ""
+    for slide in slides:
+        slide_class = ""
+        if slide["type"] == "title":
+            slide_class = "title-slide"
+        elif slide["type"] == "end":
+            slide_class = "thanks-slide"
+
+        html += f'            <section class="{slide_class}">\n'
+
+        if slide["type"] == "title":
+            html += f'                <h1>{slide["title"]}</h1>\n'
+        else:
+            html += f'                <h2>{slide["title"]}</h2>\n'
+
+        has_image = any(item["type"] == "image" for item in slide["content"])
+        if has_image:
+            html += '                <div class="image-slide">\n'
+
+        for item in slide["content"]:
+            if item["type"] == "text":
+                html += f'                <p>{item["text"]}</p>\n'
+            elif item["type"] == "image":
+                html += f'                <img src="{item["src"]}" alt="{item["alt"]}">\n'
+            elif item["type"] == "link":
+                html += f'                <p><a href="{item["href"]}" target="_blank">{item["text"]}</a></p>\n'
+
+        if has_image:
+            html += '                </div>\n'
+
+        html += '            </section>\n'
+    return html
+
+
+def template_slides(slides):
+    return ''.join([render_slide(slide) for slide in slides])
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--slides', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'diapositivas':>12}{'html +=':>12}{'plantillas':>12}{'render':>10}{'write':>10}  idéntico")
+    for count in args.slides:
+        slides = synthetic_deck(count)
+        identical = concat_slides(slides) == template_slides(slides)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'deck.html')
+
+            def write():
+                with open(path, 'w', encoding='utf-8') as f:
+                    write_revealjs("Catálogo", slides, f)
+
+            results = [
+                best_of(lambda: concat_slides(slides), args.repeat),
+                best_of(lambda: template_slides(slides), args.repeat),
+                best_of(lambda: render_revealjs("Catálogo", slides), args.repeat),
+                best_of(write, args.repeat),
+            ]
+        concat_ms, template_ms, render_ms, write_ms = results
+        print(f"{count:>12}{concat_ms:>9.1f} ms{template_ms:>9.1f} ms{render_ms:>7.1f} ms{write_ms:>7.1f} ms"
+              f"  {'sí' if identical else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+# Número máximo de artefactos que se conservan en memoria
+ARTIFACT_STORE_MAX = int(os.getenv('ARTIFACT_STORE_MAX', '256'))
+
+# Cómo se pasan los resultados entre herramientas: artifact (identificador) o text (contenido completo)
+TOOL_HANDOFF = os.getenv('TOOL_HANDOFF', 'artifact')
+
+HANDLE_PATTERN = re.compile(r'artifact:[a-z]+-[0-9a-f]{12}')
+
+
+class ArtifactStore:
+    """Almacén en memoria de los objetos que se pasan entre herramientas.
+
+    Cada objeto se guarda bajo un identificador corto (p. ej.
+    artifact:page-1a2b3c4d5e6f) que los agentes se pasan en lugar del
+    contenido completo. Se conservan los max_items usados más recientemente.
+
+    El identificador se deriva del contenido (value.to_text()): el mismo
+    contenido produce el mismo identificador en cualquier ejecución, de modo
+    que los prompts de los agentes no cambian y la caché del LLM sirve sus
+    respuestas cuando la página no ha cambiado.
+    """
+
+    def __init__(self, max_items=ARTIFACT_STORE_MAX):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, value, kind):
+        """Guarda value y devuelve su identificador."""
+        digest = hashlib.sha256(value.to_text().encode('utf-8')).hexdigest()
+        handle = f"artifact:{kind}-{digest[:12]}"
+        with self._lock:
+            self._items[handle] = value
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return handle
+
+    def get(self, handle):
+        """Devuelve el objeto de un identificador o None si no existe."""
+        with self._lock:
+            value = self._items.get(handle)
+            if value is not None:
+                self._items.move_to_end(handle)
+            return value
+
+    def resolve(self, text):
+        """Busca un identificador en un texto (p. ej. la entrada de una herramienta) y devuelve su objeto.
+
+        Devuelve None si el texto no contiene ningún identificador conocido.
+        """
+        if not isinstance(text, str):
+            return None
+        for handle in HANDLE_PATTERN.findall(text):
+            value = self.get(handle)
+            if value is not None:
+                return value
+        return None
+
+
+_default_store = ArtifactStore()
+
+
+def get_store():
+    """Devuelve el almacén de artefactos compartido del proceso."""
+    return _default_store
+
+
+def hand_off(value, kind, store=None):
+    """Prepara la salida de una herramienta.
+
+    En modo artifact guarda value y devuelve su identificador y su resumen;
+    en modo text devuelve el contenido completo (value.to_text()).
+    """
+    if TOOL_HANDOFF != 'artifact':
+        return value.to_text()
+    handle = (store or get_store()).put(value, kind)
+    return f"{handle}\n{value.summary()}"
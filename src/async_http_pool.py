@@ -0,0 +1,186 @@
+import asyncio
+import atexit
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from fetch_policy import (CONNECT_TIMEOUT, READ_TIMEOUT, RETRY_STATUS, BudgetExpiredError, CircuitBreaker,
+                          RetryPolicy)
+from http_pool import (CHUNK_SIZE, DEADLINE, DEFAULT_HEADERS, MAX_BYTES, MAX_WORKERS, OFFLINE,
+                       PER_HOST_LIMIT, CircuitOpenError, build_response, cached_response, check_content_type,
+                       conditional_headers, default_cache, store_response)
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncHttpPool:
+    """Motor de descargas asyncio sobre aiohttp con conexiones keep-alive reutilizables.
+
+    El bucle de eventos vive en un hilo propio, así que el pool puede usarse
+    desde código síncrono (run) y compartirse entre muchas descargas sin un
+    hilo por petición. Ofrece la misma caché, límite de tamaño y filtro de
+    Content-Type, tiempos de espera, reintentos y cortacircuitos que
+    HttpPool y devuelve respuestas de requests ya leídas. La caché en disco
+    se consulta y se escribe en hilos aparte para no bloquear el bucle.
+    """
+
+    def __init__(self, max_connections=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, headers=None,
+                 cache=None, offline=False, retry_policy=None, breaker=None):
+        if aiohttp is None:
+            raise ImportError("El motor asíncrono necesita aiohttp: pip install aiohttp")
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.cache = cache
+        self.offline = offline
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='async-http-pool', daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout=None):
+        """Ejecuta una corrutina en el bucle del pool y espera su resultado."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.per_host_limit)
+            timeout = aiohttp.ClientTimeout(connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+        return self._session
+
+    async def get(self, url, max_bytes=MAX_BYTES, content_types=None, budget=None):
+        """GET asíncrono con caché, reintentos, límite de tamaño y filtro de Content-Type.
+
+        budget (fetch_policy.TimeBudget) limita el tiempo total de la
+        petición, reintentos incluidos.
+        """
+        cached = await asyncio.to_thread(self.cache.get, url) if self.cache is not None else None
+        if self.offline:
+            if cached is None:
+                raise requests.ConnectionError(f"Modo offline: {url} no está en la caché")
+            return check_content_type(cached_response(url, *cached), content_types)
+
+        host = urlsplit(url).netloc.lower()
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Demasiados fallos seguidos en {host}: "
+                                   f"se reintentará en {self.breaker.retry_in(host):.0f}s")
+
+        session = self._get_session()
+        attempt = 0
+        while True:
+            timeout = None
+            if budget is not None:
+                budget.check()
+                timeout = aiohttp.ClientTimeout(total=budget.remaining(), connect=CONNECT_TIMEOUT,
+                                                sock_read=READ_TIMEOUT)
+            try:
+                response = await self._get_once(session, url, cached, max_bytes, content_types, timeout)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if budget is not None and budget.expired():
+                    # El tiempo total se había recortado al presupuesto: el host no ha fallado
+                    raise BudgetExpiredError(f"Presupuesto de tiempo agotado descargando {url}") from e
+                delay = self.retry_policy.delay(attempt, budget=budget)
+                if delay is None:
+                    self.breaker.record_failure(host)
+                    if isinstance(e, asyncio.TimeoutError) and not str(e):
+                        # El tiempo total de aiohttp se agota sin mensaje
+                        raise TimeoutError(f"Tiempo de espera agotado descargando {url}") from e
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    break
+                delay = self.retry_policy.delay(attempt, response.headers.get('Retry-After'), budget)
+                if delay is None:
+                    break
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        if response.status_code in RETRY_STATUS:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        await asyncio.to_thread(store_response, self.cache, url, response)
+        return response
+
+    async def _get_once(self, session, url, cached, max_bytes, content_types, timeout):
+        kwargs = {'timeout': timeout} if timeout is not None else {}
+        async with session.get(url, headers=conditional_headers(cached), **kwargs) as resp:
+            if cached is not None and resp.status == 304:
+                await asyncio.to_thread(self.cache.touch, url)
+                return check_content_type(cached_response(url, *cached), content_types)
+
+            headers = CaseInsensitiveDict(resp.headers)
+            response = build_response(str(resp.url), resp.status, resp.reason, headers, b'',
+                                      encoding=get_encoding_from_headers(headers))
+            # Las respuestas que se pueden reintentar no se filtran por tipo
+            if resp.status not in RETRY_STATUS:
+                check_content_type(response, content_types)
+            response._content, response.truncated = await _read_body(resp, max_bytes)
+            return response
+
+    async def gather(self, coros, deadline=DEADLINE):
+        """Ejecuta las corrutinas a la vez.
+
+        Devuelve una lista en el mismo orden con el resultado o la excepción
+        de cada una. Las que no terminan antes de deadline segundos se
+        cancelan y se devuelven como TimeoutError.
+        """
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        if not tasks:
+            return []
+        await asyncio.wait(tasks, timeout=deadline)
+
+        results = []
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                results.append(TimeoutError(f"Tiempo límite de {deadline}s superado"))
+            elif task.exception() is not None:
+                results.append(task.exception())
+            else:
+                results.append(task.result())
+        return results
+
+    def close(self):
+        if self._session is not None:
+            self.run(self._session.close())
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+async def _read_body(resp, max_bytes):
+    """Lee el cuerpo por bloques hasta max_bytes; devuelve (contenido, truncado)."""
+    chunks = []
+    size = 0
+    async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+        if max_bytes is not None and size + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - size])
+            # La conexión queda con datos sin leer y no se puede reutilizar
+            resp.close()
+            return b''.join(chunks), True
+        chunks.append(chunk)
+        size += len(chunk)
+    return b''.join(chunks), False
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_async_pool():
+    """Devuelve el pool asíncrono compartido del proceso, creándolo en el primer uso."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = AsyncHttpPool(cache=default_cache(), offline=OFFLINE)
+            atexit.register(_default_pool.close)
+        return _default_pool
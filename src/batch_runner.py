@@ -0,0 +1,124 @@
+"""Ejecuta el flujo web → markdown → presentación para muchas URLs en un solo proceso.
+
+Uso:
+    python src/batch_runner.py urls.txt [https://otra-url.com ...] [--pipeline keynote] [--mode direct] [--concurrency 4]
+        [--formats revealjs,keynote,markdown]
+
+Cada argumento puede ser una URL o un fichero con una URL por línea (las
+líneas vacías y las que empiezan por # se ignoran). El módulo del flujo se
+importa una sola vez, de modo que crewai, los agentes, el pool HTTP y los
+parsers se comparten entre todos los trabajos; cada trabajo usa una copia
+del equipo (o, con --mode direct, encadena las herramientas sin agentes) y
+guarda sus resultados en output/<url>/.
+"""
+import argparse
+import importlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import deck_pipeline
+
+# Módulo que implementa cada flujo
+PIPELINES = {
+    'revealjs': 'web_to_revealjs_fixed2',
+    'keynote': 'web_to_keynote',
+}
+
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '../output')
+
+
+def read_urls(sources):
+    """Expande una lista de URLs y ficheros de URLs, sin duplicados y en orden."""
+    urls = []
+    for source in sources:
+        if os.path.isfile(source):
+            with open(source, 'r', encoding='utf-8') as f:
+                lines = [line.strip() for line in f]
+            urls.extend(line for line in lines if line and not line.startswith('#'))
+        else:
+            urls.append(source)
+    return list(dict.fromkeys(urls))
+
+
+def output_dir_for(url, base_dir=OUTPUT_DIR):
+    """Directorio de resultados de una URL, p. ej. output/grand-oasis-cancun-com-es."""
+    slug = re.sub(r'^https?://', '', url.strip())
+    slug = re.sub(r'[^A-Za-z0-9]+', '-', slug).strip('-').lower()
+    return os.path.join(base_dir, slug or 'sin-nombre')
+
+
+def run_job(module, url, output_dir, formats=None):
+    """Ejecuta una copia del equipo del módulo sobre una URL y guarda sus resultados.
+
+    formats son los formatos de presentación que se guardan; el equipo se
+    ejecuta una sola vez y el resto se genera a partir de las mismas diapositivas.
+    Si la página no ha cambiado desde la última ejecución, el equipo no se ejecuta.
+    Devuelve las rutas de los ficheros guardados (o de los que ya había).
+    """
+    if deck_pipeline.is_unchanged(url, output_dir, formats or module.OUTPUT_FORMATS):
+        print(f"Sin cambios en {url}: se conservan los resultados de {output_dir}")
+        return deck_pipeline.previous_outputs(output_dir)
+    crew = module.get_crew().copy()
+    crew_result = crew.kickoff(inputs={'url': url})
+    return module.save_results(crew_result, output_dir, crew=crew, formats=formats)
+
+
+def run_batch(urls, pipeline='revealjs', concurrency=BATCH_CONCURRENCY, base_dir=OUTPUT_DIR, mode='crew', formats=None):
+    """Procesa las URLs con como mucho concurrency trabajos a la vez.
+
+    Devuelve un resumen por URL con su estado, directorio de salida y duración.
+    """
+    module = importlib.import_module(PIPELINES[pipeline])
+
+    def job(url):
+        output_dir = output_dir_for(url, base_dir)
+        start = time.perf_counter()
+        try:
+            if mode == 'direct':
+                module.run_direct(url, output_dir, formats=formats)
+            else:
+                run_job(module, url, output_dir, formats)
+            status = {"status": "ok"}
+        except Exception as e:
+            status = {"status": "error", "error": str(e)}
+        status.update({
+            "url": url,
+            "output_dir": output_dir,
+            "seconds": round(time.perf_counter() - start, 2)
+        })
+        print(f"[{status['status']}] {url} ({status['seconds']}s)")
+        return status
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='batch') as executor:
+        return list(executor.map(job, urls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('sources', nargs='+', help='URLs o ficheros con una URL por línea')
+    parser.add_argument('--pipeline', choices=sorted(PIPELINES), default='revealjs')
+    parser.add_argument('--mode', choices=['crew', 'direct'], default=os.getenv('PIPELINE_MODE', 'crew'))
+    parser.add_argument('--concurrency', type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument('--output', default=OUTPUT_DIR, help='Directorio base de resultados')
+    parser.add_argument('--formats', help='Formatos de presentación separados por comas (revealjs, keynote, markdown)')
+    args = parser.parse_args()
+
+    urls = read_urls(args.sources)
+    print(f"Procesando {len(urls)} URLs con el flujo {args.pipeline} ({args.concurrency} a la vez)...")
+    summary = run_batch(urls, args.pipeline, args.concurrency, args.output, args.mode, args.formats)
+
+    os.makedirs(args.output, exist_ok=True)
+    summary_path = os.path.join(args.output, 'resumen_lote.json')
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    failed = sum(1 for item in summary if item['status'] != 'ok')
+    print(f"Lote completado: {len(summary) - failed} correctas, {failed} con error. Resumen en {summary_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Elimina el contenido repetido de un resultado de scraper.scrape_site.
+
+Las secciones de una web comparten con la página principal la cabecera, el
+pie, el aviso de cookies y los textos de navegación, y el scraper los
+extraía en cada página. Antes de devolver el resultado se quitan:
+
+- Los bloques de plantilla: los que aparecen, con el mismo texto
+  normalizado, en al menos SCRAPER_BOILERPLATE_PAGES páginas. Se eliminan
+  de todas ellas, también de la principal.
+- Las secciones casi idénticas a una página anterior: aquellas cuyo simhash
+  de 64 bits difiere en SCRAPER_DEDUP_DISTANCE bits o menos. Se conservan
+  el título y la URL, pero no el contenido.
+- Los párrafos repetidos o casi repetidos: aquellos cuya similitud de
+  Jaccard con un párrafo anterior, calculada sobre grupos de SHINGLE_SIZE
+  palabras, alcanza SCRAPER_DEDUP_SIMILARITY. Se conserva la primera
+  aparición en orden de documento (la página principal y luego las
+  secciones). Solo se comparan los párrafos de al menos
+  SCRAPER_DEDUP_MIN_WORDS palabras: un "Más información" o una línea de
+  precio se repiten con sentido en varias secciones.
+
+El simhash solo distingue bien los textos largos, así que los párrafos se
+comparan por sus shingles con un índice invertido. Los encabezados solo se
+quitan como plantilla, para no alterar la estructura de las páginas.
+"""
+import hashlib
+import os
+import re
+from collections import Counter
+
+SCRAPER_DEDUP = os.getenv('SCRAPER_DEDUP', 'true').lower() == 'true'
+SCRAPER_DEDUP_DISTANCE = int(os.getenv('SCRAPER_DEDUP_DISTANCE', '3'))
+SCRAPER_DEDUP_SIMILARITY = float(os.getenv('SCRAPER_DEDUP_SIMILARITY', '0.7'))
+SCRAPER_BOILERPLATE_PAGES = int(os.getenv('SCRAPER_BOILERPLATE_PAGES', '3'))
+SCRAPER_DEDUP_MIN_WORDS = int(os.getenv('SCRAPER_DEDUP_MIN_WORDS', '6'))
+
+SHINGLE_SIZE = 2
+HEADING_TYPES = ('h1', 'h2', 'h3')
+
+# Las páginas más cortas no se comparan por simhash: su valor es poco fiable
+_MIN_SIMHASH_WORDS = 50
+_WORD = re.compile(r'\w+')
+
+
+def shingles(words, shingle_size=SHINGLE_SIZE):
+    """Grupos de shingle_size palabras consecutivas de una lista de palabras."""
+    if len(words) <= shingle_size:
+        return [' '.join(words)]
+    return [' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+
+def simhash(words, shingle_size=SHINGLE_SIZE):
+    """Simhash de 64 bits de una lista de palabras."""
+    hashes = [format(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+              for shingle in shingles(words, shingle_size)]
+    # Cada bit vale 1 si lo tienen activado más de la mitad de los shingles
+    half = len(hashes) / 2
+    bits = ''.join('1' if column.count('1') > half else '0' for column in zip(*hashes))
+    return int(bits, 2)
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+class SimhashIndex:
+    """Busca simhash a distancia max_distance o menor sin compararlos todos.
+
+    Los 64 bits se dividen en max_distance + 1 bandas: dos valores a esa
+    distancia coinciden al menos en una banda, así que solo se comparan los
+    que comparten alguna.
+    """
+
+    def __init__(self, max_distance=SCRAPER_DEDUP_DISTANCE):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width = 64 // bands
+        self._bands = [(i * width, 64 if i == bands - 1 else (i + 1) * width) for i in range(bands)]
+        self._buckets = {}
+
+    def _keys(self, value):
+        for i, (start, end) in enumerate(self._bands):
+            yield i, (value >> start) & ((1 << (end - start)) - 1)
+
+    def near(self, value):
+        """Indica si hay algún valor del índice a distancia max_distance o menor."""
+        for key in self._keys(value):
+            for other in self._buckets.get(key, ()):
+                if hamming_distance(value, other) <= self.max_distance:
+                    return True
+        return False
+
+    def add(self, value):
+        for key in self._keys(value):
+            self._buckets.setdefault(key, []).append(value)
+
+
+class ShingleIndex:
+    """Busca textos con una similitud de Jaccard de sus shingles igual o mayor que threshold.
+
+    Solo se comparan los textos que comparten algún shingle con el buscado.
+    """
+
+    def __init__(self, threshold=SCRAPER_DEDUP_SIMILARITY):
+        self.threshold = threshold
+        self._sizes = []
+        self._postings = {}
+
+    def similar(self, shingle_set):
+        """Indica si hay algún texto del índice suficientemente parecido."""
+        overlaps = Counter(doc for shingle in shingle_set for doc in self._postings.get(shingle, ()))
+        return any(overlap / (len(shingle_set) + self._sizes[doc] - overlap) >= self.threshold
+                   for doc, overlap in overlaps.items())
+
+    def add(self, shingle_set):
+        doc = len(self._sizes)
+        self._sizes.append(len(shingle_set))
+        for shingle in shingle_set:
+            self._postings.setdefault(shingle, []).append(doc)
+
+
+def dedupe_scrape(result, max_distance=SCRAPER_DEDUP_DISTANCE, similarity=SCRAPER_DEDUP_SIMILARITY,
+                  min_pages=SCRAPER_BOILERPLATE_PAGES, min_words=SCRAPER_DEDUP_MIN_WORDS):
+    """Devuelve una copia de result sin plantilla, secciones duplicadas ni párrafos repetidos."""
+    sections = result.get('sections') or []
+    pages = [result['main_content']] + [section['content'] for section in sections if 'content' in section]
+    words = [[_WORD.findall(item['content'].lower()) for item in page] for page in pages]
+    keys = [[' '.join(block) for block in page] for page in words]
+
+    page_counts = Counter(key for page in keys for key in set(page) if key)
+    boilerplate = {key for key, count in page_counts.items() if count >= min_pages} if min_pages > 1 else set()
+
+    seen_pages = SimhashIndex(max_distance)
+    seen_blocks = ShingleIndex(similarity)
+    seen_keys = set()
+    cleaned = []
+    for page, page_words, page_keys in zip(pages, words, keys):
+        kept = [(item, block, key) for item, block, key in zip(page, page_words, page_keys) if key not in boilerplate]
+
+        text = [word for _, block, _ in kept for word in block]
+        if len(text) >= _MIN_SIMHASH_WORDS:
+            page_hash = simhash(text)
+            if seen_pages.near(page_hash):
+                cleaned.append([])
+                continue
+            seen_pages.add(page_hash)
+
+        content = []
+        for item, block, key in kept:
+            if item['type'] not in HEADING_TYPES and key and len(block) >= min_words:
+                if key in seen_keys:
+                    continue
+                seen_keys.add(key)
+                shingle_set = set(shingles(block))
+                if seen_blocks.similar(shingle_set):
+                    continue
+                seen_blocks.add(shingle_set)
+            content.append(item)
+        cleaned.append(content)
+
+    deduped = dict(result, main_content=cleaned[0])
+    if 'sections' in result:
+        section_content = iter(cleaned[1:])
+        deduped['sections'] = [dict(section, content=next(section_content)) if 'content' in section else section
+                               for section in sections]
+    return deduped
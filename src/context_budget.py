@@ -0,0 +1,244 @@
+"""Limita el tamaño del contexto que recibe una tarea de un equipo.
+
+Una tarea con context=[...] recibe las salidas completas de sus
+dependencias, y el prompt crece con ellas. compact_context mide cada salida
+en tokens y, si entre todas superan CONTEXT_MAX_TOKENS, reparte el
+presupuesto entre ellas. Las que caben en su parte no se tocan; las demás
+se reducen según CONTEXT_STRATEGY:
+
+- chunk (por defecto): se dividen en fragmentos de unos CONTEXT_CHUNK_TOKENS
+  tokens (menos si su parte del presupuesto es menor) y se conservan el
+  primero y los más relacionados con la tarea (por coincidencia de términos
+  con su descripción), en su orden original. Cada tramo omitido se marca
+  con […], y las marcas cuentan dentro del presupuesto.
+- truncate: se conserva el principio.
+- summarize: las resume el LLM del agente de la tarea. Si no hay LLM o la
+  llamada falla, se usa chunk.
+
+Los tokens se cuentan con tiktoken si está instalado y, si no, se estiman
+como un token cada 4 caracteres.
+"""
+import math
+import os
+import re
+from collections import Counter
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Presupuesto de tokens del contexto de una tarea; 0 desactiva la compactación
+CONTEXT_MAX_TOKENS = int(os.getenv('CONTEXT_MAX_TOKENS', '6000'))
+# chunk, truncate o summarize
+CONTEXT_STRATEGY = os.getenv('CONTEXT_STRATEGY', 'chunk')
+CONTEXT_CHUNK_TOKENS = int(os.getenv('CONTEXT_CHUNK_TOKENS', '300'))
+
+STRATEGIES = ('chunk', 'truncate', 'summarize')
+
+# Mismo modelo por defecto que llm_cache, para contar con su tokenizador
+_MODEL = os.getenv('MODEL', os.getenv('OPENAI_MODEL_NAME', 'gpt-4o-mini'))
+_WORD = re.compile(r'\w{3,}')
+_encoding = None
+
+SUMMARY_PROMPT = (
+    "Resume el siguiente texto en como mucho {max_words} palabras para usarlo como contexto de la tarea "
+    "«{query}». Conserva los datos, cifras, nombres y conclusiones relevantes para ella y responde solo "
+    "con el resumen.\n\n{text}"
+)
+
+
+def count_tokens(text):
+    """Número de tokens de text con el tokenizador del modelo (o una estimación sin tiktoken)."""
+    global _encoding
+    if tiktoken is None:
+        return math.ceil(len(text) / 4)
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.encoding_for_model(_MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding('cl100k_base')
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def allocate(sizes, budget):
+    """Reparte budget entre elementos de los tamaños dados.
+
+    Los que caben en una parte igual conservan su tamaño y lo que sobra se
+    reparte entre los demás.
+    """
+    allocation = list(sizes)
+    pending = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    remaining = budget
+    while pending:
+        share = remaining // len(pending)
+        if sizes[pending[0]] > share:
+            for i in pending:
+                allocation[i] = share
+            break
+        i = pending.pop(0)
+        remaining -= sizes[i]
+    return allocation
+
+
+def compact_context(items, query='', budget=CONTEXT_MAX_TOKENS, strategy=CONTEXT_STRATEGY, summarize=None):
+    """Reduce las salidas de contexto para que entre todas no superen budget tokens.
+
+    query es el texto de la tarea que recibe el contexto (para elegir los
+    fragmentos relevantes) y summarize una función (texto, máximo de tokens)
+    -> resumen para la estrategia summarize. Devuelve la lista de salidas y
+    el número de tokens antes y después.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estrategia de contexto no válida: {strategy} (disponibles: {', '.join(STRATEGIES)})")
+    sizes = [count_tokens(item) for item in items]
+    if not budget or sum(sizes) <= budget:
+        return list(items), sum(sizes), sum(sizes)
+
+    compacted = []
+    for item, size, share in zip(items, sizes, allocate(sizes, budget)):
+        if size <= share:
+            compacted.append(item)
+        elif strategy == 'truncate':
+            compacted.append(_truncate(item, share))
+        elif strategy == 'summarize' and summarize is not None:
+            try:
+                summary = summarize(item, share)
+                compacted.append(summary if count_tokens(summary) <= share else _truncate(summary, share))
+            except Exception as e:
+                print(f"No se pudo resumir el contexto: {str(e)}")
+                compacted.append(_select_chunks(item, share, query))
+        else:
+            compacted.append(_select_chunks(item, share, query))
+    return compacted, sum(sizes), sum(count_tokens(item) for item in compacted)
+
+
+def llm_summarizer(llm, query=''):
+    """Función de resumen para compact_context que usa un LLM de crewai, o None si no lo hay."""
+    if llm is None or not hasattr(llm, 'call'):
+        return None
+
+    def summarize(text, max_tokens):
+        # Unas 0,75 palabras por token
+        prompt = SUMMARY_PROMPT.format(max_words=max(int(max_tokens * 0.75), 20), query=query, text=text)
+        return str(llm.call([{"role": "user", "content": prompt}]))
+
+    return summarize
+
+
+def chunk_text(text, chunk_tokens=CONTEXT_CHUNK_TOKENS):
+    """Divide text en fragmentos de unos chunk_tokens tokens por párrafos (o por líneas si no hay)."""
+    return [chunk for _, chunk in _chunks(text, chunk_tokens)]
+
+
+def _chunks(text, chunk_tokens):
+    # Fragmentos como (separador con el anterior, texto), para volver a unirlos igual que en el original
+    chunks = []
+    current = []
+    current_tokens = 0
+    for separator, piece in _pieces(text, chunk_tokens):
+        tokens = count_tokens(piece)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(_joined(current))
+            current = []
+            current_tokens = 0
+        current.append((separator, piece))
+        current_tokens += tokens
+    if current:
+        chunks.append(_joined(current))
+    return chunks
+
+
+def _pieces(text, chunk_tokens):
+    for paragraph in re.split(r'\n\s*\n', text):
+        if not paragraph.strip():
+            continue
+        if count_tokens(paragraph) > chunk_tokens and '\n' in paragraph.strip():
+            # Párrafo demasiado grande (una tabla o una lista): se divide por líneas, que se
+            # vuelven a unir con un solo salto para no romper la tabla o la lista
+            lines = [line for line in paragraph.split('\n') if line.strip()]
+            yield '\n\n', lines[0]
+            for line in lines[1:]:
+                yield '\n', line
+        else:
+            yield '\n\n', paragraph
+
+
+def _joined(pieces):
+    return pieces[0][0], pieces[0][1] + ''.join(separator + piece for separator, piece in pieces[1:])
+
+
+def _assemble(chunks, selected):
+    # Los fragmentos elegidos con sus separadores y una marca […] en lugar de cada tramo omitido
+    parts = []
+    previous = -1
+    for i in sorted(selected):
+        if i != previous + 1:
+            parts.append('\n\n[…]\n\n' if parts else '[…]\n\n')
+        elif parts:
+            parts.append(chunks[i][0])
+        parts.append(chunks[i][1])
+        previous = i
+    if previous != len(chunks) - 1:
+        parts.append('\n\n[…]' if parts else '[…]')
+    return ''.join(parts)
+
+
+def _select_chunks(text, max_tokens, query):
+    # El primer fragmento y los que más términos comparten con la tarea, en su orden original.
+    # Los fragmentos no superan max_tokens (menos dos marcas), así que el primero siempre cabe
+    marker = count_tokens('\n\n[…]')
+    chunks = _chunks(text, max(min(CONTEXT_CHUNK_TOKENS, max_tokens - 2 * marker), 1))
+    sizes = [count_tokens(chunk) for _, chunk in chunks]
+    terms = set(_WORD.findall(query.lower()))
+    counts = [Counter(_WORD.findall(chunk.lower())) for _, chunk in chunks]
+    frequency = Counter(term for chunk_counts in counts for term in chunk_counts if term in terms)
+
+    def score(i):
+        # BM25 simplificado: saturación de la frecuencia e idf entre los fragmentos
+        return sum(counts[i][term] / (counts[i][term] + 1) * math.log(1 + len(chunks) / frequency[term])
+                   for term in terms if counts[i][term])
+
+    order = [0] + sorted(range(1, len(chunks)), key=lambda i: (-score(i), i))
+    selected = set()
+    used = 0
+    for i in order:
+        # Los separadores y las marcas también cuentan: se mide el texto que quedaría
+        if used + sizes[i] <= max_tokens and count_tokens(_assemble(chunks, selected | {i})) <= max_tokens:
+            selected.add(i)
+            used += sizes[i]
+    if not selected:
+        return _truncate(text, max_tokens)
+    return _assemble(chunks, selected)
+
+
+def _truncate(text, max_tokens):
+    # Principio del texto, cortado en un párrafo si es posible. La marca final
+    # cuenta dentro del presupuesto: se reserva con el total como cota del número
+    total = count_tokens(text)
+    budget = max_tokens - count_tokens(_omitted_marker(total))
+    if budget <= 0:
+        # Ni siquiera cabe la marca
+        return _cut(text, max_tokens)
+    kept = []
+    used = 0
+    for separator, chunk in _chunks(text, max(budget // 4, 1)):
+        size = count_tokens(chunk) + (count_tokens(separator) if kept else 0)
+        if used + size > budget:
+            break
+        kept.append(separator + chunk if kept else chunk)
+        used += size
+    kept = ''.join(kept) or _cut(text, budget)
+    return kept + _omitted_marker(total - count_tokens(kept))
+
+
+def _cut(text, max_tokens):
+    # Principio de text en como mucho max_tokens tokens, sin respetar párrafos
+    text = text[:max(max_tokens, 0) * 4]
+    while text and count_tokens(text) > max_tokens:
+        text = text[:len(text) * 3 // 4]
+    return text
+
+
+def _omitted_marker(omitted):
+    return f"\n\n[… {omitted} tokens omitidos]"
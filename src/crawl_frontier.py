@@ -0,0 +1,186 @@
+"""Frontera de rastreo de las secciones de una página.
+
+El scraper elegía como secciones los tres primeros enlaces relativos con
+como mucho dos segmentos de ruta. CrawlFrontier mantiene en su lugar una
+cola de prioridad (heapq) con los enlaces descubiertos:
+
+- Las URLs se normalizan (esquema y host en minúsculas, sin fragmento, sin
+  puerto por defecto ni parámetros de seguimiento, con la consulta
+  ordenada) y cada una se visita una sola vez.
+- Solo se siguen los enlaces HTTP del mismo host que no apuntan a ficheros
+  (PDF, imágenes, vídeos...) y que robots.txt permite.
+- La prioridad favorece los enlaces de menor profundidad, los que aparecen
+  antes en la página (la navegación), las rutas cortas sin consulta y los
+  textos de enlace breves, y penaliza los de acceso, carrito o textos
+  legales.
+
+Se visitan como mucho SCRAPER_MAX_SECTIONS páginas hasta una profundidad de
+SCRAPER_MAX_DEPTH enlaces desde la principal, y de cada página se siguen
+como mucho sus SCRAPER_CRAWL_BREADTH mejores enlaces. Las peticiones a un mismo host
+se espacian al menos SCRAPER_HOST_DELAY segundos, o lo que indique el
+Crawl-delay de robots.txt si es mayor.
+"""
+import heapq
+import itertools
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+SCRAPER_MAX_DEPTH = int(os.getenv('SCRAPER_MAX_DEPTH', '1'))
+SCRAPER_MAX_SECTIONS = int(os.getenv('SCRAPER_MAX_SECTIONS', '3'))
+SCRAPER_CRAWL_BREADTH = int(os.getenv('SCRAPER_CRAWL_BREADTH', '3'))
+SCRAPER_ROBOTS = os.getenv('SCRAPER_ROBOTS', 'true').lower() == 'true'
+SCRAPER_HOST_DELAY = float(os.getenv('SCRAPER_HOST_DELAY', '0'))
+
+# Parámetros de consulta que no cambian el contenido de la página
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|ref|_ga)$', re.IGNORECASE)
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.zip', '.gz', '.rar',
+                      '.mp3', '.mp4', '.avi', '.mov', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+                      '.css', '.js', '.xml', '.json', '.rss')
+# Textos de enlace que rara vez llevan a contenido útil para la presentación
+LOW_VALUE_TEXT = re.compile(r'login|log in|sign in|iniciar sesi|acceder|registr|carrito|cart|checkout|'
+                            r'privacidad|privacy|cookies|aviso legal|legal|términos|terms|condiciones',
+                            re.IGNORECASE)
+
+
+def normalize_url(url):
+    """Forma canónica de una URL para comparar y visitar cada página una sola vez."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and (scheme, parts.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path) or '/'
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(key)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+def link_priority(link, url, position, depth):
+    """Prioridad de un enlace (menor es antes) según profundidad, posición, ruta y texto."""
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    words = len(link.get('text', '').split())
+    score = depth * 100 + min(position, 50) + len(segments) * 5
+    if parts.query:
+        score += 10
+    if words == 0 or words > 6:
+        score += 10
+    if LOW_VALUE_TEXT.search(link.get('text', '')):
+        score += 50
+    return score
+
+
+class HostRateLimiter:
+    """Reparte turnos por host para que las peticiones se espacien al menos delay segundos."""
+
+    def __init__(self, delay=SCRAPER_HOST_DELAY):
+        self.delay = delay
+        self._delays = {}
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def set_delay(self, host, delay):
+        with self._lock:
+            self._delays[host] = max(delay, self.delay)
+
+    def reserve(self, url):
+        """Reserva el siguiente turno del host de url y devuelve los segundos que hay que esperar."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            delay = self._delays.get(host, self.delay)
+            if delay <= 0:
+                return 0
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + delay
+            return start - now
+
+
+class CrawlFrontier:
+    """Cola de prioridad de las páginas por visitar a partir de root_url.
+
+    El scraper pide lotes con next_batch(), los descarga en paralelo y añade
+    con add_links() los enlaces de cada página descargada. La frontera no
+    hace peticiones: robots.txt se descarga fuera (robots_url) y se pasa a
+    set_robots() antes de añadir los primeros enlaces.
+    """
+
+    def __init__(self, root_url, max_depth=SCRAPER_MAX_DEPTH, max_pages=SCRAPER_MAX_SECTIONS,
+                 breadth=SCRAPER_CRAWL_BREADTH, rate_limiter=None):
+        self.root_url = normalize_url(root_url)
+        self.host = urlsplit(self.root_url).netloc
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.breadth = breadth
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.robots = None
+        self.scheduled = 0
+        self._seen = {self._key(self.root_url)}
+        self._queue = []
+        self._counter = itertools.count()
+
+    @property
+    def robots_url(self):
+        parts = urlsplit(self.root_url)
+        return urlunsplit((parts.scheme, parts.netloc, '/robots.txt', '', ''))
+
+    def set_robots(self, status_code, text):
+        """Carga robots.txt: con 4xx todo está permitido y con 5xx nada."""
+        # robotparser importa urllib.request, que es lento de importar
+        from urllib.robotparser import RobotFileParser
+
+        robots = RobotFileParser(self.robots_url)
+        if status_code >= 500:
+            robots.disallow_all = True
+        elif status_code >= 400:
+            robots.allow_all = True
+        else:
+            robots.parse(text.splitlines())
+        self.robots = robots
+        crawl_delay = robots.crawl_delay('*') if status_code < 400 else None
+        if crawl_delay:
+            self.rate_limiter.set_delay(self.host, float(crawl_delay))
+
+    def add_links(self, links, base_url, depth):
+        """Añade los mejores enlaces de una página de profundidad depth - 1."""
+        if depth > self.max_depth:
+            return
+        candidates = {}
+        for position, link in enumerate(links):
+            href = link.get('href', '').strip()
+            if not href or href.startswith(('#', 'mailto:', 'tel:', 'javascript:')):
+                continue
+            url = normalize_url(urljoin(base_url, href))
+            parts = urlsplit(url)
+            key = self._key(url)
+            if parts.scheme not in ('http', 'https') or parts.netloc != self.host or key in self._seen \
+                    or key in candidates or parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+                continue
+            if self.robots is not None and not self.robots.can_fetch('*', url):
+                continue
+            candidates[key] = (link_priority(link, url, position, depth), url, link)
+
+        for key, (priority, url, link) in heapq.nsmallest(self.breadth, candidates.items(), key=lambda c: c[1][0]):
+            self._seen.add(key)
+            heapq.heappush(self._queue, (priority, next(self._counter), url, link, depth))
+
+    def next_batch(self):
+        """Saca de la cola las mejores páginas que quedan por visitar dentro del límite.
+
+        Devuelve una lista de (url, enlace, profundidad); vacía si no quedan.
+        """
+        batch = []
+        while self._queue and self.scheduled + len(batch) < self.max_pages:
+            _, _, url, link, depth = heapq.heappop(self._queue)
+            batch.append((url, link, depth))
+        self.scheduled += len(batch)
+        return batch
+
+    @staticmethod
+    def _key(url):
+        # /seccion y /seccion/ son la misma página
+        parts = urlsplit(url)
+        return urlunsplit((parts.scheme, parts.netloc, parts.path.rstrip('/') or '/', parts.query, ''))
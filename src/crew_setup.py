@@ -0,0 +1,34 @@
+"""Piezas comunes de los módulos que construyen un equipo de crewai."""
+import threading
+
+
+def lazy_crew(build_crew):
+    """Devuelve una función get_crew que construye el equipo con build_crew en el primer uso.
+
+    Construir el equipo importa crewai y crea los agentes y sus LLM, así
+    que cada módulo lo hace la primera vez que se necesita y no al
+    importarse. Las llamadas siguientes, también desde otros hilos,
+    devuelven el mismo equipo.
+    """
+    crew = []
+    lock = threading.Lock()
+
+    def get_crew():
+        """Devuelve el equipo compartido del módulo, construyéndolo en el primer uso."""
+        with lock:
+            if not crew:
+                crew.append(build_crew())
+            return crew[0]
+
+    return get_crew
+
+
+def crew_memory(enabled):
+    """Indica si el equipo usa memoria.
+
+    La memoria de crewai usa embeddings remotos, así que se desactiva en
+    modo replay aunque esté activada.
+    """
+    from llm_replay import LLM_REPLAY
+
+    return enabled and not LLM_REPLAY
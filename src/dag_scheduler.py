@@ -0,0 +1,121 @@
+"""Ejecuta las tareas de un equipo de crewai según sus dependencias (context=[...]).
+
+Las tareas cuyas dependencias ya han terminado se ejecutan a la vez, con
+como mucho max_workers en paralelo; cada tarea recibe como contexto las
+salidas de las tareas de su context. A diferencia del proceso secuencial de
+crewai, una tarea sin context no recibe las salidas de las anteriores.
+
+Si esas salidas superan CONTEXT_MAX_TOKENS tokens se compactan antes de
+pasarlas a la tarea (ver context_budget).
+"""
+import os
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from context_budget import CONTEXT_MAX_TOKENS, CONTEXT_STRATEGY, compact_context, llm_summarizer
+
+DAG_MAX_WORKERS = int(os.getenv('DAG_MAX_WORKERS', '4'))
+
+# Separador que usa crewai al unir las salidas de las tareas de contexto
+CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+
+def task_dependencies(tasks):
+    """Devuelve, para cada tarea, el conjunto de índices de las tareas de las que depende.
+
+    Lanza ValueError si una dependencia no está en la lista o si hay un ciclo.
+    """
+    index = {id(task): i for i, task in enumerate(tasks)}
+    dependencies = []
+    for task in tasks:
+        context = task.context if isinstance(task.context, list) else []
+        for dependency in context:
+            if id(dependency) not in index:
+                raise ValueError(f"La tarea «{task_name(task)}» depende de una tarea que no está en el equipo")
+        dependencies.append({index[id(dependency)] for dependency in context})
+
+    # Comprobar que no hay ciclos (algoritmo de Kahn)
+    remaining = {i: set(deps) for i, deps in enumerate(dependencies)}
+    while remaining:
+        ready = [i for i, deps in remaining.items() if not deps]
+        if not ready:
+            names = ', '.join(task_name(tasks[i]) for i in sorted(remaining))
+            raise ValueError(f"Dependencias circulares entre las tareas: {names}")
+        for i in ready:
+            del remaining[i]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return dependencies
+
+
+def task_name(task):
+    """Nombre corto de una tarea para los mensajes de progreso."""
+    name = getattr(task, 'name', None)
+    if name:
+        return name
+    description = ' '.join(task.description.split())
+    return description[:50] + ('…' if len(description) > 50 else '')
+
+
+def run_tasks(tasks, max_workers=DAG_MAX_WORKERS, context_budget=CONTEXT_MAX_TOKENS,
+              context_strategy=CONTEXT_STRATEGY):
+    """Ejecuta las tareas respetando sus dependencias y devuelve sus salidas en el mismo orden.
+
+    El contexto de cada tarea se limita a context_budget tokens con
+    context_strategy (0 lo deja completo). Si una tarea falla no se lanzan
+    más tareas y se propaga su excepción cuando terminan las que ya estaban
+    en marcha.
+    """
+    dependencies = task_dependencies(tasks)
+    # Un agente con varias tareas se copia para que sus ejecuciones simultáneas no compartan estado
+    agent_uses = Counter(id(task.agent) for task in tasks)
+
+    outputs = [None] * len(tasks)
+    pending = set(range(len(tasks)))
+    running = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dag') as executor:
+        while pending or running:
+            ready = [i for i in sorted(pending) if all(outputs[d] is not None for d in dependencies[i])]
+            for i in ready:
+                pending.discard(i)
+                context = [_raw(outputs[d]) for d in sorted(dependencies[i])]
+                future = executor.submit(_execute, tasks[i], context, agent_uses[id(tasks[i].agent)] > 1,
+                                         context_budget, context_strategy)
+                running[future] = i
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                if future.exception() is not None:
+                    errors.append(future.exception())
+                    pending.clear()
+                else:
+                    outputs[i] = future.result()
+
+    if errors:
+        raise errors[0]
+    return outputs
+
+
+def _execute(task, context, copy_agent, context_budget, context_strategy):
+    agent = task.agent.copy() if copy_agent else task.agent
+    name = task_name(task)
+    print(f"[inicio] {name}")
+    start = time.perf_counter()
+    if context:
+        # Se compacta aquí para que los resúmenes del LLM no bloqueen a las demás tareas
+        query = f"{task.description}\n{task.expected_output}"
+        context, before, after = compact_context(context, query, context_budget, context_strategy,
+                                                 llm_summarizer(getattr(agent, 'llm', None), query))
+        if after < before:
+            print(f"[contexto] {name}: {before} → {after} tokens ({context_strategy})")
+    output = task.execute_sync(agent=agent, context=CONTEXT_SEPARATOR.join(context) or None)
+    print(f"[ok] {name} ({time.perf_counter() - start:.1f}s)")
+    return output
+
+
+def _raw(output):
+    return getattr(output, 'raw', None) or str(output)
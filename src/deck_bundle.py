@@ -0,0 +1,221 @@
+"""Exporta presentaciones RevealJS autocontenidas que se abren sin conexión.
+
+Con DECK_BUNDLE=files se crea el directorio presentacion_revealjs_offline/
+con index.html, una copia local de reveal.js (vendor/reveal.js/) y las
+imágenes en assets/, nombradas por el hash de su contenido. Con
+DECK_BUNDLE=inline se crea un único presentacion_revealjs_offline.html con
+el CSS y el JavaScript de reveal.js y las imágenes (como data:) incrustados.
+
+reveal.js se descarga una sola vez a REVEALJS_VENDOR_DIR (o se usa la copia
+que ya haya allí). Las imágenes se descargan en paralelo con el pool HTTP
+del scraper, se reducen a la resolución de las diapositivas
+(image_pipeline) y se guardan en un almacén común (BUNDLE_ASSET_DIR) nombradas
+por el SHA-256 de su contenido. Cada presentación enlaza sus ficheros desde
+el almacén con enlaces duros, de modo que una imagen que aparece en varias
+presentaciones se guarda una sola vez en disco. Las imágenes que no se
+pueden descargar se enlazan con su URL absoluta.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+from urllib.parse import urljoin, urlsplit
+
+from revealjs_renderer import REVEALJS_CDN, render_revealjs
+from slide_renderers import paginate_slides
+
+# Modo de exportación: off, files o inline
+DECK_BUNDLE = os.getenv('DECK_BUNDLE', 'off')
+# Origen y copia local de reveal.js (REVEALJS_VENDOR_URL puede apuntar a un servidor local)
+REVEALJS_VENDOR_URL = os.getenv('REVEALJS_VENDOR_URL', REVEALJS_CDN)
+REVEALJS_VENDOR_DIR = os.getenv('REVEALJS_VENDOR_DIR', os.path.join(os.path.dirname(__file__), '../output/vendor/reveal.js'))
+# Almacén de imágenes compartido por todas las presentaciones
+BUNDLE_ASSET_DIR = os.getenv('BUNDLE_ASSET_DIR', os.path.join(os.path.dirname(__file__), '../output/assets'))
+
+BUNDLE_DIRNAME = 'presentacion_revealjs_offline'
+REVEALJS_FILES = ['reset.css', 'reveal.css', 'theme/white.css', 'reveal.js']
+
+# Ruta de reveal.js dentro del directorio de la presentación
+_VENDOR_PATH = 'vendor/reveal.js'
+
+
+def ensure_vendor(vendor_dir=REVEALJS_VENDOR_DIR, base_url=REVEALJS_VENDOR_URL, pool=None):
+    """Descarga los ficheros de reveal.js que falten en vendor_dir y devuelve el directorio.
+
+    Lanza la excepción de la primera descarga que falle; una descarga
+    incompleta (cortada por SCRAPER_MAX_MB o por el presupuesto de tiempo)
+    cuenta como fallida y no se guarda.
+    """
+    missing = [name for name in REVEALJS_FILES if not os.path.exists(os.path.join(vendor_dir, name))]
+    if missing:
+        pool = pool or _get_pool()
+        results = pool.map(lambda name: pool.get(f"{base_url.rstrip('/')}/{name}"), missing)
+        for name, result in zip(missing, results):
+            if isinstance(result, Exception):
+                raise result
+            result.raise_for_status()
+            if result.truncated:
+                raise ValueError(f"Descarga incompleta de reveal.js/{name} ({len(result.content)} bytes)")
+            _write_atomic(os.path.join(vendor_dir, name), result.content)
+    return vendor_dir
+
+
+def fetch_assets(urls, asset_dir=BUNDLE_ASSET_DIR, pool=None, optimize=None):
+    """Descarga en paralelo las imágenes y las guarda en asset_dir por hash de contenido.
+
+    Si optimize (por defecto IMAGE_PIPELINE) está activo y Pillow está
+    instalado, cada imagen se reduce y recomprime en el mismo hilo que la
+    descarga (ver image_pipeline). Devuelve {url: (ruta, tipo de contenido)}
+    con las que se han podido descargar; las URLs repetidas se descargan una
+    sola vez.
+    """
+    from image_pipeline import (IMAGE_MAX_DOWNLOAD_MB, IMAGE_PIPELINE, default_image_cache, optimize_image,
+                                pillow_available)
+
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return {}
+    pool = pool or _get_pool()
+    optimize = IMAGE_PIPELINE if optimize is None else optimize
+    cache = default_image_cache() if optimize and pillow_available() else None
+
+    def fetch(url):
+        response = pool.get(url, max_bytes=int(IMAGE_MAX_DOWNLOAD_MB * 1024 * 1024))
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if response.status_code != 200 or response.truncated or not content_type.startswith('image/'):
+            raise ValueError(f"imagen descartada ({response.status_code}, {content_type or 'sin tipo'})")
+        data = response.content
+        if cache is not None:
+            data, content_type = optimize_image(data, content_type, cache)
+        return data, content_type, len(response.content)
+
+    assets = {}
+    original_bytes = 0
+    final_bytes = 0
+    for url, result in zip(urls, pool.map(fetch, urls)):
+        if isinstance(result, Exception):
+            print(f"No se pudo descargar la imagen {url}: {result}")
+            continue
+        data, content_type, original_size = result
+        digest = hashlib.sha256(data).hexdigest()
+        extension = mimetypes.guess_extension(content_type) or os.path.splitext(urlsplit(url).path)[1]
+        path = os.path.join(asset_dir, digest[:2], digest + extension)
+        if not os.path.exists(path):
+            _write_atomic(path, data)
+        assets[url] = (path, content_type)
+        original_bytes += original_size
+        final_bytes += len(data)
+
+    if cache is not None and assets:
+        print(f"Imágenes: {original_bytes / 1e6:.2f} MB descargados, {final_bytes / 1e6:.2f} MB tras reducirlas")
+    return assets
+
+
+def bundle_deck(deck, output_dir, mode=DECK_BUNDLE, base_url=None, vendor_dir=REVEALJS_VENDOR_DIR,
+                asset_dir=BUNDLE_ASSET_DIR, pool=None):
+    """Exporta las diapositivas como presentación RevealJS sin dependencias de red.
+
+    base_url resuelve las imágenes con ruta relativa; por defecto es la URL
+    de la página de origen. Devuelve la ruta del HTML generado.
+    """
+    if mode not in ('files', 'inline'):
+        raise ValueError(f"Modo de exportación no válido: {mode}")
+    base_url = base_url or deck.url
+
+    pool = pool or _get_pool()
+    ensure_vendor(vendor_dir, pool=pool)
+    slides = paginate_slides(deck.slides)
+    sources = {}
+    for slide in slides:
+        for item in slide["content"]:
+            if item["type"] == "image":
+                url = urljoin(base_url, item["src"]) if base_url else item["src"]
+                if url.startswith(('http://', 'https://')):
+                    sources[item["src"]] = url
+    assets = fetch_assets(sources.values(), asset_dir, pool)
+
+    if mode == 'files':
+        bundle_dir = os.path.join(output_dir, BUNDLE_DIRNAME)
+        for name in REVEALJS_FILES:
+            _link(os.path.join(vendor_dir, name), os.path.join(bundle_dir, _VENDOR_PATH, name))
+        local = dict(sources)
+        for src, url in sources.items():
+            if url in assets:
+                path = assets[url][0]
+                _link(path, os.path.join(bundle_dir, 'assets', os.path.basename(path)))
+                local[src] = 'assets/' + os.path.basename(path)
+        html = render_revealjs(deck.title, _replace_sources(slides, local), cdn=_VENDOR_PATH)
+        path = os.path.join(bundle_dir, 'index.html')
+    else:
+        data_uris = {}
+        inline = dict(sources)
+        for src, url in sources.items():
+            if url in assets:
+                if url not in data_uris:
+                    asset_path, content_type = assets[url]
+                    with open(asset_path, 'rb') as f:
+                        data_uris[url] = f"data:{content_type};base64,{base64.b64encode(f.read()).decode('ascii')}"
+                inline[src] = data_uris[url]
+        html = _inline_vendor(render_revealjs(deck.title, _replace_sources(slides, inline), cdn=_VENDOR_PATH),
+                              vendor_dir)
+        path = os.path.join(output_dir, BUNDLE_DIRNAME + '.html')
+
+    _write_atomic(path, html.encode('utf-8'))
+    print(f"Presentación sin conexión guardada en: {path} ({len(assets)} imágenes locales de {len(sources)})")
+    return path
+
+
+def _replace_sources(slides, sources):
+    # Copia de las diapositivas con las imágenes apuntando a su versión local
+    replaced = []
+    for slide in slides:
+        content = [dict(item, src=sources[item["src"]]) if item["type"] == "image" and item["src"] in sources else item
+                   for item in slide["content"]]
+        replaced.append(dict(slide, content=content))
+    return replaced
+
+
+def _inline_vendor(html, vendor_dir):
+    # Sustituye las etiquetas <link> y <script> de reveal.js por su contenido
+    for name in REVEALJS_FILES:
+        with open(os.path.join(vendor_dir, name), 'r', encoding='utf-8') as f:
+            source = f.read()
+        if name.endswith('.css'):
+            html = html.replace(f'<link rel="stylesheet" href="{_VENDOR_PATH}/{name}">', f'<style>\n{source}\n</style>')
+        else:
+            source = source.replace('</script', '<\\/script')
+            html = html.replace(f'<script src="{_VENDOR_PATH}/{name}"></script>', f'<script>\n{source}\n</script>')
+    return html
+
+
+def _link(source, target):
+    """Enlaza (o copia, si el sistema de ficheros no admite enlaces duros) source en target."""
+    if os.path.exists(target):
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp crea el fichero solo legible por el propietario
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _get_pool():
+    from http_pool import get_pool
+    return get_pool()
@@ -0,0 +1,271 @@
+"""Pasos comunes de los flujos web → markdown → presentación.
+
+web_to_revealjs_fixed2 y web_to_keynote solo se diferencian en el formato
+de su presentación: las herramientas de sus agentes, el modo directo y el
+guardado de resultados delegan aquí. Las diapositivas se construyen una vez
+por documento (SlideDeck) y se generan a partir de ellas todos los formatos
+pedidos en OUTPUT_FORMATS y, si DECK_BUNDLE lo pide, la versión sin conexión
+de la presentación RevealJS (deck_bundle).
+
+Cada directorio de resultados guarda un manifiesto con los hashes de la
+página (scrape_manifest). Al regenerar una presentación cuya página no ha
+cambiado no se vuelve a escribir nada, y en el modo directo con resumen
+solo se vuelven a resumir las secciones que han cambiado. En el modo con
+agentes solo se evita ejecutar el equipo cuando nada ha cambiado.
+"""
+import os
+import threading
+import time
+
+from artifact_store import hand_off
+from document_model import MarkdownDocument, Page, SlideDeck, load_markdown, load_page
+from markdown_builder import build_markdown, iter_markdown_parts, write_markdown
+from markdown_parser import strip_outer_fence
+from scrape_manifest import INCREMENTAL, ScrapeManifest, page_parts, unchanged
+from slide_renderers import (RENDERERS, SLIDE_MAX_CHARS, SLIDE_MAX_ITEMS, parse_formats, render_deck, renderer_for,
+                             write_deck)
+
+MARKDOWN_FILENAME = 'contenido_web.md'
+
+# Segundos durante los que la herramienta web_scraper reutiliza la descarga de is_unchanged
+PREFETCH_TTL = float(os.getenv('PREFETCH_TTL', '600'))
+
+# Páginas que is_unchanged ya ha descargado: url -> (caducidad, página)
+_prefetched = {}
+_prefetched_lock = threading.Lock()
+
+
+def _prefetch(url, page):
+    """Guarda la descarga de is_unchanged para la herramienta web_scraper.
+
+    Las entradas caducan a los PREFETCH_TTL segundos, de modo que las de un
+    trabajo cuyo equipo no llega a llamar a la herramienta (porque falla
+    antes, por ejemplo) no se acumulan en un proceso de larga duración ni
+    sirven una página antigua a un trabajo posterior.
+    """
+    now = time.monotonic()
+    with _prefetched_lock:
+        for key in [key for key, (expires, _) in _prefetched.items() if expires <= now]:
+            del _prefetched[key]
+        _prefetched[url] = (now + PREFETCH_TTL, page)
+
+
+def _take_prefetched(url):
+    """Devuelve (y retira) la descarga de url si no ha caducado, o None."""
+    with _prefetched_lock:
+        expires, page = _prefetched.pop(url, (0, None))
+    return page if expires > time.monotonic() else None
+
+
+def scrape(url):
+    """Extrae la página y devuelve su identificador (cuerpo de la herramienta web_scraper)."""
+    from scraper import scrape_site
+
+    try:
+        page = _take_prefetched(url)
+        if page is None:
+            page = Page.from_scrape(scrape_site(url))
+        return hand_off(page, 'page')
+    except Exception as e:
+        return f"Error al navegar la web: {str(e)}"
+
+
+def convert(json_data):
+    """Convierte la página (o su identificador) en markdown (cuerpo de la herramienta markdown_converter)."""
+    try:
+        page = load_page(json_data)
+        document = MarkdownDocument(build_markdown(page.to_scrape()), page)
+        return hand_off(document, 'markdown')
+    except Exception as e:
+        return f"Error al convertir a markdown: {str(e)}"
+
+
+def create_presentation(markdown_content, format_name):
+    """Crea la presentación en el formato indicado a partir del markdown o de su identificador.
+
+    La RenderedPresentation conserva las diapositivas, de modo que
+    save_presentation puede generar el resto de formatos sin repetir el trabajo.
+    """
+    renderer = RENDERERS[format_name]
+    try:
+        deck = SlideDeck.from_document(load_markdown(markdown_content))
+        presentation = render_deck(deck, [format_name])[0]
+        return hand_off(presentation, 'deck')
+    except Exception as e:
+        return f"Error al crear la presentación {renderer.format}: {str(e)}"
+
+
+def save_presentation(presentation, output_dir, formats=()):
+    """Guarda la presentación, el markdown del que procede y los demás formatos de formats.
+
+    Si la presentación conserva la página de origen, guarda también el
+    manifiesto que usa is_unchanged en la siguiente ejecución. Devuelve las
+    rutas de los ficheros guardados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    renderer = renderer_for(presentation)
+    path = os.path.join(output_dir, renderer.filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(presentation.content)
+    print(f"Presentación {presentation.format} guardada en: {path}")
+    paths = [path]
+
+    if presentation.document is not None:
+        markdown_path = os.path.join(output_dir, MARKDOWN_FILENAME)
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            f.write(presentation.document.markdown)
+        print(f"Contenido markdown guardado en: {markdown_path}")
+        paths.append(markdown_path)
+
+    if presentation.deck is not None and formats:
+        paths += write_deck(presentation.deck, formats, output_dir, skip=(renderer.name,))
+        bundle_path = bundle(presentation.deck, formats, output_dir)
+        if bundle_path:
+            paths.append(bundle_path)
+
+    page = presentation.document.page if presentation.document is not None else None
+    if page is not None:
+        _save_manifest(output_dir, page, _settings('crew', formats), paths)
+    return paths
+
+
+def is_unchanged(url, output_dir, formats, mode='crew', summarize=False):
+    """Indica si la página no ha cambiado desde la última ejecución con los mismos ajustes.
+
+    Descarga la página (la caché HTTP la revalida) y la compara con el
+    manifiesto de output_dir; permite saltarse la ejecución del equipo. Si
+    la página ha cambiado, la herramienta web_scraper del equipo reutiliza
+    esta descarga durante PREFETCH_TTL segundos. Si no se puede descargar,
+    se trata como cambiada y el error queda para la ejecución del equipo.
+
+    En el modo con agentes no hay regeneración parcial: si cambia cualquier
+    parte de la página, el equipo vuelve a generar la presentación completa.
+    """
+    from scraper import scrape_site
+
+    if not INCREMENTAL:
+        return False
+    try:
+        page = Page.from_scrape(scrape_site(url))
+        if unchanged(output_dir, url, _settings(mode, formats, summarize), page_parts(page)) is not None:
+            return True
+    except Exception as e:
+        print(f"No se pudo comprobar si {url} ha cambiado: {str(e)}")
+        return False
+    _prefetch(url, page)
+    return False
+
+
+def previous_outputs(output_dir, manifest=None):
+    """Rutas de las presentaciones que guardó la última ejecución en output_dir, sin el markdown."""
+    manifest = manifest or ScrapeManifest.load(output_dir)
+    if manifest is None:
+        return []
+    return [os.path.join(output_dir, name) for name in manifest.outputs if name != MARKDOWN_FILENAME]
+
+
+def run_direct(url, output_dir, formats, summarize=None):
+    """Encadena scraper, conversor y renderizadores en proceso, sin pasar por los agentes.
+
+    summarize, si se indica, recibe el markdown y devuelve la versión
+    resumida a partir de la cual se crean las diapositivas; se llama una vez
+    por cada parte del documento que ha cambiado desde la última ejecución.
+    Devuelve las rutas de las presentaciones generadas (o de las que ya
+    había, si la página no ha cambiado).
+    """
+    from scraper import scrape_site
+
+    page = Page.from_scrape(scrape_site(url))
+    parts = page_parts(page)
+    settings = _settings('direct', formats, summarize is not None)
+    previous = ScrapeManifest.load(output_dir) if INCREMENTAL else None
+    if previous is not None:
+        changed = previous.changed_parts(url, settings, parts)
+        if not changed and previous.outputs_exist(output_dir):
+            print(f"Sin cambios en {url}: se conservan los resultados de {output_dir}")
+            return previous_outputs(output_dir, previous)
+        print(f"Han cambiado {len(changed)} de {len(parts)} partes de {url}")
+    else:
+        changed = list(parts)
+
+    os.makedirs(output_dir, exist_ok=True)
+    markdown_path = os.path.join(output_dir, MARKDOWN_FILENAME)
+
+    summaries = {}
+    if summarize is not None:
+        markdown, summaries = _summarize_parts(page, summarize, previous, changed)
+        document = MarkdownDocument(markdown)
+        deck = SlideDeck.from_document(document)
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            f.write(document.markdown)
+    else:
+        # Las diapositivas salen de la página, así que el markdown no se guarda en
+        # memoria: se escribe en el fichero a medida que se genera
+        deck = SlideDeck.from_page(page)
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            write_markdown(page.to_scrape(), f)
+    print(f"Contenido markdown guardado en: {markdown_path}")
+
+    paths = write_deck(deck, formats, output_dir)
+    bundle_path = bundle(deck, formats, output_dir)
+    paths = paths + [bundle_path] if bundle_path else paths
+    _save_manifest(output_dir, page, settings, [markdown_path] + paths, summaries)
+    return paths
+
+
+def bundle(deck, formats, output_dir):
+    """Exporta la versión sin conexión si DECK_BUNDLE está activo y se pide RevealJS.
+
+    Un fallo al empaquetar no impide guardar el resto de resultados.
+    Devuelve la ruta del HTML generado o None.
+    """
+    from deck_bundle import DECK_BUNDLE, bundle_deck
+
+    if DECK_BUNDLE == 'off' or 'revealjs' not in parse_formats(formats):
+        return None
+    try:
+        return bundle_deck(deck, output_dir)
+    except Exception as e:
+        print(f"No se pudo crear la presentación sin conexión: {str(e)}")
+        return None
+
+
+def _summarize_parts(page, summarize, previous, changed):
+    """Resume cada parte del markdown, reutilizando los resúmenes de las que no han cambiado.
+
+    Los encabezados de las secciones, las imágenes y los enlaces se copian
+    sin resumir. Devuelve el markdown resumido y los resúmenes por parte.
+    """
+    reusable = previous.summaries if previous is not None else {}
+    summaries = {}
+    chunks = []
+    for key, fragments in iter_markdown_parts(page.to_scrape()):
+        text = ''.join(fragments)
+        if key in ('sections', 'extras'):
+            chunks.append(text)
+            continue
+        if key not in changed and key in reusable:
+            summaries[key] = reusable[key]
+        else:
+            summaries[key] = strip_outer_fence(str(summarize(text))).strip() + '\n\n'
+        chunks.append(summaries[key])
+    return ''.join(chunks), summaries
+
+
+def _settings(mode, formats, summarize=False):
+    # Ajustes que cambian los resultados: si cambian, se regenera todo
+    from deck_bundle import DECK_BUNDLE
+
+    return {
+        "mode": mode,
+        "formats": parse_formats(formats),
+        "summary": bool(summarize),
+        "slide_max_items": SLIDE_MAX_ITEMS,
+        "slide_max_chars": SLIDE_MAX_CHARS,
+        "bundle": DECK_BUNDLE,
+    }
+
+
+def _save_manifest(output_dir, page, settings, paths, summaries=None):
+    outputs = [os.path.relpath(path, output_dir) for path in paths]
+    ScrapeManifest(page.url, settings, page_parts(page), outputs, summaries).save(output_dir)
@@ -0,0 +1,224 @@
+"""Servicio residente que genera presentaciones sin arrancar Python en cada trabajo.
+
+Uso:
+    python src/deck_service.py [--port 8700] [--pipelines revealjs,keynote] [--mode crew]
+    python src/deck_service.py --submit https://grand-oasis-cancun.com/es [--pipeline keynote]
+
+Al arrancar importa los módulos de los flujos, construye sus equipos (en
+modo crew) y prepara los pools HTTP y el parser, de modo que cada trabajo
+solo paga su propia ejecución. Los trabajos se envían con POST /jobs y el
+servidor responde con una línea JSON por evento (queued, started, file,
+done o error) a medida que se producen. Cada evento file lleva uno de los
+ficheros generados por el trabajo, en content si es texto o en
+content_base64 si es binario. El campo opcional formats (p. ej.
+"revealjs,keynote,markdown") pide varios formatos en el mismo trabajo:
+
+    curl -N -X POST localhost:8700/jobs -d '{"url": "https://...", "pipeline": "revealjs"}'
+
+GET /health devuelve el estado del servicio y los flujos preparados.
+"""
+import argparse
+import base64
+import importlib
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.request import Request, urlopen
+
+from batch_runner import OUTPUT_DIR, PIPELINES, output_dir_for, run_job
+from slide_renderers import parse_formats
+
+SERVICE_HOST = os.getenv('SERVICE_HOST', '127.0.0.1')
+SERVICE_PORT = int(os.getenv('SERVICE_PORT', '8700'))
+# Trabajos que se ejecutan a la vez; el resto espera en cola
+SERVICE_WORKERS = int(os.getenv('SERVICE_WORKERS', '4'))
+SERVICE_PIPELINES = os.getenv('SERVICE_PIPELINES', 'revealjs,keynote')
+
+
+class DeckService:
+    """Mantiene los flujos preparados y ejecuta trabajos con como mucho workers a la vez."""
+
+    def __init__(self, pipelines, mode='crew', workers=SERVICE_WORKERS, base_dir=OUTPUT_DIR):
+        self.mode = mode
+        self.base_dir = base_dir
+        self.modules = {}
+        self._slots = threading.BoundedSemaphore(workers)
+        # Los trabajos de una misma URL comparten directorio de resultados: se ejecutan de uno en uno
+        self._dir_locks = {}
+        self._dir_locks_lock = threading.Lock()
+        for name in pipelines:
+            self.modules[name] = importlib.import_module(PIPELINES[name])
+
+    def warm_up(self):
+        """Construye los equipos y crea los pools HTTP y el parser antes del primer trabajo."""
+        from html_parsers import get_backend
+        from scraper import use_async_engine
+
+        if self.mode == 'crew':
+            for module in self.modules.values():
+                module.get_crew()
+        if use_async_engine():
+            from async_http_pool import get_async_pool
+            get_async_pool()
+        else:
+            from http_pool import get_pool
+            get_pool()
+        get_backend()
+
+    def run(self, url, pipeline, mode=None, formats=None):
+        """Ejecuta un trabajo y genera sus eventos como diccionarios."""
+        job_id = uuid.uuid4().hex[:12]
+        module = self.modules[pipeline]
+        mode = mode or self.mode
+        output_dir = output_dir_for(url, self.base_dir)
+        yield {"event": "queued", "job": job_id, "url": url, "pipeline": pipeline, "mode": mode}
+
+        with self._dir_lock(output_dir), self._slots:
+            yield {"event": "started", "job": job_id}
+            start = time.perf_counter()
+            try:
+                if mode == 'direct':
+                    paths = module.run_direct(url, output_dir, formats=formats)
+                else:
+                    paths = run_job(module, url, output_dir, formats)
+            except Exception as e:
+                yield {"event": "error", "job": job_id, "error": str(e)}
+                return
+            seconds = round(time.perf_counter() - start, 2)
+            # Se leen antes de soltar el directorio, para que otro trabajo no los sustituya
+            files = [(os.path.relpath(path, output_dir), _read_bytes(path)) for path in paths or ()]
+
+        for name, content in files:
+            yield dict({"event": "file", "job": job_id, "name": name}, **_file_content(content))
+        yield {"event": "done", "job": job_id, "output_dir": output_dir, "seconds": seconds}
+
+    def _dir_lock(self, output_dir):
+        with self._dir_locks_lock:
+            return self._dir_locks.setdefault(os.path.abspath(output_dir), threading.Lock())
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _file_content(content):
+    """Campos JSON del contenido de un fichero: content si es texto UTF-8, content_base64 si es binario."""
+    try:
+        return {"content": content.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {"content_base64": base64.b64encode(content).decode('ascii')}
+
+
+class DeckServiceHandler(BaseHTTPRequestHandler):
+    service = None
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        self._send_json(200, {"status": "ok", "pipelines": sorted(self.service.modules), "mode": self.service.mode})
+
+    def do_POST(self):
+        if self.path != '/jobs':
+            self._send_json(404, {"error": "Ruta no encontrada"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            job = json.loads(self.rfile.read(length) or b'{}')
+            url = job['url']
+        except (ValueError, KeyError):
+            self._send_json(400, {"error": "Se esperaba un JSON con al menos el campo url"})
+            return
+        pipeline = job.get('pipeline', 'revealjs')
+        if pipeline not in self.service.modules:
+            self._send_json(400, {"error": f"Flujo no disponible: {pipeline}"})
+            return
+        if job.get('mode') not in (None, 'crew', 'direct'):
+            self._send_json(400, {"error": f"Modo no válido: {job['mode']}"})
+            return
+        try:
+            formats = parse_formats(job['formats']) if job.get('formats') else None
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.end_headers()
+        for event in self.service.run(url, pipeline, job.get('mode'), formats):
+            self.wfile.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    """Atiende peticiones hasta que se interrumpe el proceso."""
+    handler = type('Handler', (DeckServiceHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Servicio de presentaciones escuchando en http://{host}:{port} ({', '.join(service.modules)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def submit(url, pipeline='revealjs', mode=None, host=SERVICE_HOST, port=SERVICE_PORT, formats=None):
+    """Envía un trabajo al servicio y genera sus eventos a medida que llegan."""
+    job = {"url": url, "pipeline": pipeline}
+    if mode:
+        job["mode"] = mode
+    if formats:
+        job["formats"] = formats
+    request = Request(f"http://{host}:{port}/jobs", data=json.dumps(job).encode('utf-8'),
+                      headers={'Content-Type': 'application/json'})
+    with urlopen(request) as response:
+        for line in response:
+            yield json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=SERVICE_PORT)
+    parser.add_argument('--pipelines', default=SERVICE_PIPELINES, help='Flujos a preparar, separados por comas')
+    parser.add_argument('--mode', choices=['crew', 'direct'],
+                        help='Modo del servicio o, con --submit, del trabajo (por defecto PIPELINE_MODE o crew)')
+    parser.add_argument('--workers', type=int, default=SERVICE_WORKERS)
+    parser.add_argument('--submit', metavar='URL', help='Envía un trabajo a un servicio en marcha')
+    parser.add_argument('--pipeline', choices=sorted(PIPELINES), default='revealjs')
+    parser.add_argument('--formats', help='Formatos de presentación del trabajo enviado, separados por comas')
+    args = parser.parse_args()
+
+    if args.submit:
+        for event in submit(args.submit, args.pipeline, args.mode, args.host, args.port, args.formats):
+            if event['event'] == 'file' and 'content' in event:
+                print(f"[file] {event['name']} ({len(event['content'])} caracteres)")
+            elif event['event'] == 'file':
+                print(f"[file] {event['name']} ({len(base64.b64decode(event['content_base64']))} bytes)")
+            else:
+                print(f"[{event['event']}] " + json.dumps(event, ensure_ascii=False))
+        return
+
+    pipelines = [name.strip() for name in args.pipelines.split(',') if name.strip()]
+    service = DeckService(pipelines, args.mode or os.getenv('PIPELINE_MODE', 'crew'), args.workers)
+    print("Preparando equipos y pools HTTP...")
+    service.warm_up()
+    serve(service, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
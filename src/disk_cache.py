@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+
+
+class DiskCache:
+    """Caché en disco direccionada por contenido con tamaño máximo y expulsión LRU.
+
+    Cada clave tiene una entrada JSON con sus metadatos que apunta a un blob
+    nombrado por el SHA-256 de su contenido, de modo que respuestas idénticas
+    se guardan una sola vez. La fecha de modificación de la entrada marca su
+    último acceso.
+
+    El tamaño ocupado y las referencias a cada blob se llevan en memoria:
+    al reescribir una clave se borra el blob anterior si ya no lo usa otra
+    entrada, y las entradas solo se recorren para expulsar cuando se supera
+    max_bytes. La expulsión borra además los blobs que no usa ninguna entrada.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries_dir = os.path.join(directory, 'entries')
+        self._blobs_dir = os.path.join(directory, 'blobs')
+        self._lock = threading.Lock()
+        # Bytes de los blobs y entradas que usan cada uno; se calculan en la primera escritura
+        self._size = None
+        self._refs = None
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._blobs_dir, exist_ok=True)
+
+    def _entry_path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self._entries_dir, digest + '.json')
+
+    def _blob_path(self, digest):
+        return os.path.join(self._blobs_dir, digest[:2], digest)
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, key, max_age=None):
+        """Devuelve (contenido, metadatos) o None si no existe o ha caducado."""
+        entry_path = self._entry_path(key)
+        with self._lock:
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                with open(self._blob_path(entry['blob']), 'rb') as f:
+                    body = f.read()
+            except (OSError, ValueError, KeyError):
+                return None
+
+            if max_age is not None and time.time() - entry['stored_at'] > max_age:
+                return None
+
+            os.utime(entry_path)
+            return body, entry['meta']
+
+    def put(self, key, body, meta=None):
+        """Guarda el contenido de una clave y expulsa entradas antiguas si hace falta."""
+        digest = hashlib.sha256(body).hexdigest()
+        entry = {
+            "key": key,
+            "blob": digest,
+            "size": len(body),
+            "stored_at": time.time(),
+            "meta": meta or {}
+        }
+        entry_path = self._entry_path(key)
+        with self._lock:
+            if self._size is None:
+                self._size = self._blobs_size()
+                self._refs = Counter(entry['blob'] for _, _, entry in self._entries())
+            previous = self._read_entry(entry_path)
+            blob_path = self._blob_path(digest)
+            if not os.path.exists(blob_path):
+                self._write_atomic(blob_path, body)
+                self._size += len(body)
+            self._write_atomic(entry_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            self._refs[digest] += 1
+            if previous is not None:
+                self._release(previous['blob'])
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _read_entry(self, entry_path):
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _release(self, digest):
+        # Quita una referencia al blob y lo borra si ya no lo usa ninguna entrada
+        self._refs[digest] -= 1
+        if self._refs[digest] > 0:
+            return
+        del self._refs[digest]
+        blob_path = self._blob_path(digest)
+        try:
+            size = os.path.getsize(blob_path)
+            os.remove(blob_path)
+        except OSError:
+            return
+        self._size -= size
+
+    def touch(self, key, meta=None):
+        """Marca una entrada como usada y, opcionalmente, actualiza sus metadatos."""
+        entry_path = self._entry_path(key)
+        with self._lock:
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                return
+            if meta is not None:
+                entry['meta'] = meta
+                entry['stored_at'] = time.time()
+                self._write_atomic(entry_path, json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+            else:
+                os.utime(entry_path)
+
+    def _blob_files(self):
+        # {digest: bytes} de los blobs en disco, sin los temporales a medio escribir
+        blobs = {}
+        for root, _, names in os.walk(self._blobs_dir):
+            for name in names:
+                if not name.startswith('.tmp-'):
+                    try:
+                        blobs[name] = os.path.getsize(os.path.join(root, name))
+                    except OSError:
+                        continue
+        return blobs
+
+    def _blobs_size(self):
+        return sum(self._blob_files().values())
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self._entries_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self._entries_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                entries.append((os.path.getmtime(path), path, entry))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        # Los blobs compartidos entre entradas solo cuentan una vez
+        blob_refs = Counter(entry['blob'] for _, _, entry in entries)
+        blob_sizes = self._blob_files()
+        # Los blobs que no usa ninguna entrada (p. ej. de una escritura interrumpida) se borran
+        for digest in set(blob_sizes) - set(blob_refs):
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+            del blob_sizes[digest]
+        total = sum(blob_sizes.values())
+
+        entries.sort(key=lambda item: item[0])
+        for _, path, entry in entries:
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            blob_refs[entry['blob']] -= 1
+            if blob_refs[entry['blob']] == 0:
+                del blob_refs[entry['blob']]
+                total -= blob_sizes.pop(entry['blob'], 0)
+                try:
+                    os.remove(self._blob_path(entry['blob']))
+                except OSError:
+                    pass
+        self._size = total
+        self._refs = blob_refs
@@ -0,0 +1,295 @@
+import json
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from artifact_store import get_store
+from markdown_builder import build_markdown
+from markdown_parser import inline_items, iter_blocks, strip_outer_fence
+
+
+@dataclass
+class Block:
+    """Bloque de contenido de una página: encabezado (h1, h2, h3) o párrafo (p)."""
+    type: str
+    content: str
+
+
+@dataclass
+class Link:
+    text: str
+    href: str
+
+
+@dataclass
+class Image:
+    alt: str
+    src: str
+
+
+@dataclass
+class Section:
+    """Sección enlazada desde la página principal. Si no se pudo descargar, error explica por qué."""
+    title: str
+    url: str
+    blocks: List[Block] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class Page:
+    """Documento extraído por el scraper: página → secciones → bloques."""
+    url: str
+    title: str
+    blocks: List[Block] = field(default_factory=list)
+    links: List[Link] = field(default_factory=list)
+    images: List[Image] = field(default_factory=list)
+    sections: Optional[List[Section]] = None
+
+    @classmethod
+    def from_scrape(cls, data):
+        """Crea la página a partir del diccionario devuelto por scraper.scrape_site."""
+        sections = None
+        if 'sections' in data:
+            sections = [
+                Section(
+                    title=section['title'],
+                    url=section['url'],
+                    blocks=[Block(item['type'], item['content']) for item in section.get('content', [])],
+                    error=section.get('error')
+                )
+                for section in data['sections']
+            ]
+        return cls(
+            url=data['url'],
+            title=data['title'],
+            blocks=[Block(item['type'], item['content']) for item in data['main_content']],
+            links=[Link(link['text'], link['href']) for link in data['links']],
+            images=[Image(img['alt'], img['src']) for img in data['images']],
+            sections=sections
+        )
+
+    def to_scrape(self):
+        """Devuelve la página con el mismo formato JSON que scraper.scrape_site."""
+        data = {
+            "url": self.url,
+            "title": self.title,
+            "main_content": [{"type": block.type, "content": block.content} for block in self.blocks],
+            "links": [{"text": link.text, "href": link.href} for link in self.links],
+            "images": [{"alt": img.alt, "src": img.src} for img in self.images]
+        }
+        if self.sections is not None:
+            data["sections"] = []
+            for section in self.sections:
+                if section.error is not None:
+                    data["sections"].append({"title": section.title, "url": section.url, "error": section.error})
+                else:
+                    data["sections"].append({
+                        "title": section.title,
+                        "url": section.url,
+                        "content": [{"type": block.type, "content": block.content} for block in section.blocks]
+                    })
+        return data
+
+    def to_text(self):
+        return json.dumps(self.to_scrape(), indent=2)
+
+    def summary(self):
+        """Resumen de una línea para mostrar al agente en lugar del contenido completo."""
+        sections = len(self.sections) if self.sections is not None else 0
+        return (f"Página «{self.title.strip()}» ({self.url}): {len(self.blocks)} bloques, "
+                f"{len(self.links)} enlaces, {len(self.images)} imágenes y {sections} secciones")
+
+
+@dataclass
+class MarkdownDocument:
+    """Markdown generado a partir de una página, junto con la página de origen si se conoce."""
+    markdown: str
+    page: Optional[Page] = None
+
+    def to_text(self):
+        return self.markdown
+
+    def summary(self):
+        lines = self.markdown.count('\n') + 1
+        return f"Documento markdown de {len(self.markdown)} caracteres y {lines} líneas"
+
+
+@dataclass
+class SlideDeck:
+    """Diapositivas de un documento, construidas una sola vez y compartidas por todos los renderizadores.
+
+    Cada diapositiva es un diccionario con title, type (title, section,
+    content o end) y content, una lista de elementos text, image o link.
+    url es la de la página de origen, si se conoce, y sirve para resolver las
+    imágenes con ruta relativa.
+    """
+    title: str
+    slides: List[dict]
+    document: Optional[MarkdownDocument] = None
+    url: Optional[str] = None
+
+    @classmethod
+    def from_page(cls, page, document=None):
+        title, slides = slides_from_page(page)
+        return cls(title, slides, document, page.url)
+
+    @classmethod
+    def from_document(cls, document):
+        """Crea las diapositivas desde la página de origen del documento o, si no la conserva, desde su markdown.
+
+        La página solo se usa si el markdown es el que build_markdown genera
+        a partir de ella; si se ha editado, se parsea el markdown.
+        """
+        if isinstance(document, str):
+            document = MarkdownDocument(document)
+        if document.page is not None and document.markdown == build_markdown(document.page.to_scrape()):
+            return cls.from_page(document.page, document)
+        title, slides = slides_from_markdown(document.markdown)
+        return cls(title, slides, document)
+
+    def to_text(self):
+        return json.dumps({"title": self.title, "slides": self.slides}, indent=2, ensure_ascii=False)
+
+    def summary(self):
+        return f"Presentación «{self.title.strip()}» de {len(self.slides)} diapositivas"
+
+
+@dataclass
+class RenderedPresentation:
+    """Presentación generada (HTML de RevealJS, JSON de Keynote o markdown) y el markdown del que procede.
+
+    deck conserva las diapositivas para generar otros formatos sin volver a parsear.
+    """
+    format: str
+    content: str
+    document: Optional[MarkdownDocument] = None
+    deck: Optional[SlideDeck] = None
+
+    def to_text(self):
+        return self.content
+
+    def summary(self):
+        return f"Presentación {self.format} de {len(self.content)} caracteres"
+
+
+def load_page(text):
+    """Obtiene la página de la entrada de una herramienta: un identificador o el JSON del scraper."""
+    value = get_store().resolve(text)
+    if isinstance(value, Page):
+        return value
+    return Page.from_scrape(json.loads(text))
+
+
+def load_markdown(text):
+    """Obtiene el documento de la entrada de una herramienta: un identificador o el texto markdown."""
+    value = get_store().resolve(text)
+    if isinstance(value, MarkdownDocument):
+        return value
+    return MarkdownDocument(text)
+
+
+# Marcas con las que build_markdown escribe cada tipo de bloque
+_MAIN_PREFIX = {'h1': '# ', 'h2': '## ', 'h3': '### '}
+_SECTION_PREFIX = {'h1': '#### ', 'h2': '#### '}
+
+
+def slides_from_page(page):
+    """Construye las diapositivas directamente desde la página.
+
+    Sigue la misma estructura que el markdown de build_markdown (portada,
+    contenido principal, secciones, imágenes y enlaces) sin tener que volver
+    a parsear el documento completo: solo el texto de cada bloque pasa por
+    iter_blocks, para que el que parece markdown ("- elemento", "# título",
+    varias líneas o sangría) dé el mismo contenido que slides_from_markdown.
+    Devuelve (título, diapositivas).
+    """
+    slides = [_slide(page.title, "title", [_text(f"*Contenido extraído de: {page.url}*")])]
+
+    # Contenido principal: los h2 abren diapositiva de sección y los h3 de contenido
+    slides.append(_slide("Contenido Principal", "section"))
+    for block in page.blocks:
+        _add_blocks(slides, iter_blocks(_MAIN_PREFIX.get(block.type, '') + block.content), page.title)
+
+    # Secciones
+    if page.sections is not None:
+        slides.append(_slide("Secciones Principales", "section"))
+        for section in page.sections:
+            slides.append(_slide(section.title, "content"))
+            if section.error is not None:
+                _add_blocks(slides, iter_blocks(f"*No se pudo acceder a esta sección: {section.error}*"), page.title)
+            else:
+                for block in section.blocks:
+                    _add_blocks(slides, iter_blocks(_SECTION_PREFIX.get(block.type, '') + block.content),
+                                page.title)
+            slides[-1]["content"].append({"type": "link", "text": f"Ver más en {section.url}", "href": section.url})
+
+    # Imágenes destacadas
+    if page.images:
+        slides.append(_slide("Imágenes Destacadas", "section",
+                             [{"type": "image", "alt": img.alt, "src": img.src} for img in page.images]))
+
+    # Enlaces importantes
+    if page.links:
+        base_url = '/'.join(page.url.split('/')[:3])
+        links = []
+        for link in page.links[:5]:
+            href = link.href if link.href.startswith('http') else base_url + link.href
+            links.append({"type": "link", "text": link.text, "href": href})
+        slides.append(_slide("Enlaces Importantes", "section", links))
+
+    # Añadir diapositiva final
+    slides.append(_slide("¡Gracias!", "end",
+                         [_text("Presentación generada automáticamente basada en " + page.title)]))
+
+    return page.title, slides
+
+
+def slides_from_markdown(markdown):
+    """Construye las diapositivas parseando el markdown en una sola pasada.
+
+    Se usa cuando no se conserva la página de origen (por ejemplo, con el
+    markdown reescrito por el LLM, al que se quita la valla de código que lo
+    envuelva). El primer h1 abre la portada, los h2
+    diapositivas de sección y los h3 de contenido; el resto de encabezados,
+    los párrafos, los elementos de lista y el código son contenido de la
+    diapositiva actual. Devuelve (título, diapositivas).
+    """
+    slides = []
+    title = _add_blocks(slides, iter_blocks(strip_outer_fence(markdown)))
+    slides.append(_slide("¡Gracias!", "end",
+                         [_text("Presentación generada automáticamente basada en " + title)]))
+    return title, slides
+
+
+def _add_blocks(slides, blocks, title=""):
+    """Reparte los bloques de iter_blocks en las diapositivas y devuelve el título.
+
+    Si aún no hay título, el primer h1 abre la portada; los h2 abren
+    diapositivas de sección y los h3 de contenido. El resto es contenido de
+    la última diapositiva.
+    """
+    for kind, level, text in blocks:
+        if kind == 'heading':
+            if level == 1 and not title:
+                title = text
+                slides.append(_slide(text, "title"))
+                continue
+            if level == 2 or level == 3:
+                slides.append(_slide(text, "section" if level == 2 else "content"))
+                continue
+        # El contenido anterior al primer encabezado no pertenece a ninguna diapositiva
+        if not slides or not text:
+            continue
+        if kind != 'code' and text[0] in '![':
+            slides[-1]["content"].extend(inline_items(text))
+        else:
+            slides[-1]["content"].append(_text(text))
+    return title
+
+
+def _slide(title, slide_type, content=None):
+    return {"title": title, "content": content or [], "type": slide_type}
+
+
+def _text(text):
+    return {"type": "text", "text": text}
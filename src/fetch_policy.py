@@ -0,0 +1,172 @@
+"""Tiempos de espera, reintentos y cortacircuitos de las descargas del scraper.
+
+HttpPool y AsyncHttpPool comparten estas piezas:
+
+- Cada petición tiene un tiempo de espera de conexión (SCRAPER_CONNECT_TIMEOUT)
+  y de lectura (SCRAPER_READ_TIMEOUT), así que un host colgado no bloquea
+  el agente.
+- RetryPolicy reintenta hasta SCRAPER_RETRIES veces los errores de conexión,
+  los tiempos de espera agotados y las respuestas 429/5xx. Entre intentos se
+  espera un tiempo aleatorio entre 0 y SCRAPER_BACKOFF_BASE * 2^intento
+  segundos (como mucho SCRAPER_BACKOFF_MAX), o lo que pida la cabecera
+  Retry-After si es mayor. Si Retry-After pide más de SCRAPER_RETRY_AFTER_MAX
+  segundos no se reintenta.
+- CircuitBreaker corta las peticiones a un host tras SCRAPER_BREAKER_FAILURES
+  peticiones seguidas fallidas. Pasados SCRAPER_BREAKER_COOLDOWN segundos deja
+  pasar una de prueba: si va bien el host vuelve a abrirse y si falla se
+  espera otro periodo.
+- TimeBudget limita el tiempo total de un scrape (SCRAPER_BUDGET segundos):
+  los tiempos de espera y las pausas entre reintentos se recortan a lo que
+  queda y, agotado, no se hacen más peticiones. Una petición cortada porque
+  se agota el presupuesto lanza BudgetExpiredError y no cuenta como fallo
+  del host en el cortacircuitos.
+"""
+import os
+import random
+import threading
+import time
+
+CONNECT_TIMEOUT = float(os.getenv('SCRAPER_CONNECT_TIMEOUT', '10'))
+READ_TIMEOUT = float(os.getenv('SCRAPER_READ_TIMEOUT', '30'))
+RETRIES = int(os.getenv('SCRAPER_RETRIES', '2'))
+BACKOFF_BASE = float(os.getenv('SCRAPER_BACKOFF_BASE', '0.5'))
+BACKOFF_MAX = float(os.getenv('SCRAPER_BACKOFF_MAX', '10'))
+RETRY_AFTER_MAX = float(os.getenv('SCRAPER_RETRY_AFTER_MAX', '30'))
+# Fallos seguidos que cortan un host; 0 desactiva el cortacircuitos
+BREAKER_FAILURES = int(os.getenv('SCRAPER_BREAKER_FAILURES', '5'))
+BREAKER_COOLDOWN = float(os.getenv('SCRAPER_BREAKER_COOLDOWN', '30'))
+# Tiempo total de un scrape en segundos; 0 lo desactiva
+SCRAPE_BUDGET = float(os.getenv('SCRAPER_BUDGET', '120'))
+
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value, now=None):
+    """Segundos que pide esperar una cabecera Retry-After (número o fecha HTTP), o None si no es válida."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    # email.utils solo hace falta con el formato de fecha, que es el menos habitual
+    from email.utils import parsedate_to_datetime
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None or date.tzinfo is None:
+        return None
+    return max(date.timestamp() - (time.time() if now is None else now), 0.0)
+
+
+class BudgetExpiredError(TimeoutError):
+    """Se ha agotado el presupuesto de tiempo del scrape (no es un fallo del host)."""
+
+
+class TimeBudget:
+    """Tiempo total disponible para un scrape; con seconds <= 0 no hay límite."""
+
+    def __init__(self, seconds=SCRAPE_BUDGET):
+        self.seconds = seconds
+        self._end = time.monotonic() + seconds if seconds > 0 else None
+
+    def remaining(self):
+        """Segundos que quedan, o None si no hay límite."""
+        if self._end is None:
+            return None
+        return max(self._end - time.monotonic(), 0.0)
+
+    def expired(self):
+        return self._end is not None and time.monotonic() >= self._end
+
+    def cap(self, seconds):
+        """Recorta seconds (None es sin límite) a lo que queda del presupuesto."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def check(self):
+        """Lanza BudgetExpiredError si el presupuesto está agotado."""
+        if self.expired():
+            raise BudgetExpiredError(f"Presupuesto de tiempo de {self.seconds:g}s agotado")
+
+
+class RetryPolicy:
+    """Decide si se reintenta una petición fallida y cuánto se espera antes."""
+
+    def __init__(self, retries=RETRIES, base=BACKOFF_BASE, max_delay=BACKOFF_MAX, retry_after_max=RETRY_AFTER_MAX):
+        self.retries = retries
+        self.base = base
+        self.max_delay = max_delay
+        self.retry_after_max = retry_after_max
+
+    def delay(self, attempt, retry_after=None, budget=None):
+        """Segundos que hay que esperar antes del intento attempt + 1, o None si no se reintenta.
+
+        retry_after es el valor de la cabecera Retry-After de la respuesta, si
+        la hay. No se reintenta si se han agotado los reintentos, si el
+        servidor pide esperar más de retry_after_max o si la espera no cabe en
+        lo que queda de budget.
+        """
+        if attempt >= self.retries:
+            return None
+        # Espera aleatoria completa: los clientes que fallan a la vez no vuelven a la vez
+        delay = random.uniform(0, min(self.max_delay, self.base * 2 ** attempt))
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            if requested > self.retry_after_max:
+                return None
+            delay = max(delay, requested)
+        if budget is not None and budget.cap(delay) < delay:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """Cortacircuitos por host: tras failures fallos seguidos no se le hacen peticiones durante cooldown segundos."""
+
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._failures = {}
+        self._opened = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host):
+        """Indica si se puede hacer una petición a host.
+
+        Pasado el periodo de espera de un host cortado se deja pasar una
+        petición de prueba y se vuelve a contar el periodo, por si no llega
+        a terminar.
+        """
+        with self._lock:
+            opened = self._opened.get(host)
+            if opened is None:
+                return True
+            now = time.monotonic()
+            if now - opened < self.cooldown:
+                return False
+            self._opened[host] = now
+            return True
+
+    def retry_in(self, host):
+        """Segundos que faltan para que host admita una petición de prueba."""
+        with self._lock:
+            opened = self._opened.get(host)
+            return 0.0 if opened is None else max(self.cooldown - (time.monotonic() - opened), 0.0)
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+
+    def record_failure(self, host):
+        if self.failures <= 0:
+            return
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failures or host in self._opened:
+                self._opened[host] = time.monotonic()
@@ -0,0 +1,189 @@
+"""Backends de parseo HTML del scraper.
+
+html.parser (a través de BeautifulSoup) es la referencia. selectolax y lxml
+son mucho más rápidos; para que den el mismo JSON, descartan el texto de
+<script>, <style> y <template> y dejan los textos que solo tienen espacios
+en un espacio o un salto de línea, igual que BeautifulSoup.
+
+En HTML bien formado el resultado es idéntico. En HTML mal formado los
+backends en C construyen el árbol con otras reglas que html.parser
+(tests/test_html_parsers.py fija cada caso):
+
+- Un <p> sin cerrar se cierra al abrir un bloque (<div>, <ul>, <p>...):
+  html.parser lo deja abierto y su texto incluye el del bloque.
+- lxml cierra un encabezado al abrir un <p> dentro, y selectolax parte en
+  dos un <a> que contiene un <p>.
+- selectolax saca delante de la tabla el contenido suelto dentro de <table>.
+- lxml descarta lo que sigue a </html>.
+- Las entidades sin ';' (&copy2024, &lt3) se decodifican; html.parser las
+  deja como texto.
+"""
+import os
+
+# Backend de parseo HTML: auto (el más rápido instalado), selectolax, lxml o html.parser
+PARSER_BACKEND = os.getenv('SCRAPER_PARSER', 'auto')
+
+# Etiquetas cuyo texto no forma parte del contenido
+SKIPPED_TEXT_TAGS = ('script', 'style', 'template')
+
+# BeautifulSoup deja en un espacio o un salto de línea los textos solo de espacios, salvo dentro de estas
+_PRESERVE_WHITESPACE = {'pre', 'textarea'}
+_ASCII_SPACES = ' \t\n\x0c\r'
+
+
+class HtmlParserBackend:
+    """Recorre un documento HTML y devuelve sus elementos en orden de documento.
+
+    Cada backend produce tuplas (etiqueta, atributos, nodo) y sabe extraer el
+    texto de sus nodos, de forma que la extracción del scraper no depende del
+    parser utilizado.
+    """
+
+    name = None
+
+    def elements(self, html, tags):
+        raise NotImplementedError
+
+    def text(self, node):
+        raise NotImplementedError
+
+
+class HtmlParserBackendSoup(HtmlParserBackend):
+    """Parser puro de Python a través de BeautifulSoup."""
+
+    name = 'html.parser'
+
+    def elements(self, html, tags):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, 'html.parser')
+        for element in soup.find_all(list(tags)):
+            yield element.name, element.attrs, element
+
+    def text(self, node):
+        return node.text
+
+
+def _collapsed_whitespace(text):
+    """Texto que deja BeautifulSoup en lugar de text si solo tiene espacios, o None si no lo cambia."""
+    if not text or text.strip(_ASCII_SPACES) or text in ('\n', ' '):
+        return None
+    return '\n' if '\n' in text else ' '
+
+
+class HtmlParserBackendLxml(HtmlParserBackend):
+    """Parser en C de lxml."""
+
+    name = 'lxml'
+
+    def elements(self, html, tags):
+        import lxml.etree
+        import lxml.html
+
+        if not html.strip():
+            return
+        try:
+            try:
+                root = lxml.html.document_fromstring(html)
+            except ValueError:
+                # lxml rechaza cadenas con declaración de codificación
+                parser = lxml.html.HTMLParser(encoding='utf-8')
+                root = lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+        except lxml.etree.ParserError:
+            # Documento sin ningún elemento (solo comentarios o cierres sueltos)
+            return
+        preserved = {element for block in root.iter(*_PRESERVE_WHITESPACE) for element in block.iter()}
+        for element in root.iter():
+            # Antes de quitar los <script>: drop_tree junta el texto de ambos lados
+            if isinstance(element.tag, str) and element not in preserved:
+                text = _collapsed_whitespace(element.text)
+                if text:
+                    element.text = text
+            parent = element.getparent()
+            if parent is not None and parent not in preserved:
+                tail = _collapsed_whitespace(element.tail)
+                if tail:
+                    element.tail = tail
+        # drop_tree conserva el texto que sigue a la etiqueta
+        for element in list(root.iter(*SKIPPED_TEXT_TAGS)):
+            element.drop_tree()
+        for element in root.iter(*tags):
+            yield element.tag, element.attrib, element
+
+    def text(self, node):
+        return node.text_content()
+
+
+class HtmlParserBackendSelectolax(HtmlParserBackend):
+    """Parser en C de selectolax (motor lexbor)."""
+
+    name = 'selectolax'
+
+    def elements(self, html, tags):
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(list(SKIPPED_TEXT_TAGS))
+        if tree.root is not None:
+            for node in list(tree.root.traverse(include_text=True)):
+                if node.tag == '-text':
+                    text = _collapsed_whitespace(node.text_content)
+                    if text and not self._preserved(node):
+                        node.replace_with(text)
+        for node in tree.css(', '.join(tags)):
+            # selectolax devuelve None en los atributos sin valor
+            attrs = {key: value if value is not None else '' for key, value in node.attributes.items()}
+            yield node.tag, attrs, node
+
+    @staticmethod
+    def _preserved(node):
+        parent = node.parent
+        while parent is not None:
+            if parent.tag in _PRESERVE_WHITESPACE:
+                return True
+            parent = parent.parent
+        return False
+
+    def text(self, node):
+        return node.text(deep=True)
+
+
+BACKENDS = {
+    'selectolax': (HtmlParserBackendSelectolax, 'selectolax.lexbor'),
+    'lxml': (HtmlParserBackendLxml, 'lxml.html'),
+    'html.parser': (HtmlParserBackendSoup, 'bs4'),
+}
+
+
+def available_backends():
+    """Devuelve los nombres de los backends cuyas dependencias están instaladas."""
+    import importlib
+
+    names = []
+    for name, (_, module) in BACKENDS.items():
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+_backends = {}
+
+
+def get_backend(name=None):
+    """Devuelve el backend pedido o, si no está instalado, html.parser.
+
+    'auto' usa el más rápido de los instalados (selectolax, lxml y
+    html.parser, en ese orden).
+    """
+    name = name or PARSER_BACKEND
+    if name not in _backends:
+        available = available_backends()
+        if name == 'auto':
+            chosen = available[0]
+        else:
+            chosen = name if name in available else 'html.parser'
+        _backends[name] = BACKENDS[chosen][0]()
+    return _backends[name]
@@ -0,0 +1,303 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from disk_cache import DiskCache
+from fetch_policy import (CONNECT_TIMEOUT, READ_TIMEOUT, RETRY_STATUS, BudgetExpiredError, CircuitBreaker,
+                          RetryPolicy)
+
+# Configuración del pool desde variables de entorno
+MAX_WORKERS = int(os.getenv('SCRAPER_MAX_WORKERS', '8'))
+PER_HOST_LIMIT = int(os.getenv('SCRAPER_PER_HOST_LIMIT', '4'))
+DEADLINE = float(os.getenv('SCRAPER_DEADLINE', '60'))
+
+# Caché HTTP en disco
+CACHE_ENABLED = os.getenv('SCRAPER_CACHE', 'true').lower() == 'true'
+CACHE_DIR = os.getenv('SCRAPER_CACHE_DIR', os.path.join(os.path.dirname(__file__), '../output/http_cache'))
+CACHE_MAX_MB = float(os.getenv('SCRAPER_CACHE_MAX_MB', '200'))
+OFFLINE = os.getenv('SCRAPER_OFFLINE', 'false').lower() == 'true'
+
+# Límite de tamaño de las descargas
+MAX_BYTES = int(float(os.getenv('SCRAPER_MAX_MB', '5')) * 1024 * 1024)
+CHUNK_SIZE = 64 * 1024
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Cabeceras que se guardan junto al contenido en la caché
+CACHED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified']
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class ContentTypeError(requests.RequestException):
+    """La respuesta no tiene ninguno de los tipos de contenido aceptados."""
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """El cortacircuitos del host está abierto por demasiados fallos seguidos."""
+
+
+class HttpPool:
+    """Pool de peticiones HTTP con una sesión keep-alive y un límite de concurrencia por host.
+
+    Si recibe una caché, las respuestas 200 se guardan en disco y se
+    revalidan con If-None-Match/If-Modified-Since. En modo offline solo se
+    sirven respuestas de la caché.
+
+    Los cuerpos se descargan por bloques: la descarga se corta al llegar a
+    max_bytes (la respuesta queda marcada con truncated=True) y se aborta
+    antes de leer el cuerpo si el Content-Type no está en content_types.
+
+    Cada petición tiene tiempos de espera de conexión y lectura, los fallos
+    se reintentan según retry_policy y los hosts que fallan seguido se
+    cortan con breaker (ver fetch_policy).
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS, per_host_limit=PER_HOST_LIMIT, headers=None,
+                 cache=None, offline=False, retry_policy=None, breaker=None):
+        self.per_host_limit = per_host_limit
+        self.headers = dict(headers or DEFAULT_HEADERS)
+        self.cache = cache
+        self.offline = offline
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._sessions = {}
+        self._semaphores = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http-pool')
+
+    def _host_state(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._sessions[host], self._semaphores[host]
+
+    def get(self, url, max_bytes=MAX_BYTES, content_types=None, budget=None, **kwargs):
+        """GET reutilizando la sesión del host y respetando su límite de concurrencia.
+
+        budget (fetch_policy.TimeBudget) limita el tiempo total de la
+        petición, reintentos incluidos.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if self.offline:
+            if cached is None:
+                raise requests.ConnectionError(f"Modo offline: {url} no está en la caché")
+            return check_content_type(cached_response(url, *cached), content_types)
+
+        host = urlsplit(url).netloc.lower()
+        if not self.breaker.allow(host):
+            raise CircuitOpenError(f"Demasiados fallos seguidos en {host}: "
+                                   f"se reintentará en {self.breaker.retry_in(host):.0f}s")
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(conditional_headers(cached))
+        timeout = kwargs.pop('timeout', (CONNECT_TIMEOUT, READ_TIMEOUT))
+        if not isinstance(timeout, tuple):
+            timeout = (timeout, timeout)
+
+        attempt = 0
+        while True:
+            if budget is not None:
+                budget.check()
+                timeout = tuple(budget.cap(value) for value in timeout)
+            try:
+                response = self._get_once(url, headers, timeout, cached, max_bytes, content_types, budget, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if budget is not None and budget.expired():
+                    # El tiempo de espera se había recortado al presupuesto: el host no ha fallado
+                    raise BudgetExpiredError(f"Presupuesto de tiempo agotado descargando {url}") from e
+                delay = self.retry_policy.delay(attempt, budget=budget)
+                if delay is None:
+                    self.breaker.record_failure(host)
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    break
+                delay = self.retry_policy.delay(attempt, response.headers.get('Retry-After'), budget)
+                if delay is None:
+                    break
+            time.sleep(delay)
+            attempt += 1
+
+        if response.status_code in RETRY_STATUS:
+            self.breaker.record_failure(host)
+        else:
+            self.breaker.record_success(host)
+        store_response(self.cache, url, response)
+        return response
+
+    def _get_once(self, url, headers, timeout, cached, max_bytes, content_types, budget, kwargs):
+        session, semaphore = self._host_state(url)
+        with semaphore:
+            response = session.get(url, headers=headers, stream=True, timeout=timeout, **kwargs)
+            try:
+                if cached is not None and response.status_code == 304:
+                    _read_body(response, max_bytes, budget)
+                    self.cache.touch(url)
+                    return check_content_type(cached_response(url, *cached), content_types)
+
+                # Las respuestas que se pueden reintentar no se filtran por tipo
+                if response.status_code not in RETRY_STATUS:
+                    check_content_type(response, content_types)
+                _read_body(response, max_bytes, budget)
+            finally:
+                response.close()
+        return response
+
+    def map(self, fn, items, deadline=DEADLINE, delays=None):
+        """Ejecuta fn sobre cada elemento en el pool.
+
+        Devuelve una lista en el mismo orden que items con el resultado o la
+        excepción de cada llamada. Las que no terminan antes de deadline
+        segundos se devuelven como TimeoutError.
+
+        delays indica los segundos que hay que esperar antes de lanzar cada
+        elemento (p. ej. el turno de su host). La espera se hace en el hilo
+        que llama, así que los hilos del pool quedan libres para otros hosts.
+        """
+        items = list(items)
+        delays = list(delays) if delays is not None else [0] * len(items)
+        start = time.monotonic()
+        futures = [None] * len(items)
+        for i in sorted(range(len(items)), key=lambda i: delays[i]):
+            if delays[i] >= deadline:
+                # Su turno llega después del tiempo límite
+                break
+            pause = delays[i] - (time.monotonic() - start)
+            if pause > 0:
+                time.sleep(pause)
+            futures[i] = self._executor.submit(fn, items[i])
+        wait([future for future in futures if future is not None],
+             timeout=max(deadline - (time.monotonic() - start), 0))
+
+        results = []
+        for future in futures:
+            if future is None or not future.done():
+                if future is not None:
+                    future.cancel()
+                results.append(TimeoutError(f"Tiempo límite de {deadline}s superado"))
+            elif future.exception() is not None:
+                results.append(future.exception())
+            else:
+                results.append(future.result())
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._semaphores.clear()
+
+
+def conditional_headers(cached):
+    """Cabeceras If-None-Match/If-Modified-Since para revalidar una entrada de la caché."""
+    headers = {}
+    if cached is not None:
+        cached_headers = cached[1]['headers']
+        if 'ETag' in cached_headers:
+            headers['If-None-Match'] = cached_headers['ETag']
+        if 'Last-Modified' in cached_headers:
+            headers['If-Modified-Since'] = cached_headers['Last-Modified']
+    return headers
+
+
+def store_response(cache, url, response):
+    """Guarda en la caché una respuesta 200 completa que no prohíba almacenarse."""
+    if cache is None or response.status_code != 200 or response.truncated \
+            or 'no-store' in response.headers.get('Cache-Control', ''):
+        return
+    cache.put(url, response.content, {
+        "url": response.url,
+        "encoding": response.encoding,
+        "headers": {name: response.headers[name]
+                    for name in CACHED_HEADERS if name in response.headers}
+    })
+
+
+def build_response(url, status_code, reason, headers, body, encoding=None, truncated=False):
+    """Crea una respuesta de requests ya leída a partir de sus partes."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = encoding
+    response._content = body
+    response.truncated = truncated
+    return response
+
+
+def check_content_type(response, content_types):
+    """Lanza ContentTypeError si el Content-Type de la respuesta no está aceptado."""
+    content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_types and content_type and content_type not in content_types:
+        raise ContentTypeError(f"Tipo de contenido no admitido: {content_type}", response=response)
+    return response
+
+
+def _read_body(response, max_bytes, budget=None):
+    """Lee el cuerpo por bloques hasta max_bytes y lo deja en la respuesta.
+
+    El tiempo de lectura limita la espera de cada bloque, no la del cuerpo
+    entero: con budget se corta también si se agota el presupuesto.
+    """
+    chunks = []
+    size = 0
+    truncated = False
+    for chunk in response.iter_content(CHUNK_SIZE):
+        if budget is not None and budget.expired():
+            raise BudgetExpiredError(f"Presupuesto de tiempo agotado leyendo {response.url}")
+        if max_bytes is not None and size + len(chunk) > max_bytes:
+            chunks.append(chunk[:max_bytes - size])
+            truncated = True
+            # La conexión queda con datos sin leer y no se puede reutilizar
+            response.raw.close()
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+    response.truncated = truncated
+    return response
+
+
+def cached_response(url, body, meta):
+    """Reconstruye una respuesta de requests a partir de una entrada de la caché."""
+    return build_response(meta.get('url', url), 200, 'OK', meta.get('headers', {}), body,
+                          encoding=meta.get('encoding'))
+
+
+def default_cache():
+    """Caché en disco configurada por entorno, o None si está desactivada."""
+    return DiskCache(CACHE_DIR, int(CACHE_MAX_MB * 1024 * 1024)) if CACHE_ENABLED else None
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Devuelve el pool compartido del proceso, creándolo en el primer uso."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = HttpPool(cache=default_cache(), offline=OFFLINE)
+        return _default_pool
@@ -0,0 +1,113 @@
+"""Reduce y recomprime las imágenes de las diapositivas.
+
+Las imágenes se reducen para que quepan en IMAGE_MAX_WIDTH x IMAGE_MAX_HEIGHT
+(la resolución de una diapositiva) y se vuelven a codificar en WebP o JPEG
+con la calidad IMAGE_QUALITY. Con IMAGE_FORMAT=auto se usa WebP si Pillow lo
+admite y JPEG en caso contrario (PNG si la imagen tiene transparencia). Si el
+resultado no es más pequeño que el original, se conserva el original.
+
+Los resultados se guardan en una caché en disco indexada por el SHA-256 del
+original y los parámetros de conversión. Junto con la caché HTTP, que indexa
+las descargas por URL, una imagen ya procesada no se vuelve a descargar ni a
+convertir. Pillow es opcional: sin él las imágenes se usan tal cual.
+"""
+import hashlib
+import io
+import os
+
+from disk_cache import DiskCache
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+IMAGE_PIPELINE = os.getenv('IMAGE_PIPELINE', 'true').lower() == 'true'
+IMAGE_MAX_WIDTH = int(os.getenv('IMAGE_MAX_WIDTH', '1600'))
+IMAGE_MAX_HEIGHT = int(os.getenv('IMAGE_MAX_HEIGHT', '900'))
+# auto, webp o jpeg
+IMAGE_FORMAT = os.getenv('IMAGE_FORMAT', 'auto')
+IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '80'))
+# Tamaño máximo de una imagen descargada (las fotos superan a menudo el límite de SCRAPER_MAX_MB)
+IMAGE_MAX_DOWNLOAD_MB = float(os.getenv('IMAGE_MAX_DOWNLOAD_MB', '25'))
+IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', os.path.join(os.path.dirname(__file__), '../output/image_cache'))
+IMAGE_CACHE_MAX_MB = float(os.getenv('IMAGE_CACHE_MAX_MB', '200'))
+
+_CONTENT_TYPES = {'WEBP': 'image/webp', 'JPEG': 'image/jpeg', 'PNG': 'image/png'}
+
+
+def pillow_available():
+    return Image is not None
+
+
+def optimize_image(data, content_type, cache=None, max_size=None, image_format=None, quality=None):
+    """Devuelve (datos, tipo de contenido) de la imagen reducida y recomprimida.
+
+    Devuelve los datos originales si Pillow no está instalado, si la imagen
+    no se puede decodificar, si es animada o vectorial, o si la conversión no
+    la hace más pequeña.
+    """
+    if Image is None or not content_type.startswith('image/') or content_type == 'image/svg+xml':
+        return data, content_type
+    max_size = max_size or (IMAGE_MAX_WIDTH, IMAGE_MAX_HEIGHT)
+    image_format = _output_format(image_format or IMAGE_FORMAT)
+    quality = quality or IMAGE_QUALITY
+
+    key = f"{hashlib.sha256(data).hexdigest()}:{max_size[0]}x{max_size[1]}:{image_format}:{quality}"
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1]['content_type']
+
+    result = _convert(data, max_size, image_format, quality)
+    if result is None or len(result[0]) >= len(data):
+        result = (data, content_type)
+    if cache is not None:
+        cache.put(key, result[0], {"content_type": result[1]})
+    return result
+
+
+def _convert(data, max_size, image_format, quality):
+    try:
+        image = Image.open(io.BytesIO(data))
+        if getattr(image, 'is_animated', False):
+            return None
+        image.load()
+    except Exception:
+        return None
+
+    image.thumbnail(max_size, Image.LANCZOS)
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    if image_format == 'JPEG' and has_alpha:
+        # JPEG no admite transparencia
+        image_format = 'PNG'
+
+    if image_format == 'WEBP':
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        options = {'quality': quality, 'method': 4}
+    elif image_format == 'JPEG':
+        image = image.convert('RGB')
+        options = {'quality': quality, 'optimize': True, 'progressive': True}
+    else:
+        options = {'optimize': True}
+
+    output = io.BytesIO()
+    try:
+        image.save(output, image_format, **options)
+    except (OSError, ValueError):
+        return None
+    return output.getvalue(), _CONTENT_TYPES[image_format]
+
+
+def _output_format(name):
+    name = name.lower()
+    if name == 'jpeg' or (name == 'auto' and not features.check('webp')):
+        return 'JPEG'
+    if name in ('webp', 'auto'):
+        return 'WEBP'
+    raise ValueError(f"Formato de imagen no válido: {name}")
+
+
+def default_image_cache():
+    """Caché en disco de las imágenes convertidas."""
+    return DiskCache(IMAGE_CACHE_DIR, int(IMAGE_CACHE_MAX_MB * 1024 * 1024))
@@ -0,0 +1,81 @@
+import inspect
+import os
+import threading
+
+from crewai import LLM
+
+from disk_cache import DiskCache
+from llm_replay import LLM_REPLAY, cache_key, cached_response, record_response, stand_in_response  # noqa: F401
+
+# Caché persistente de respuestas del LLM
+LLM_CACHE = os.getenv('LLM_CACHE', 'true').lower() == 'true'
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', os.path.join(os.path.dirname(__file__), '../output/llm_cache'))
+LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+LLM_CACHE_MAX_MB = int(os.getenv('LLM_CACHE_MAX_MB', '50'))
+
+# Mismo modelo por defecto que usa crewai
+LLM_MODEL = os.getenv('MODEL', os.getenv('OPENAI_MODEL_NAME', 'gpt-4o-mini'))
+
+
+class CachedLLM(LLM):
+    """LLM de crewai con caché persistente de respuestas.
+
+    Las respuestas se guardan en una DiskCache con caducidad (ttl) y tamaño
+    máximo. En modo replay nunca se accede a la red: las respuestas guardadas
+    se sirven aunque hayan caducado y las llamadas que no están en la caché
+    las responde stand_in_response sin guardarlas.
+    """
+
+    def __init__(self, model=LLM_MODEL, cache=None, ttl=LLM_CACHE_TTL, replay=False, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.cache = cache
+        self.ttl = ttl
+        self.replay = replay
+
+    def call(self, messages, *args, **kwargs):
+        key = cache_key(self.model, messages, getattr(self, 'temperature', None),
+                        getattr(self, 'stop', None), self._tools(messages, args, kwargs))
+        cached = cached_response(self.cache, key, self.ttl, self.replay)
+        if cached is not None:
+            return cached
+
+        if self.replay:
+            return stand_in_response(messages)
+
+        response = super().call(messages, *args, **kwargs)
+        record_response(self.cache, key, response, self.model)
+        return response
+
+    def _tools(self, messages, args, kwargs):
+        """Herramientas de la llamada, se pasen por posición o por nombre."""
+        try:
+            bound = inspect.signature(super().call).bind(messages, *args, **kwargs)
+        except TypeError:
+            return kwargs.get('tools')
+        return bound.arguments.get('tools', kwargs.get('tools'))
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_llm_cache():
+    """Devuelve la caché de respuestas compartida del proceso o None si está desactivada."""
+    global _default_cache
+    if not LLM_CACHE:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = DiskCache(LLM_CACHE_DIR, LLM_CACHE_MAX_MB * 1024 * 1024)
+        return _default_cache
+
+
+def get_llm(model=None):
+    """LLM para un agente: con caché, en modo replay o None para usar el de crewai por defecto.
+
+    Cada agente necesita su propia instancia porque crewai ajusta sus
+    palabras de parada.
+    """
+    if not LLM_CACHE and not LLM_REPLAY:
+        return None
+    return CachedLLM(model or LLM_MODEL, cache=default_llm_cache(), replay=LLM_REPLAY)
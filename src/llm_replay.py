@@ -0,0 +1,68 @@
+"""Claves, grabación y modo replay de las respuestas del LLM.
+
+No importa crewai: llm_cache lo usa para su CachedLLM y los módulos que
+construyen equipos lo consultan sin cargar el LLM.
+"""
+import hashlib
+import json
+import os
+
+# Modo replay: sin red, las respuestas salen de la caché o de un modelo local de pruebas
+LLM_REPLAY = os.getenv('LLM_REPLAY', 'false').lower() == 'true'
+
+
+def cache_key(model, messages, temperature=None, stop=None, tools=None):
+    """Clave de una llamada al LLM.
+
+    Los mensajes que construye crewai ya contienen el rol, objetivo e
+    historia del agente, la descripción de la tarea y las salidas de las
+    tareas de contexto, así que cualquier cambio en ellos produce otra clave.
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    payload = {
+        "model": model,
+        "temperature": temperature,
+        "stop": stop,
+        "messages": messages,
+        "tools": tools,
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return 'llm:' + hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def stand_in_response(messages):
+    """Respuesta determinista del modelo local de pruebas.
+
+    Termina siempre con "Final Answer:" para que los agentes de crewai den
+    la tarea por completada sin llamar a herramientas.
+    """
+    if isinstance(messages, str):
+        prompt = messages
+    else:
+        users = [m.get('content') or '' for m in messages if m.get('role') == 'user']
+        prompt = users[-1] if users else ''
+    first_line = next((line.strip() for line in prompt.split('\n') if line.strip()), '')
+    return f"Thought: Respuesta del modelo local de pruebas\nFinal Answer: {first_line[:200]}"
+
+
+def cached_response(cache, key, ttl, replay=False):
+    """Respuesta guardada para key o None.
+
+    En modo replay las respuestas guardadas se sirven aunque hayan caducado.
+    """
+    if cache is None:
+        return None
+    cached = cache.get(key, max_age=None if replay else ttl)
+    if cached is None:
+        return None
+    return cached[0].decode('utf-8')
+
+
+def record_response(cache, key, response, model):
+    """Guarda la respuesta del modelo si es texto.
+
+    Las llamadas a funciones no se guardan porque no se pueden repetir.
+    """
+    if cache is not None and isinstance(response, str) and response:
+        cache.put(key, response.encode('utf-8'), {"model": model})
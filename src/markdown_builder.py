@@ -0,0 +1,82 @@
+def iter_markdown(data):
+    """Genera el documento markdown de un resultado de scraper.scrape_site por fragmentos."""
+    for _, fragments in iter_markdown_parts(data):
+        yield from fragments
+
+
+def iter_markdown_parts(data):
+    """Divide el documento markdown en partes que se pueden regenerar por separado.
+
+    Genera pares (clave, fragmentos): 'main' con la cabecera y el contenido
+    principal, 'sections' con el encabezado de las secciones (si las hay),
+    la URL de cada sección con su bloque y 'extras' con las imágenes y los
+    enlaces. Al concatenar todos los fragmentos se obtiene el mismo
+    documento que iter_markdown.
+    """
+    yield 'main', _iter_main(data)
+    if 'sections' in data:
+        yield 'sections', iter(["## Secciones Principales\n\n"])
+        for section in data['sections']:
+            yield section['url'], _iter_section(section)
+    yield 'extras', _iter_extras(data)
+
+
+def _iter_main(data):
+    yield f"# {data['title']}\n\n"
+    yield f"*Contenido extraído de: {data['url']}*\n\n"
+
+    # Contenido principal
+    yield "## Contenido Principal\n\n"
+    for item in data['main_content']:
+        if item['type'] == 'h1':
+            yield f"# {item['content']}\n\n"
+        elif item['type'] == 'h2':
+            yield f"## {item['content']}\n\n"
+        elif item['type'] == 'h3':
+            yield f"### {item['content']}\n\n"
+        else:
+            yield f"{item['content']}\n\n"
+
+
+def _iter_section(section):
+    yield f"### {section['title']}\n\n"
+    if 'error' in section:
+        yield f"*No se pudo acceder a esta sección: {section['error']}*\n\n"
+    else:
+        for item in section['content']:
+            if item['type'] == 'h1':
+                yield f"#### {item['content']}\n\n"
+            elif item['type'] == 'h2':
+                yield f"#### {item['content']}\n\n"
+            else:
+                yield f"{item['content']}\n\n"
+
+    yield f"[Ver más en {section['url']}]({section['url']})\n\n"
+
+
+def _iter_extras(data):
+    # Imágenes destacadas
+    if data['images'] and len(data['images']) > 0:
+        yield "## Imágenes Destacadas\n\n"
+        for img in data['images']:
+            yield f"![{img['alt']}]({img['src']})\n\n"
+
+    # Enlaces importantes
+    if data['links'] and len(data['links']) > 0:
+        yield "## Enlaces Importantes\n\n"
+        for link in data['links'][:5]:
+            href = link['href']
+            if not href.startswith('http'):
+                base_url = '/'.join(data['url'].split('/')[:3])
+                href = base_url + href
+            yield f"- [{link['text']}]({href})\n"
+
+
+def build_markdown(data):
+    """Convierte el resultado de scraper.scrape_site en un documento markdown."""
+    return ''.join(iter_markdown(data))
+
+
+def write_markdown(data, f):
+    """Escribe el documento markdown en un fichero abierto a medida que se genera."""
+    f.writelines(iter_markdown(data))
@@ -0,0 +1,205 @@
+"""Tokenizador de markdown de una sola pasada para construir las diapositivas.
+
+Reconoce la estructura de bloques de CommonMark que aparece en los documentos
+de build_markdown y en el markdown que reescribe el LLM: encabezados ATX y
+setext, párrafos de varias líneas, listas con viñetas o numeradas (con
+líneas de continuación), citas, bloques de código (con vallas o sangrados) y
+separadores. Cada línea se examina una vez y los bloques se generan a medida
+que se cierran. No construye un árbol de inlines: solo distingue los
+párrafos o elementos de lista que son una imagen o un enlace completos.
+"""
+import re
+
+_CLOSING_HASHES = re.compile(r'[ \t]+#+$')
+_FENCE = re.compile(r'(`{3,}|~{3,})')
+_LIST_ITEM = re.compile(r'(?:[-+*]|\d{1,9}[.)])(?:[ \t]+(.*)|$)')
+_THEMATIC_BREAK = re.compile(r'(?:\*[ \t]*){3,}|(?:-[ \t]*){3,}|(?:_[ \t]*){3,}')
+_SETEXT = re.compile(r'=+[ \t]*|-+[ \t]*')
+# Caracteres con los que puede empezar una línea que no es texto de párrafo
+_BLOCK_START = frozenset('#=-`~*_+>0123456789')
+
+# Texto de enlace con un nivel de corchetes anidados y destino con título opcional
+_LABEL = r'((?:[^\[\]\\]|\\.|\[[^\]]*\])*)'
+_DESTINATION = r'\(\s*<?((?:[^\s()<>]|\([^\s()]*\))*)>?(?:\s+(?:"[^"]*"|\'[^\']*\'))?\s*\)'
+_IMAGE = re.compile(r'!\[' + _LABEL + r'\]' + _DESTINATION)
+_LINK = re.compile(r'\[' + _LABEL + r'\]' + _DESTINATION)
+_LINKED_IMAGE = re.compile(r'\[\s*!\[' + _LABEL + r'\]' + _DESTINATION + r'\s*\]' + _DESTINATION)
+
+
+def iter_blocks(markdown):
+    """Genera los bloques del documento como tuplas (tipo, nivel, texto).
+
+    Los tipos son heading (con su nivel), paragraph, item (elemento de lista)
+    y code; el nivel solo tiene sentido en los encabezados.
+    """
+    buffer = []          # líneas del párrafo o elemento de lista abierto
+    buffer_kind = None   # 'paragraph' o 'item'
+    in_list = False
+    in_quote = False
+    fence = None
+    code = []
+
+    for line in markdown.splitlines():
+        # Dentro de un bloque de código con vallas todo es literal hasta la valla de cierre
+        if fence is not None:
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                yield ('code', 0, '\n'.join(code))
+                fence = None
+                code = []
+            else:
+                code.append(line)
+            continue
+
+        # Casos más frecuentes: línea vacía y línea de texto sin sangría
+        first = line[:1]
+        if not first:
+            in_quote = False
+            if buffer:
+                yield (buffer_kind, 0, ' '.join(buffer))
+                buffer = []
+            continue
+        if first not in _BLOCK_START and first not in ' \t':
+            if code:
+                yield ('code', 0, '\n'.join(code))
+                code = []
+            if not buffer:
+                buffer_kind = 'paragraph'
+                in_list = False
+            in_quote = False
+            buffer.append(line.rstrip())
+            continue
+
+        body = line.lstrip()
+        if not body:
+            in_quote = False
+            if buffer:
+                yield (buffer_kind, 0, ' '.join(buffer))
+                buffer = []
+            continue
+
+        indent = len(line) - len(body)
+        if indent >= 4 and not buffer and not in_list:
+            # Bloque de código sangrado: las líneas consecutivas se unen
+            code.append(line[4:])
+            continue
+        if code:
+            yield ('code', 0, '\n'.join(code))
+            code = []
+
+        # Las citas se tratan como su contenido; la primera línea de una cita cierra el bloque abierto
+        if body[0] == '>':
+            if not in_quote and buffer:
+                yield (buffer_kind, 0, ' '.join(buffer))
+                buffer = []
+            in_quote = True
+            while body.startswith('>'):
+                body = body[1:].lstrip()
+        else:
+            in_quote = False
+        if not body:
+            if buffer:
+                yield (buffer_kind, 0, ' '.join(buffer))
+                buffer = []
+            continue
+
+        first = body[0]
+        if first == '#':
+            level = len(body) - len(body.lstrip('#'))
+            if level <= 6 and (level == len(body) or body[level] in ' \t'):
+                if buffer:
+                    yield (buffer_kind, 0, ' '.join(buffer))
+                    buffer = []
+                in_list = False
+                text = body[level:].strip()
+                if text.endswith('#'):
+                    # Secuencia de cierre opcional ("## Título ##")
+                    text = _CLOSING_HASHES.sub('', ' ' + text).strip()
+                yield ('heading', level, text)
+                continue
+
+        elif first in '=-' and buffer_kind == 'paragraph' and buffer and _SETEXT.fullmatch(body):
+            # Subrayado setext: el párrafo abierto es un encabezado
+            yield ('heading', 1 if first == '=' else 2, ' '.join(buffer))
+            buffer = []
+            continue
+
+        elif first in '`~':
+            match = _FENCE.match(body)
+            if match:
+                if buffer:
+                    yield (buffer_kind, 0, ' '.join(buffer))
+                    buffer = []
+                fence = match.group(1)
+                continue
+
+        if first in '-*_' and _THEMATIC_BREAK.fullmatch(body):
+            if buffer:
+                yield (buffer_kind, 0, ' '.join(buffer))
+                buffer = []
+            in_list = False
+            continue
+
+        if first in '-+*' or first.isdigit():
+            match = _LIST_ITEM.match(body)
+            if match:
+                if buffer:
+                    yield (buffer_kind, 0, ' '.join(buffer))
+                item = (match.group(1) or '').strip()
+                buffer = [item] if item else []
+                buffer_kind = 'item'
+                in_list = True
+                continue
+
+        # Línea de texto: continúa el párrafo o elemento abierto o empieza un párrafo
+        if not buffer:
+            buffer_kind = 'paragraph'
+            # Una línea sin sangría tras una línea en blanco cierra la lista
+            in_list = in_list and indent > 0
+        buffer.append(body.rstrip())
+
+    if fence is not None or code:
+        yield ('code', 0, '\n'.join(code))
+    if buffer:
+        yield (buffer_kind, 0, ' '.join(buffer))
+
+
+def strip_outer_fence(markdown):
+    """Quita la valla de código que envuelve todo el documento, como la que suele añadir el LLM.
+
+    Solo se quita si la valla no tiene lenguaje o es markdown/md y se cierra
+    al final del documento.
+    """
+    text = markdown.strip()
+    if not text.startswith(('```', '~~~')):
+        return markdown
+    first_line, _, rest = text.partition('\n')
+    fence = first_line[:3]
+    info = first_line.lstrip(fence[0]).strip().lower()
+    if info not in ('', 'markdown', 'md') or not rest.rstrip().endswith(fence):
+        return markdown
+    body, _, closing = rest.rstrip().rpartition('\n')
+    if closing.strip().strip(fence[0]):
+        return markdown
+    return body
+
+
+def inline_items(text):
+    """Convierte el texto de un párrafo o elemento de lista en elementos de diapositiva.
+
+    Un párrafo que es solo una imagen (o varias), una imagen enlazada o un
+    enlace da elementos image o link; cualquier otro texto, aunque contenga
+    enlaces, queda como un único elemento text con su markdown.
+    """
+    if text[:1] == '!':
+        images = _IMAGE.findall(text)
+        if images and not _IMAGE.sub('', text).strip():
+            return [{"type": "image", "alt": alt, "src": src} for alt, src in images]
+    elif text[:1] == '[':
+        match = _LINKED_IMAGE.fullmatch(text)
+        if match:
+            return [{"type": "image", "alt": match.group(1), "src": match.group(2)}]
+        match = _LINK.fullmatch(text)
+        if match:
+            return [{"type": "link", "text": match.group(1), "href": match.group(2)}]
+    return [{"type": "text", "text": text}]
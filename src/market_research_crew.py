@@ -1,96 +1,123 @@
-from crewai import Agent, Task, Crew, Process
-try:
-    from langchain.tools import tool
-except ImportError:
-    from crewai.tools import tool
 import os
 import json
 from datetime import date
 
+from crew_setup import crew_memory, lazy_crew
+from dag_scheduler import DAG_MAX_WORKERS, run_tasks
+
 # Configuración desde variables de entorno
-PROCESS = Process[os.getenv('CREWAI_PROCESS', 'sequential')]
+# crewai y langchain se importan al construir el equipo, no al importar el módulo
+PROCESS = os.getenv('CREWAI_PROCESS', 'sequential')
 MEMORY = os.getenv('CREWAI_MEMORY', 'true').lower() == 'true'
 VERBOSE = os.getenv('CREWAI_VERBOSE', 'true').lower() == 'true'
 
-# Herramientas personalizadas
-@tool
+# Planificador de tareas: dag (tareas independientes en paralelo) o crew (kickoff de crewai)
+TASK_SCHEDULER = os.getenv('TASK_SCHEDULER', 'dag')
+
+# Herramientas personalizadas; build_crew las envuelve con el decorador @tool
 def search_ai_agents(query: str) -> str:
     """Busca información sobre agentes de IA y empresas que los desarrollan."""
     # Implementar lógica real de búsqueda o integración con API
     return f"Resultados de búsqueda sobre agentes de IA: {query}"
 
-@tool
 def analyze_ai_trends(agent_type: str) -> str:
     """Analiza tendencias actuales en el mercado de agentes de IA por tipo."""
     # Implementar lógica de análisis
     return f"Análisis de tendencias para agentes de IA de tipo: {agent_type}"
 
-@tool
 def compare_agent_capabilities(agents_list: str) -> str:
     """Compara capacidades de diferentes agentes de IA."""
     # Implementar comparación
     return f"Comparación de capacidades entre: {agents_list}"
 
-@tool
 def generate_ai_market_charts(data: str) -> str:
     """Genera visualizaciones basadas en datos del mercado de IA."""
     # Implementar generación de gráficos
     return f"Gráficos del mercado de IA generados basados en: {data}"
 
-# Definir agentes
-investigador = Agent(
-    role='Investigador de Tecnologías de IA',
-    goal='Recopilar datos precisos sobre agentes de IA, sus desarrolladores, capacidades y modelos de negocio',
-    backstory='Especialista en investigación tecnológica con amplia experiencia en el seguimiento de avances en inteligencia artificial y agentes autónomos.',
-    verbose=VERBOSE,
-    tools=[search_ai_agents, analyze_ai_trends]
-)
-
-analista = Agent(
-    role='Analista de Mercado de IA',
-    goal='Identificar patrones significativos y oportunidades en el mercado de agentes de IA',
-    backstory='Analista con experiencia en evaluación de tecnologías emergentes y visualización de datos sobre adopción de IA.',
-    verbose=VERBOSE,
-    tools=[compare_agent_capabilities, generate_ai_market_charts]
-)
-
-estratega = Agent(
-    role='Estratega de Tecnologías de IA',
-    goal='Generar recomendaciones estratégicas para posicionamiento en el mercado de agentes de IA',
-    backstory='Consultor tecnológico especializado en estrategias de implementación y monetización de sistemas de IA.',
-    verbose=VERBOSE
-)
-
-redactor = Agent(
-    role='Redactor Técnico especializado en IA',
-    goal='Crear informes ejecutivos claros y persuasivos sobre tecnologías de agentes de IA',
-    backstory='Comunicador técnico con experiencia traduciendo conceptos complejos de IA a lenguaje accesible para decisores empresariales.',
-    verbose=VERBOSE
-)
-
-# Definir tareas
-tarea_investigacion = Task(
-    description='Investigar el mercado actual de agentes de IA. Identifica al menos 5 plataformas principales de agentes (como CrewAI, AutoGPT, LangChain, BabyAGI) y 3 tendencias emergentes en arquitecturas multiagente.',
-    expected_output='Informe detallado sobre plataformas de agentes de IA (arquitectura, capacidades, precios, limitaciones) y análisis de tendencias con ejemplos de implementaciones.',
-    agent=investigador
-)
-
-tarea_analisis = Task(
-    description='Analizar los datos recopilados para identificar patrones de adopción, nichos de mercado y barreras técnicas en sistemas multiagente de IA.',
-    expected_output='Análisis con visualizaciones que muestren comparativas de capacidades, casos de uso óptimos y métricas de rendimiento entre diferentes arquitecturas de agentes.',
-    agent=analista,
-    context=[tarea_investigacion]
-)
-
-tarea_estrategia = Task(
-    description='Desarrollar recomendaciones estratégicas para implementación o desarrollo de sistemas multiagente basadas en el análisis de plataformas existentes.',
-    expected_output='Lista priorizada de recomendaciones de arquitecturas según caso de uso, con justificación técnica, beneficios esperados y consideraciones de implementación.',
-    agent=estratega,
-    context=[tarea_analisis]
-)
-
-tarea_informe = Task(
-    description='''
+def build_crew():
+    """Crea los agentes, las tareas y el equipo."""
+    from crewai import Agent, Task, Crew, Process
+    try:
+        from langchain.tools import tool
+    except ImportError:
+        from crewai.tools import tool
+
+    from llm_cache import get_llm
+
+    # Definir agentes
+    investigador = Agent(
+        role='Investigador de Tecnologías de IA',
+        goal='Recopilar datos precisos sobre agentes de IA, sus desarrolladores, capacidades y modelos de negocio',
+        backstory='Especialista en investigación tecnológica con amplia experiencia en el seguimiento de avances en inteligencia artificial y agentes autónomos.',
+        llm=get_llm(),
+        verbose=VERBOSE,
+        tools=[tool(search_ai_agents), tool(analyze_ai_trends)]
+    )
+
+    analista = Agent(
+        role='Analista de Mercado de IA',
+        goal='Identificar patrones significativos y oportunidades en el mercado de agentes de IA',
+        backstory='Analista con experiencia en evaluación de tecnologías emergentes y visualización de datos sobre adopción de IA.',
+        llm=get_llm(),
+        verbose=VERBOSE,
+        tools=[tool(compare_agent_capabilities), tool(generate_ai_market_charts)]
+    )
+
+    estratega = Agent(
+        role='Estratega de Tecnologías de IA',
+        goal='Generar recomendaciones estratégicas para posicionamiento en el mercado de agentes de IA',
+        backstory='Consultor tecnológico especializado en estrategias de implementación y monetización de sistemas de IA.',
+        llm=get_llm(),
+        verbose=VERBOSE
+    )
+
+    redactor = Agent(
+        role='Redactor Técnico especializado en IA',
+        goal='Crear informes ejecutivos claros y persuasivos sobre tecnologías de agentes de IA',
+        backstory='Comunicador técnico con experiencia traduciendo conceptos complejos de IA a lenguaje accesible para decisores empresariales.',
+        llm=get_llm(),
+        verbose=VERBOSE
+    )
+
+    # Definir tareas
+    # La investigación de plataformas y la de tendencias son independientes, igual
+    # que el análisis de cada una, así que el planificador DAG las ejecuta a la vez
+    tarea_investigacion = Task(
+        description='Investigar el mercado actual de agentes de IA. Identifica al menos 5 plataformas principales de agentes (como CrewAI, AutoGPT, LangChain, BabyAGI).',
+        expected_output='Informe detallado sobre plataformas de agentes de IA: arquitectura, capacidades, precios y limitaciones de cada una.',
+        agent=investigador
+    )
+
+    tarea_tendencias = Task(
+        description='Investigar al menos 3 tendencias emergentes en arquitecturas multiagente de IA.',
+        expected_output='Análisis de tendencias emergentes en arquitecturas multiagente con ejemplos de implementaciones.',
+        agent=investigador
+    )
+
+    tarea_analisis = Task(
+        description='Comparar las plataformas de agentes investigadas para identificar sus casos de uso óptimos y sus diferencias de capacidades y rendimiento.',
+        expected_output='Análisis con visualizaciones que muestren comparativas de capacidades, casos de uso óptimos y métricas de rendimiento entre diferentes arquitecturas de agentes.',
+        agent=analista,
+        context=[tarea_investigacion]
+    )
+
+    tarea_adopcion = Task(
+        description='Analizar las tendencias investigadas para identificar patrones de adopción, nichos de mercado y barreras técnicas en sistemas multiagente de IA.',
+        expected_output='Análisis de patrones de adopción, nichos de mercado identificados y barreras técnicas de los sistemas multiagente.',
+        agent=analista,
+        context=[tarea_tendencias]
+    )
+
+    tarea_estrategia = Task(
+        description='Desarrollar recomendaciones estratégicas para implementación o desarrollo de sistemas multiagente basadas en el análisis de plataformas existentes.',
+        expected_output='Lista priorizada de recomendaciones de arquitecturas según caso de uso, con justificación técnica, beneficios esperados y consideraciones de implementación.',
+        agent=estratega,
+        context=[tarea_analisis, tarea_adopcion]
+    )
+
+    tarea_informe = Task(
+        description='''
     Crear un informe ejecutivo final en formato Markdown que sintetice la investigación sobre agentes de IA, 
     análisis de plataformas y recomendaciones para implementación. Usa el siguiente esquema:
     
@@ -115,23 +142,33 @@ tarea_informe = Task(
     ## 5. Conclusiones
     ## Apéndice: Recursos Adicionales
     ''',
-    expected_output='Informe ejecutivo técnico en Markdown, siguiendo la estructura especificada, con comparativa detallada de arquitecturas de agentes, visualizaciones referenciadas, y recomendaciones específicas para diferentes casos de uso.',
-    agent=redactor,
-    context=[tarea_investigacion, tarea_analisis, tarea_estrategia]
-)
-
-# Crear el equipo
-crew_investigacion_ai = Crew(
-    agents=[investigador, analista, estratega, redactor],
-    tasks=[tarea_investigacion, tarea_analisis, tarea_estrategia, tarea_informe],
-    verbose=VERBOSE,
-    process=PROCESS,
-    memory=MEMORY
-)
+        expected_output='Informe ejecutivo técnico en Markdown, siguiendo la estructura especificada, con comparativa detallada de arquitecturas de agentes, visualizaciones referenciadas, y recomendaciones específicas para diferentes casos de uso.',
+        agent=redactor,
+        context=[tarea_investigacion, tarea_tendencias, tarea_analisis, tarea_adopcion, tarea_estrategia]
+    )
+
+    # Crear el equipo
+    return Crew(
+        agents=[investigador, analista, estratega, redactor],
+        tasks=[tarea_investigacion, tarea_tendencias, tarea_analisis, tarea_adopcion, tarea_estrategia, tarea_informe],
+        verbose=VERBOSE,
+        process=Process[PROCESS],
+        memory=crew_memory(MEMORY)
+    )
+
+get_crew = lazy_crew(build_crew)
 
 # Ejecutar el equipo
 if __name__ == "__main__":
-    resultado_obj = crew_investigacion_ai.kickoff()
+    if TASK_SCHEDULER == 'dag':
+        if MEMORY:
+            # La memoria de crewai solo se guarda y se consulta dentro de Crew.kickoff()
+            print("Aviso: la memoria de crewai (CREWAI_MEMORY) no se usa con TASK_SCHEDULER=dag; "
+                  "usa TASK_SCHEDULER=crew para conservarla o CREWAI_MEMORY=false para no ver este aviso")
+        # La salida de la última tarea (el informe) es el resultado del equipo
+        resultado_obj = run_tasks(get_crew().tasks, max_workers=DAG_MAX_WORKERS)[-1]
+    else:
+        resultado_obj = get_crew().kickoff()
     
     # Extraer el resultado como texto
     try:
@@ -0,0 +1,151 @@
+"""Renderizador HTML de RevealJS a partir de la lista de diapositivas.
+
+La cabecera y el pie se preparan una sola vez al importar el módulo, las
+plantillas de cada elemento son f-strings compiladas con la función, y el documento
+se emite por fragmentos, uno por diapositiva (iter_revealjs), que se unen con
+''.join (render_revealjs) o se escriben directamente en un fichero
+(write_revealjs), en lugar de concatenar cadenas. Títulos, textos y atributos
+se escapan. Las páginas de continuación de una diapositiva paginada
+("continued": True) se agrupan con ella en una pila vertical.
+"""
+from html import escape
+
+REVEALJS_CDN = "https://cdn.jsdelivr.net/npm/reveal.js@4.4.0/dist"
+
+_HEAD = """<!doctype html>
+<html lang="es">
+<head>
+    <meta charset="utf-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{cdn}/reset.css">
+    <link rel="stylesheet" href="{cdn}/reveal.css">
+    <link rel="stylesheet" href="{cdn}/theme/white.css">
+    <style>
+        .reveal .slides {{
+            text-align: left;
+        }}
+        .reveal .slides h1, .reveal .slides h2, .reveal .slides h3 {{
+            margin-bottom: 30px;
+        }}
+        .reveal p {{
+            margin-bottom: 20px;
+        }}
+        .title-slide h1 {{
+            font-size: 3em;
+            text-align: center;
+            margin-top: 30vh;
+        }}
+        .image-slide img {{
+            max-height: 65vh;
+            margin: 0 auto;
+            display: block;
+        }}
+        .thanks-slide {{
+            text-align: center;
+        }}
+        .thanks-slide h2 {{
+            margin-top: 30vh;
+        }}
+    </style>
+</head>
+<body>
+    <div class="reveal">
+        <div class="slides">
+""".format
+
+_TAIL = """        </div>
+    </div>
+    <script src="{cdn}/reveal.js"></script>
+    <script>
+        Reveal.initialize({{
+            hash: true,
+            slideNumber: true,
+            transition: 'slide',
+            controls: true,
+            progress: true,
+            center: false,
+            plugins: []
+        }});
+    </script>
+</body>
+</html>""".format
+
+_SLIDE_CLASSES = {
+    "title": "title-slide",
+    "end": "thanks-slide",
+}
+
+
+def _text(value):
+    # La mayoría de textos no tienen nada que escapar; comprobarlo es más rápido que escape()
+    if '&' in value or '<' in value or '>' in value:
+        return escape(value, quote=False)
+    return value
+
+
+def _attr(value):
+    if '&' in value or '<' in value or '>' in value or '"' in value or "'" in value:
+        return escape(value, quote=True)
+    return value
+
+
+def render_slide(slide):
+    """Devuelve el HTML de una diapositiva."""
+    slide_type = slide["type"]
+    title = _text(slide["title"])
+    parts = [
+        f'            <section class="{_SLIDE_CLASSES.get(slide_type, "")}">\n',
+        f'                <h1>{title}</h1>\n' if slide_type == "title" else f'                <h2>{title}</h2>\n',
+    ]
+    append = parts.append
+
+    has_image = any(item["type"] == "image" for item in slide["content"])
+    if has_image:
+        append('                <div class="image-slide">\n')
+
+    for item in slide["content"]:
+        if item["type"] == "text":
+            append(f'                <p>{_text(item["text"])}</p>\n')
+        elif item["type"] == "image":
+            append(f'                <img src="{_attr(item["src"])}" alt="{_attr(item["alt"])}">\n')
+        elif item["type"] == "link":
+            append(f'                <p><a href="{_attr(item["href"])}" target="_blank">{_text(item["text"])}</a></p>\n')
+
+    if has_image:
+        append('                </div>\n')
+    append('            </section>\n')
+    return ''.join(parts)
+
+
+def iter_revealjs(title, slides, cdn=REVEALJS_CDN):
+    """Genera el documento HTML de la presentación por fragmentos (uno por diapositiva o pila vertical)."""
+    yield _HEAD(title=_text(title), cdn=cdn)
+    for stack in _stacks(slides):
+        if len(stack) == 1:
+            yield render_slide(stack[0])
+        else:
+            yield ''.join(['            <section>\n', *[render_slide(slide) for slide in stack], '            </section>\n'])
+    yield _TAIL(cdn=cdn)
+
+
+def _stacks(slides):
+    # Cada diapositiva con sus páginas de continuación
+    stack = []
+    for slide in slides:
+        if stack and not slide.get("continued"):
+            yield stack
+            stack = []
+        stack.append(slide)
+    if stack:
+        yield stack
+
+
+def render_revealjs(title, slides, cdn=REVEALJS_CDN):
+    """Devuelve el HTML completo de la presentación."""
+    return ''.join(iter_revealjs(title, slides, cdn))
+
+
+def write_revealjs(title, slides, f, cdn=REVEALJS_CDN):
+    """Escribe el HTML de la presentación en un fichero abierto sin construirlo entero en memoria."""
+    f.writelines(iter_revealjs(title, slides, cdn))
@@ -0,0 +1,107 @@
+"""Detecta qué partes de una página han cambiado desde la última ejecución.
+
+Cada directorio de resultados guarda un manifiesto (.manifest.json) con el
+hash de cada bloque de la página, agrupados en las mismas partes que el
+markdown (markdown_builder.iter_markdown_parts): 'main', 'sections', una
+por sección (por su URL) y 'extras'. También guarda los ajustes con los que
+se generó (formatos, modo, resumen...), los ficheros generados y, si se
+resumió, el resumen de cada parte.
+
+En la siguiente ejecución, changed_parts compara la página nueva con el
+manifiesto. Si no ha cambiado nada y los ficheros siguen ahí, no hay nada
+que regenerar; si solo cambian algunas partes, solo esas se vuelven a
+resumir. Con INCREMENTAL=false se regenera siempre todo.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+INCREMENTAL = os.getenv('INCREMENTAL', 'true').lower() == 'true'
+
+MANIFEST_FILENAME = '.manifest.json'
+MANIFEST_VERSION = 1
+
+
+def block_hash(*fields):
+    """Hash corto de los campos de un bloque."""
+    return hashlib.sha256('\x1f'.join(fields).encode('utf-8')).hexdigest()[:16]
+
+
+def page_parts(page):
+    """Devuelve {parte: [hash de cada bloque]} de una página (document_model.Page)."""
+    parts = {'main': [block_hash('page', page.url, page.title)]
+             + [block_hash(block.type, block.content) for block in page.blocks]}
+    if page.sections is not None:
+        parts['sections'] = [block_hash('sections')]
+    for section in page.sections or []:
+        if section.error is not None:
+            parts[section.url] = [block_hash('error', section.title, section.error)]
+        else:
+            parts[section.url] = [block_hash('section', section.title)] \
+                + [block_hash(block.type, block.content) for block in section.blocks]
+    parts['extras'] = [block_hash('image', image.alt, image.src) for image in page.images] \
+        + [block_hash('link', link.text, link.href) for link in page.links]
+    return parts
+
+
+class ScrapeManifest:
+    """Estado de la última generación de un directorio de resultados."""
+
+    def __init__(self, url, settings, parts, outputs=(), summaries=None):
+        self.url = url
+        self.settings = settings
+        self.parts = parts
+        self.outputs = list(outputs)
+        self.summaries = summaries or {}
+
+    @classmethod
+    def load(cls, output_dir):
+        """Lee el manifiesto de output_dir; None si no existe, no se puede leer o es de otra versión."""
+        try:
+            with open(os.path.join(output_dir, MANIFEST_FILENAME), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MANIFEST_VERSION:
+            return None
+        return cls(data['url'], data['settings'], data['parts'], data.get('outputs', ()), data.get('summaries'))
+
+    def save(self, output_dir):
+        """Escribe el manifiesto de forma atómica."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "url": self.url,
+            "settings": self.settings,
+            "parts": self.parts,
+            "outputs": self.outputs,
+            "summaries": self.summaries,
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix='.tmp-')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, os.path.join(output_dir, MANIFEST_FILENAME))
+
+    def changed_parts(self, url, settings, parts):
+        """Partes nuevas, modificadas o eliminadas respecto al manifiesto.
+
+        Si cambian la URL o los ajustes, todas las partes cuentan como modificadas.
+        """
+        if url != self.url or settings != self.settings:
+            return list(dict.fromkeys(list(parts) + list(self.parts)))
+        changed = [key for key, hashes in parts.items() if self.parts.get(key) != hashes]
+        return changed + [key for key in self.parts if key not in parts]
+
+    def outputs_exist(self, output_dir):
+        return bool(self.outputs) and all(os.path.exists(os.path.join(output_dir, name)) for name in self.outputs)
+
+
+def unchanged(output_dir, url, settings, parts):
+    """Devuelve el manifiesto si nada ha cambiado y los ficheros generados siguen en output_dir, si no None."""
+    if not INCREMENTAL:
+        return None
+    manifest = ScrapeManifest.load(output_dir)
+    if manifest is None or manifest.changed_parts(url, settings, parts) or not manifest.outputs_exist(output_dir):
+        return None
+    return manifest
@@ -0,0 +1,220 @@
+import asyncio
+import os
+
+import async_http_pool
+from async_http_pool import get_async_pool
+from content_dedup import SCRAPER_DEDUP, dedupe_scrape
+from crawl_frontier import SCRAPER_ROBOTS, CrawlFrontier
+from fetch_policy import TimeBudget
+from html_parsers import get_backend
+from http_pool import DEADLINE, HTML_CONTENT_TYPES, get_pool
+
+# Motor de descargas: auto, async o threads
+ENGINE = os.getenv('SCRAPER_ENGINE', 'auto')
+
+# Etiquetas de contenido que se extraen de la página principal y de las secciones
+MAIN_TAGS = ['h1', 'h2', 'h3', 'p']
+SECTION_TAGS = ['h1', 'h2', 'p']
+
+
+def scrape_site(target, pool=None, backend=None):
+    """Extrae el contenido de una página y de sus secciones principales.
+
+    Las secciones se eligen con una frontera de rastreo (ver crawl_frontier)
+    y se descargan en paralelo por lotes. Sin pool explícito se usa el
+    motor indicado en SCRAPER_ENGINE: el asíncrono (scrape_site_async) si
+    aiohttp está instalado o, si no, el pool de hilos compartido. Con
+    SCRAPER_DEDUP se elimina el contenido repetido entre la página y sus
+    secciones (ver content_dedup).
+    El scrape entero, reintentos incluidos, dura como mucho SCRAPER_BUDGET
+    segundos (ver fetch_policy): agotado el presupuesto, las secciones que
+    faltan se marcan con error o no se rastrean.
+    backend es el parser HTML a usar (ver html_parsers.get_backend).
+    """
+    if pool is None and use_async_engine():
+        async_pool = get_async_pool()
+        return async_pool.run(scrape_site_async(target, async_pool, backend))
+
+    pool = pool or get_pool()
+    backend = backend or get_backend()
+    budget = TimeBudget()
+
+    response = pool.get(target, content_types=HTML_CONTENT_TYPES, budget=budget)
+    result, links = _main_page(target, response, backend)
+
+    if links is not None:
+        frontier = CrawlFrontier(target)
+        if SCRAPER_ROBOTS:
+            try:
+                robots = pool.get(frontier.robots_url, budget=budget)
+                frontier.set_robots(robots.status_code, robots.text)
+            except Exception:
+                # Sin robots.txt accesible se rastrea sin restricciones
+                pass
+        frontier.add_links(links, target, depth=1)
+
+        def fetch_section(url):
+            return _section_page(pool.get(url, content_types=HTML_CONTENT_TYPES, budget=budget), backend)
+
+        result["sections"] = []
+        batch = frontier.next_batch()
+        while batch and not budget.expired():
+            urls = [url for url, _, _ in batch]
+            # Cada sección se lanza en el turno de su host, sin ocupar un hilo del pool mientras espera
+            delays = [frontier.rate_limiter.reserve(url) for url in urls]
+            fetched = pool.map(fetch_section, urls, deadline=budget.cap(DEADLINE), delays=delays)
+            result["sections"].extend(_sections(frontier, batch, fetched))
+            batch = frontier.next_batch()
+
+    return dedupe_scrape(result) if SCRAPER_DEDUP else result
+
+
+async def scrape_site_async(target, pool, backend=None):
+    """Versión asíncrona de scrape_site sobre un AsyncHttpPool.
+
+    El análisis del HTML y la eliminación de duplicados se hacen en hilos
+    aparte: el bucle del pool lo comparten todas las descargas del proceso.
+    """
+    backend = backend or get_backend()
+    budget = TimeBudget()
+
+    response = await pool.get(target, content_types=HTML_CONTENT_TYPES, budget=budget)
+    result, links = await asyncio.to_thread(_main_page, target, response, backend)
+
+    if links is not None:
+        frontier = CrawlFrontier(target)
+        if SCRAPER_ROBOTS:
+            try:
+                robots = await pool.get(frontier.robots_url, budget=budget)
+                frontier.set_robots(robots.status_code, robots.text)
+            except Exception:
+                pass
+        frontier.add_links(links, target, depth=1)
+
+        async def fetch_section(url):
+            await asyncio.sleep(frontier.rate_limiter.reserve(url))
+            response = await pool.get(url, content_types=HTML_CONTENT_TYPES, budget=budget)
+            return await asyncio.to_thread(_section_page, response, backend)
+
+        result["sections"] = []
+        batch = frontier.next_batch()
+        while batch and not budget.expired():
+            fetched = await pool.gather((fetch_section(url) for url, _, _ in batch), deadline=budget.cap(DEADLINE))
+            result["sections"].extend(_sections(frontier, batch, fetched))
+            batch = frontier.next_batch()
+
+    return await asyncio.to_thread(dedupe_scrape, result) if SCRAPER_DEDUP else result
+
+
+def use_async_engine():
+    """Indica si scrape_site usa el motor asíncrono (según SCRAPER_ENGINE y si aiohttp está instalado)."""
+    if ENGINE == 'threads':
+        return False
+    return async_http_pool.aiohttp is not None
+
+
+def _main_page(target, response, backend):
+    """Extrae la página principal.
+
+    Devuelve el resultado y todos los enlaces de la página (None si no tiene).
+    """
+    response.raise_for_status()
+
+    page = extract_page(response.text, MAIN_TAGS, backend=backend)
+
+    # Extraer elementos principales
+    title = page["title"] if page["title"] is not None else ""
+    main_content = page["content"]
+    links = page["links"]
+    images = page["images"]
+
+    result = {
+        "url": target,
+        "title": title,
+        "main_content": main_content,
+        "links": links[:10],  # Limitar a 10 enlaces
+        "images": images[:5]   # Limitar a 5 imágenes
+    }
+
+    # Las secciones adicionales se eligen entre los enlaces, si existen
+    return result, links or None
+
+
+def _section_page(section_response, backend):
+    """Devuelve el título (o None), el contenido y los enlaces de una sección descargada."""
+    section_response.raise_for_status()
+    page = extract_page(section_response.text, SECTION_TAGS, per_tag_limit=5,  # Limitar elementos por sección
+                        backend=backend)
+
+    return page["title"], page["content"], page["links"]
+
+
+def _sections(frontier, batch, fetched):
+    """Construye las secciones de un lote y añade sus enlaces a la frontera."""
+    sections = []
+    for (section_url, section_link, depth), section in zip(batch, fetched):
+        if isinstance(section, Exception):
+            sections.append({
+                "title": section_link['text'],
+                "url": section_url,
+                "error": str(section)
+            })
+            continue
+
+        section_title, section_content, section_links = section
+        sections.append({
+            "title": section_title if section_title is not None else section_link['text'],
+            "url": section_url,
+            "content": section_content
+        })
+        frontier.add_links(section_links, section_url, depth + 1)
+    return sections
+
+
+def extract_page(html, content_tags, per_tag_limit=None, backend=None):
+    """Recorre el documento una sola vez y extrae título, contenido, enlaces e imágenes.
+
+    El contenido conserva el orden del documento. Con per_tag_limit solo se
+    consideran los primeros elementos de cada etiqueta de contenido.
+    """
+    backend = backend or get_backend()
+    title = None
+    content = []
+    links = []
+    images = []
+    seen = dict.fromkeys(content_tags, 0)
+
+    for name, attrs, node in backend.elements(html, ['title', 'a', 'img'] + list(content_tags)):
+        if name == 'title':
+            if title is None:
+                title = backend.text(node)
+        elif name == 'a':
+            text = backend.text(node).strip() if 'href' in attrs else ''
+            if text:
+                links.append({
+                    "text": text,
+                    "href": attrs['href']
+                })
+        elif name == 'img':
+            if 'src' in attrs and 'alt' in attrs and attrs['alt'].strip():
+                images.append({
+                    "alt": attrs['alt'].strip(),
+                    "src": attrs['src']
+                })
+        else:
+            seen[name] += 1
+            if per_tag_limit is not None and seen[name] > per_tag_limit:
+                continue
+            text = backend.text(node).strip()
+            if text:
+                content.append({
+                    "type": name,
+                    "content": text
+                })
+
+    return {
+        "title": title,
+        "content": content,
+        "links": links,
+        "images": images
+    }
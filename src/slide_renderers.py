@@ -0,0 +1,238 @@
+"""Renderizadores de presentaciones a partir de un SlideDeck.
+
+Las diapositivas se construyen una sola vez por documento y cada
+renderizador las convierte a su formato: HTML de RevealJS, JSON de Keynote o
+markdown. Para generar varios formatos en una ejecución basta con pasar sus
+nombres a render_deck o write_deck, sin volver a ejecutar el equipo ni a
+parsear el documento.
+
+Antes de renderizar, las diapositivas que superan SLIDE_MAX_ITEMS elementos
+o SLIDE_MAX_CHARS caracteres de texto se dividen en páginas (paginate_slides):
+RevealJS las muestra como subdiapositivas verticales y Keynote como
+diapositivas consecutivas con el mismo título.
+"""
+import json
+import os
+
+from document_model import RenderedPresentation
+from revealjs_renderer import render_revealjs
+
+# Presupuesto de contenido por diapositiva; 0 desactiva el límite
+SLIDE_MAX_ITEMS = int(os.getenv('SLIDE_MAX_ITEMS', '8'))
+SLIDE_MAX_CHARS = int(os.getenv('SLIDE_MAX_CHARS', '1200'))
+
+
+class SlideRenderer:
+    """Convierte el título y las diapositivas de un SlideDeck en el contenido de un fichero."""
+
+    name = None
+    format = None
+    filename = None
+
+    def render(self, title, slides):
+        raise NotImplementedError
+
+
+class RevealJsRenderer(SlideRenderer):
+    name = 'revealjs'
+    format = 'RevealJS'
+    filename = 'presentacion_revealjs.html'
+
+    def render(self, title, slides):
+        return render_revealjs(title, slides)
+
+
+class KeynoteRenderer(SlideRenderer):
+    name = 'keynote'
+    format = 'Keynote'
+    filename = 'presentacion_keynote.json'
+
+    def render(self, title, slides):
+        return json.dumps(keynote_format(title, slides), indent=2)
+
+
+class MarkdownRenderer(SlideRenderer):
+    """Markdown con un encabezado por diapositiva; se puede volver a parsear con slides_from_markdown."""
+
+    name = 'markdown'
+    format = 'Markdown'
+    filename = 'presentacion.md'
+
+    def render(self, title, slides):
+        return ''.join(iter_slides_markdown(slides))
+
+
+RENDERERS = {renderer.name: renderer for renderer in (RevealJsRenderer(), KeynoteRenderer(), MarkdownRenderer())}
+
+
+def parse_formats(formats):
+    """Devuelve la lista de formatos de una cadena separada por comas o de una lista.
+
+    Lanza ValueError si algún formato no tiene renderizador.
+    """
+    if isinstance(formats, str):
+        formats = formats.split(',')
+    names = list(dict.fromkeys(name.strip().lower() for name in formats if name.strip()))
+    unknown = [name for name in names if name not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Formatos no válidos: {', '.join(unknown)} (disponibles: {', '.join(RENDERERS)})")
+    return names
+
+
+def paginate_slides(slides, max_items=SLIDE_MAX_ITEMS, max_chars=SLIDE_MAX_CHARS):
+    """Divide las diapositivas que superan el presupuesto de contenido en varias páginas.
+
+    Las páginas siguientes a la primera conservan el título y llevan
+    "continued": True; las de la portada pasan a ser de contenido. Un
+    elemento que por sí solo supera max_chars ocupa una página entera.
+    Devuelve una lista nueva y deja las diapositivas originales intactas.
+    """
+    if not max_items and not max_chars:
+        return slides
+
+    paginated = []
+    for slide in slides:
+        pages = []
+        page = []
+        chars = 0
+        for item in slide["content"]:
+            size = len(item.get("text") or item.get("alt") or "")
+            if page and ((max_items and len(page) >= max_items) or (max_chars and chars + size > max_chars)):
+                pages.append(page)
+                page = []
+                chars = 0
+            page.append(item)
+            chars += size
+        if len(pages) == 0:
+            paginated.append(slide)
+            continue
+
+        pages.append(page)
+        paginated.append(dict(slide, content=pages[0]))
+        continued_type = "content" if slide["type"] == "title" else slide["type"]
+        for page in pages[1:]:
+            paginated.append({"title": slide["title"], "content": page, "type": continued_type, "continued": True})
+    return paginated
+
+
+def render_deck(deck, formats):
+    """Genera una RenderedPresentation por formato a partir de las mismas diapositivas."""
+    presentations = []
+    slides = paginate_slides(deck.slides)
+    for name in parse_formats(formats):
+        renderer = RENDERERS[name]
+        content = renderer.render(deck.title, slides)
+        presentations.append(RenderedPresentation(renderer.format, content, deck.document, deck))
+    return presentations
+
+
+def write_deck(deck, formats, output_dir, skip=()):
+    """Escribe en output_dir un fichero por formato (salvo los de skip) y devuelve sus rutas."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    slides = paginate_slides(deck.slides)
+    for name in parse_formats(formats):
+        if name in skip:
+            continue
+        renderer = RENDERERS[name]
+        path = os.path.join(output_dir, renderer.filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(renderer.render(deck.title, slides))
+        print(f"Presentación {renderer.format} guardada en: {path}")
+        paths.append(path)
+    return paths
+
+
+def renderer_for(presentation):
+    """Devuelve el renderizador del formato de una RenderedPresentation."""
+    for renderer in RENDERERS.values():
+        if renderer.format == presentation.format:
+            return renderer
+    raise ValueError(f"Formato sin renderizador: {presentation.format}")
+
+
+_MARKDOWN_HEADINGS = {
+    "title": "#",
+    "section": "##",
+}
+
+
+def iter_slides_markdown(slides):
+    """Genera el markdown de las diapositivas por fragmentos.
+
+    La diapositiva final se omite porque slides_from_markdown la vuelve a añadir,
+    y las páginas de continuación no repiten el encabezado, de modo que al
+    volver a parsear se obtienen las diapositivas sin paginar.
+    """
+    for slide in slides:
+        if slide["type"] == "end":
+            continue
+        if not slide.get("continued"):
+            yield f"{_MARKDOWN_HEADINGS.get(slide['type'], '###')} {slide['title']}\n\n"
+
+        for item in slide["content"]:
+            if item["type"] == "image":
+                yield f"![{item['alt']}]({item['src']})\n\n"
+            elif item["type"] == "link":
+                yield f"- [{item['text']}]({item['href']})\n\n"
+            else:
+                yield f"{item['text']}\n\n"
+
+
+def keynote_format(title, slides):
+    """Convierte las diapositivas a formato Keynote (representado como JSON estructurado)."""
+    keynote_format = {
+        "presentation": {
+            "title": title,
+            "theme": "Modern",
+            "slides": []
+        }
+    }
+
+    for slide in slides:
+        keynote_slide = {
+            "title": slide["title"],
+            "layout": _get_layout_for_slide_type(slide["type"]),
+            "elements": []
+        }
+
+        for item in slide["content"]:
+            if item["type"] == "image":
+                keynote_slide["elements"].append({
+                    "type": "image",
+                    "alt": item["alt"],
+                    "src": item["src"],
+                    "position": {"x": 0.5, "y": 0.5},
+                    "size": {"width": 0.8, "height": 0.6}
+                })
+            elif item["type"] == "link":
+                keynote_slide["elements"].append({
+                    "type": "text",
+                    "content": item["text"],
+                    "href": item["href"],
+                    "position": {"x": 0.1, "y": 0.5},
+                    "size": {"width": 0.8, "height": 0.1},
+                    "style": {"color": "#0066cc", "underlined": True}
+                })
+            elif item["type"] == "text":
+                keynote_slide["elements"].append({
+                    "type": "text",
+                    "content": item["text"],
+                    "position": {"x": 0.1, "y": 0.4},
+                    "size": {"width": 0.8, "height": 0.2},
+                    "style": {"fontSize": 18, "fontFamily": "Helvetica"}
+                })
+
+        keynote_format["presentation"]["slides"].append(keynote_slide)
+
+    return keynote_format
+
+
+def _get_layout_for_slide_type(slide_type):
+    layouts = {
+        "title": "Title",
+        "section": "Section Header",
+        "content": "Title and Content",
+        "end": "Blank"
+    }
+    return layouts.get(slide_type, "Title and Content")
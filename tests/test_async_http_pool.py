@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import scraper  # noqa: E402
+from async_http_pool import AsyncHttpPool  # noqa: E402
+from disk_cache import DiskCache  # noqa: E402
+from fetch_policy import BudgetExpiredError, CircuitBreaker, TimeBudget  # noqa: E402
+from html_parsers import get_backend  # noqa: E402
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+@pytest.fixture
+def pools():
+    created = []
+
+    def make(**kwargs):
+        created.append(AsyncHttpPool(**kwargs))
+        return created[-1]
+
+    yield make
+    for pool in created:
+        pool.close()
+
+
+def slow(seconds, body=b'<p>lento</p>'):
+    def route(request):
+        time.sleep(seconds)
+        return 200, HTML, body
+    return route
+
+
+def gather_gets(pool, urls, deadline=10):
+    return pool.run(pool.gather([pool.get(url) for url in urls], deadline=deadline))
+
+
+def test_requests_to_one_host_run_concurrently(stand_in_server, pools):
+    for i in range(4):
+        stand_in_server.routes[f'/{i}'] = slow(0.3)
+    pool = pools(per_host_limit=4)
+
+    start = time.perf_counter()
+    responses = gather_gets(pool, [stand_in_server.url(f'/{i}') for i in range(4)])
+
+    assert [response.content for response in responses] == [b'<p>lento</p>'] * 4
+    assert time.perf_counter() - start < 1.0
+
+
+def test_slow_cache_does_not_block_the_event_loop(stand_in_server, tmp_path, pools):
+    class SlowCache(DiskCache):
+        def get(self, key, max_age=None):
+            time.sleep(0.3)
+            return super().get(key, max_age)
+
+    for i in range(4):
+        stand_in_server.routes[f'/{i}'] = (200, HTML, b'<p>hola</p>')
+    pool = pools(per_host_limit=4, cache=SlowCache(str(tmp_path), 1024 * 1024))
+
+    start = time.perf_counter()
+    gather_gets(pool, [stand_in_server.url(f'/{i}') for i in range(4)])
+
+    assert time.perf_counter() - start < 1.0
+
+
+def test_gather_cancels_requests_past_the_deadline(stand_in_server, pools):
+    stand_in_server.routes['/rapida'] = (200, HTML, b'<p>ya</p>')
+    stand_in_server.routes['/lenta'] = slow(2)
+    pool = pools()
+
+    fast, late = gather_gets(pool, [stand_in_server.url('/rapida'), stand_in_server.url('/lenta')], deadline=0.5)
+
+    assert fast.content == b'<p>ya</p>'
+    assert isinstance(late, TimeoutError)
+
+
+def test_revalidates_with_etag_and_serves_304_from_cache(stand_in_server, tmp_path, pools):
+    def route(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return 304, {'ETag': '"v1"'}, b''
+        return 200, dict(HTML, ETag='"v1"'), b'<p>hola</p>'
+
+    stand_in_server.routes['/'] = route
+    pool = pools(cache=DiskCache(str(tmp_path), 1024 * 1024))
+
+    first = pool.run(pool.get(stand_in_server.url()))
+    second = pool.run(pool.get(stand_in_server.url()))
+
+    assert first.content == second.content == b'<p>hola</p>'
+    assert second.status_code == 200
+    assert stand_in_server.requests[1][1]['If-None-Match'] == '"v1"'
+
+
+def test_size_cap_truncates_and_is_not_cached(stand_in_server, tmp_path, pools):
+    stand_in_server.routes['/grande'] = (200, HTML, b'x' * 300_000)
+    cache = DiskCache(str(tmp_path), 1024 * 1024)
+    pool = pools(cache=cache)
+
+    response = pool.run(pool.get(stand_in_server.url('/grande'), max_bytes=100_000))
+
+    assert response.truncated
+    assert len(response.content) == 100_000
+    assert cache.get(stand_in_server.url('/grande')) is None
+
+
+def test_scrape_parses_pages_off_the_event_loop(stand_in_server, pools, monkeypatch):
+    monkeypatch.setattr(scraper, 'SCRAPER_ROBOTS', False)
+    stand_in_server.routes['/'] = (200, HTML, b'<title>Inicio</title><p>portada</p><a href="/spa">Spa</a>')
+    stand_in_server.routes['/spa'] = (200, HTML, b'<title>Spa</title><p>masajes</p>')
+    backend = get_backend('html.parser')
+    threads = []
+
+    class RecordingBackend:
+        def elements(self, html, names):
+            threads.append(threading.current_thread().name)
+            return backend.elements(html, names)
+
+        def text(self, node):
+            return backend.text(node)
+
+    pool = pools()
+    result = pool.run(scraper.scrape_site_async(stand_in_server.url(), pool, RecordingBackend()))
+
+    assert [section['content'] for section in result['sections']] == [[{'type': 'p', 'content': 'masajes'}]]
+    assert len(threads) == 2 and 'async-http-pool' not in threads
+
+
+def test_budget_expiry_does_not_trip_the_breaker(stand_in_server, pools):
+    stand_in_server.routes['/lenta'] = slow(1)
+    stand_in_server.routes['/'] = (200, HTML, b'<p>bien</p>')
+    breaker = CircuitBreaker(failures=1, cooldown=60)
+    pool = pools(breaker=breaker)
+
+    with pytest.raises(BudgetExpiredError):
+        pool.run(pool.get(stand_in_server.url('/lenta'), budget=TimeBudget(0.3)))
+
+    assert pool.run(pool.get(stand_in_server.url())).content == b'<p>bien</p>'
@@ -0,0 +1,43 @@
+from content_dedup import dedupe_scrape
+
+LONG = 'La suite tiene terraza privada con vista al mar, jacuzzi exterior y acceso directo a la playa'
+
+
+def result(*sections):
+    return {
+        'url': 'https://ejemplo.test/',
+        'title': 'Hotel',
+        'main_content': [{'type': 'p', 'content': LONG}, {'type': 'p', 'content': 'Más información'}],
+        'links': [],
+        'images': [],
+        'sections': [{'title': f'Sección {i}', 'url': f'https://ejemplo.test/{i}',
+                      'content': [{'type': 'p', 'content': text} for text in texts]}
+                     for i, texts in enumerate(sections)],
+    }
+
+
+def texts(section):
+    return [item['content'] for item in section['content']]
+
+
+def test_short_blocks_repeated_in_a_few_sections_are_kept():
+    deduped = dedupe_scrape(result(['Suite Junior', 'Desde 120 € por noche', 'Más información'],
+                                   ['Suite Master', 'Desde 120 € por noche']))
+
+    assert texts(deduped['sections'][0]) == ['Suite Junior', 'Desde 120 € por noche', 'Más información']
+    assert texts(deduped['sections'][1]) == ['Suite Master', 'Desde 120 € por noche']
+
+
+def test_long_repeated_paragraphs_are_removed():
+    deduped = dedupe_scrape(result([LONG, 'Suite Junior'], [LONG.replace('privada', 'amplia'), 'Suite Master']))
+
+    assert [item['content'] for item in deduped['main_content']] == [LONG, 'Más información']
+    assert texts(deduped['sections'][0]) == ['Suite Junior']
+    assert texts(deduped['sections'][1]) == ['Suite Master']
+
+
+def test_short_blocks_on_enough_pages_are_still_boilerplate():
+    deduped = dedupe_scrape(result(['Suite Junior', 'Más información'], ['Suite Master', 'Más información']))
+
+    assert [item['content'] for item in deduped['main_content']] == [LONG]
+    assert texts(deduped['sections'][0]) == ['Suite Junior']
@@ -0,0 +1,81 @@
+import re
+
+import pytest
+
+from context_budget import compact_context, count_tokens
+
+TEXT = '\n\n'.join(f'Párrafo {i}: ' + 'texto de relleno ' * (i % 7 + 3) for i in range(200))
+
+
+@pytest.mark.parametrize('budget', [1, 5, 40, 120, 500])
+def test_truncate_keeps_the_marker_within_budget(budget):
+    (result,), before, after = compact_context([TEXT], budget=budget, strategy='truncate')
+
+    assert after == count_tokens(result) <= budget
+    if budget >= 40:
+        kept, marker = result.rsplit('\n\n', 1)
+        assert kept.startswith('Párrafo 0:')
+        assert re.fullmatch(r'\[… (\d+) tokens omitidos\]', marker).group(1) == str(before - count_tokens(kept))
+
+
+def test_truncate_splits_the_budget_between_outputs():
+    items, _, after = compact_context([TEXT, TEXT[:400], TEXT], budget=500, strategy='truncate')
+
+    assert after <= 500
+    assert items[1] == TEXT[:400]
+
+
+TABLE = '| plato | precio |\n|---|---|\n' + '\n'.join(f'| plato {i} | {i} € |' for i in range(500))
+
+
+@pytest.mark.parametrize('budget', [20, 200, 1000])
+def test_chunk_keeps_the_first_chunk_within_a_small_share(budget):
+    (result,), _, after = compact_context([TABLE], budget=budget, strategy='chunk')
+
+    assert after == count_tokens(result) <= budget
+    assert result.startswith('| plato | precio |\n|---|---|\n| plato 0 | 0 € |')
+    assert result.endswith('\n\n[…]')
+    # Las filas de la tabla siguen separadas por un solo salto de línea
+    assert '\n\n' not in result[:-len('\n\n[…]')]
+    assert after > budget // 2
+
+
+def test_chunk_keeps_chunks_related_to_the_task_in_order():
+    text = '\n\n'.join(['Introducción general del informe. ' * 8]
+                       + [f'Relleno sin interés número {i}. ' * 8 for i in range(40)]
+                       + ['Los precios de la competencia bajaron un 12 % en Cancún. ' * 4]
+                       + [f'Más relleno {i}. ' * 8 for i in range(40)])
+
+    (result,), _, after = compact_context([text], query='precios de la competencia en Cancún', budget=700,
+                                          strategy='chunk')
+
+    assert after <= 700
+    assert result.startswith('Introducción general')
+    assert 'precios de la competencia' in result
+    assert result.index('[…]') < result.index('precios de la competencia')
+
+
+def test_summarize_uses_the_summary_and_truncates_it_to_the_share():
+    calls = []
+
+    def summarize(text, max_tokens):
+        calls.append(max_tokens)
+        return 'Resumen breve.' if len(calls) == 1 else 'Resumen demasiado largo. ' * 200
+
+    items, _, after = compact_context([TEXT, TEXT], budget=300, strategy='summarize', summarize=summarize)
+
+    assert calls == [150, 150]
+    assert items[0] == 'Resumen breve.'
+    assert items[1].startswith('Resumen demasiado largo.') and count_tokens(items[1]) <= 150
+    assert after <= 300
+
+
+def test_summarize_falls_back_to_chunk(capsys):
+    def summarize(text, max_tokens):
+        raise RuntimeError('sin conexión')
+
+    failed, _, _ = compact_context([TEXT], budget=200, strategy='summarize', summarize=summarize)
+    without_llm, _, _ = compact_context([TEXT], budget=200, strategy='summarize')
+
+    assert failed == without_llm == compact_context([TEXT], budget=200, strategy='chunk')[0]
+    assert 'sin conexión' in capsys.readouterr().out
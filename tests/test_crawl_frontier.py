@@ -0,0 +1,146 @@
+import threading
+import time
+
+import pytest
+
+import scraper
+from crawl_frontier import CrawlFrontier, HostRateLimiter, normalize_url
+from http_pool import HttpPool
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+@pytest.mark.parametrize('url, expected', [
+    ('https://Ejemplo.TEST/Spa#reservas', 'https://ejemplo.test/Spa'),
+    ('https://ejemplo.test:443/a', 'https://ejemplo.test/a'),
+    ('http://ejemplo.test:80/a', 'http://ejemplo.test/a'),
+    ('http://ejemplo.test:8080/a', 'http://ejemplo.test:8080/a'),
+    ('https://ejemplo.test/a?b=2&a=1', 'https://ejemplo.test/a?a=1&b=2'),
+    ('https://ejemplo.test/a?utm_source=x&id=3&gclid=y', 'https://ejemplo.test/a?id=3'),
+    ('https://ejemplo.test//a///b', 'https://ejemplo.test/a/b'),
+    ('https://ejemplo.test', 'https://ejemplo.test/'),
+])
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def links(*hrefs):
+    return [{'text': href.strip('/').split('/')[-1] or 'inicio', 'href': href} for href in hrefs]
+
+
+def urls(batch):
+    return [url for url, _, _ in batch]
+
+
+def test_robots_rules_are_respected():
+    frontier = CrawlFrontier('https://ejemplo.test/', breadth=10, max_pages=10)
+    frontier.set_robots(200, 'User-agent: *\nDisallow: /privado\n')
+    frontier.add_links(links('/spa', '/privado/ofertas'), 'https://ejemplo.test/', depth=1)
+
+    assert urls(frontier.next_batch()) == ['https://ejemplo.test/spa']
+
+
+@pytest.mark.parametrize('status, expected', [(404, ['https://ejemplo.test/privado']), (503, [])])
+def test_robots_errors_allow_all_on_4xx_and_nothing_on_5xx(status, expected):
+    frontier = CrawlFrontier('https://ejemplo.test/', breadth=10, max_pages=10)
+    frontier.set_robots(status, 'User-agent: *\nDisallow: /\n')
+    frontier.add_links(links('/privado'), 'https://ejemplo.test/', depth=1)
+
+    assert urls(frontier.next_batch()) == expected
+
+
+def test_crawl_delay_sets_the_host_delay():
+    frontier = CrawlFrontier('https://ejemplo.test/', rate_limiter=HostRateLimiter(0))
+    frontier.set_robots(200, 'User-agent: *\nCrawl-delay: 2\n')
+
+    frontier.rate_limiter.reserve('https://ejemplo.test/a')
+    assert frontier.rate_limiter.reserve('https://ejemplo.test/b') == pytest.approx(2, abs=0.05)
+
+
+def test_links_are_filtered_deduplicated_and_ordered_by_priority():
+    frontier = CrawlFrontier('https://ejemplo.test/', breadth=4, max_pages=10)
+    frontier.add_links([
+        {'text': 'Aviso legal', 'href': '/legal'},
+        {'text': 'Habitaciones', 'href': '/habitaciones'},
+        {'text': 'Habitaciones', 'href': '/habitaciones/#top'},
+        {'text': 'Folleto', 'href': '/folleto.pdf'},
+        {'text': 'Externo', 'href': 'https://otro.test/'},
+        {'text': 'Correo', 'href': 'mailto:info@ejemplo.test'},
+        {'text': 'Inicio', 'href': '/'},
+        {'text': 'Spa', 'href': '/spa'},
+        {'text': 'Suite', 'href': '/habitaciones/suites/junior?vista=mar'},
+    ], 'https://ejemplo.test/', depth=1)
+
+    assert urls(frontier.next_batch()) == [
+        'https://ejemplo.test/habitaciones',
+        'https://ejemplo.test/spa',
+        'https://ejemplo.test/habitaciones/suites/junior?vista=mar',
+        'https://ejemplo.test/legal',
+    ]
+
+
+def test_depth_and_page_limits():
+    frontier = CrawlFrontier('https://ejemplo.test/', max_depth=2, max_pages=3, breadth=2)
+    frontier.add_links(links('/a', '/b', '/c'), 'https://ejemplo.test/', depth=1)
+    first = frontier.next_batch()
+    frontier.add_links(links('/a/1', '/a/2'), 'https://ejemplo.test/a', depth=2)
+    frontier.add_links(links('/a/1/x'), 'https://ejemplo.test/a/1', depth=3)
+
+    assert urls(first) == ['https://ejemplo.test/a', 'https://ejemplo.test/b']
+    assert urls(frontier.next_batch()) == ['https://ejemplo.test/a/1']
+    assert frontier.next_batch() == []
+
+
+def test_rate_limiter_spaces_turns_per_host():
+    limiter = HostRateLimiter(0.5)
+
+    delays = [limiter.reserve('https://a.test/1'), limiter.reserve('https://a.test/2'),
+              limiter.reserve('https://b.test/1')]
+
+    assert delays[0] == 0 and delays[2] == 0
+    assert delays[1] == pytest.approx(0.5, abs=0.05)
+    assert HostRateLimiter(0).reserve('https://a.test/') == 0
+
+
+def test_delayed_items_do_not_hold_pool_threads():
+    pool = HttpPool(max_workers=1, cache=None)
+    done = threading.Event()
+    delayed = threading.Thread(target=lambda: pool.map(lambda item: done.set(), ['tarde'], delays=[0.5]))
+    delayed.start()
+    time.sleep(0.05)
+
+    start = time.perf_counter()
+    assert pool.map(lambda item: item * 2, [21]) == [42]
+    assert time.perf_counter() - start < 0.3
+    delayed.join()
+    assert done.is_set()
+
+
+def test_items_whose_turn_is_past_the_deadline_time_out():
+    pool = HttpPool(cache=None)
+
+    result = pool.map(lambda item: item, ['ya', 'tarde'], deadline=0.2, delays=[0, 5])
+
+    assert result[0] == 'ya' and isinstance(result[1], TimeoutError)
+
+
+def test_threads_engine_spaces_sections_by_crawl_delay(stand_in_server, monkeypatch):
+    monkeypatch.setattr(scraper, 'SCRAPER_ROBOTS', True)
+    times = {}
+
+    def page(path, body):
+        def route(request):
+            times[path] = time.monotonic()
+            return 200, HTML, body
+        return route
+
+    stand_in_server.routes['/'] = (200, HTML, b'<title>Hotel</title><p>hola</p><a href="/a">A</a><a href="/b">B</a>')
+    stand_in_server.routes['/robots.txt'] = (200, {'Content-Type': 'text/plain'}, b'User-agent: *\nCrawl-delay: 1\n')
+    stand_in_server.routes['/a'] = page('/a', b'<p>uno</p>')
+    stand_in_server.routes['/b'] = page('/b', b'<p>dos</p>')
+
+    result = scraper.scrape_site(stand_in_server.url(), pool=HttpPool(cache=None))
+
+    assert [section['content'] for section in result['sections']] == [[{'type': 'p', 'content': 'uno'}],
+                                                                      [{'type': 'p', 'content': 'dos'}]]
+    assert abs(times['/b'] - times['/a']) >= 0.9
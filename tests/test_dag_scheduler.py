@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from dag_scheduler import CONTEXT_SEPARATOR, run_tasks, task_dependencies
+
+
+class Agent:
+    def __init__(self, role):
+        self.role = role
+        self.copies = 0
+
+    def copy(self):
+        self.copies += 1
+        return Agent(f'{self.role} (copia)')
+
+
+class Task:
+    """Tarea con la interfaz de crewai.Task que usa el planificador."""
+
+    def __init__(self, name, agent, context=None, work=None, log=None):
+        self.name = name
+        self.description = f'Tarea {name}'
+        self.expected_output = 'texto'
+        self.agent = agent
+        self.context = context
+        self.work = work
+        self.log = log if log is not None else []
+        self.received = None
+
+    def execute_sync(self, agent, context):
+        self.received = (agent, context)
+        self.log.append(('inicio', self.name))
+        if self.work:
+            self.work()
+        self.log.append(('fin', self.name))
+        return f'salida de {self.name}'
+
+
+def test_independent_tasks_run_together_and_dependents_wait():
+    log = []
+    barrier = threading.Barrier(2, timeout=5)
+    agent = Agent('investigador')
+    first = Task('a', agent, work=barrier.wait, log=log)
+    second = Task('b', Agent('analista'), work=barrier.wait, log=log)
+    report = Task('informe', Agent('redactor'), context=[second, first], log=log)
+
+    outputs = run_tasks([first, second, report], max_workers=4, context_budget=0)
+
+    assert outputs == ['salida de a', 'salida de b', 'salida de informe']
+    assert log.index(('inicio', 'informe')) > max(log.index(('fin', 'a')), log.index(('fin', 'b')))
+    # Cada tarea recibe solo su context, en el orden de las tareas del equipo
+    assert first.received[1] is None
+    assert report.received[1] == CONTEXT_SEPARATOR.join(['salida de a', 'salida de b'])
+
+
+def test_agent_with_several_tasks_gets_a_copy_per_task():
+    shared = Agent('analista')
+    single = Agent('redactor')
+    first = Task('a', shared)
+    second = Task('b', shared)
+    report = Task('informe', single, context=[first, second])
+
+    run_tasks([first, second, report], context_budget=0)
+
+    assert shared.copies == 2
+    assert first.received[0] is not shared and second.received[0] is not shared
+    assert single.copies == 0 and report.received[0] is single
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    agent = Agent('analista')
+    first = Task('a', agent)
+    second = Task('b', agent, context=[first])
+    first.context = [second]
+    outsider = Task('fuera', agent)
+
+    with pytest.raises(ValueError, match='circulares'):
+        task_dependencies([first, second])
+    with pytest.raises(ValueError, match='no está en el equipo'):
+        run_tasks([Task('c', agent, context=[outsider])])
+
+
+def test_failure_stops_dependents_and_lets_running_tasks_finish():
+    log = []
+
+    def fail():
+        time.sleep(0.05)
+        raise RuntimeError('sin respuesta del LLM')
+
+    failing = Task('a', Agent('investigador'), work=fail, log=log)
+    slow = Task('b', Agent('analista'), work=lambda: time.sleep(0.2), log=log)
+    dependent = Task('informe', Agent('redactor'), context=[failing], log=log)
+
+    with pytest.raises(RuntimeError, match='sin respuesta'):
+        run_tasks([failing, slow, dependent], max_workers=2)
+
+    assert ('fin', 'b') in log
+    assert ('inicio', 'informe') not in log
+
+
+def test_large_context_is_compacted_to_the_budget():
+    agent = Agent('analista')
+    long_output = Task('a', agent)
+    long_output.execute_sync = lambda agent, context: '\n\n'.join(f'Párrafo {i}. ' * 20 for i in range(100))
+    report = Task('informe', Agent('redactor'), context=[long_output])
+
+    run_tasks([long_output, report], context_budget=200, context_strategy='truncate')
+
+    assert report.received[1].startswith('Párrafo 0.')
+    assert len(report.received[1]) <= 200 * 4
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import deck_bundle
+import image_pipeline
+from document_model import SlideDeck
+from http_pool import HttpPool
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+REVEAL_JS = b'var Reveal = {}; document.write("</script>");'
+
+
+@pytest.fixture
+def site(stand_in_server, monkeypatch):
+    monkeypatch.setattr(image_pipeline, 'IMAGE_PIPELINE', False)
+    for name in deck_bundle.REVEALJS_FILES:
+        body = REVEAL_JS if name == 'reveal.js' else f'/* {name} */'.encode()
+        stand_in_server.routes[f'/reveal/{name}'] = (200, {'Content-Type': 'text/plain'}, body)
+    stand_in_server.routes['/img/foto.png'] = (200, {'Content-Type': 'image/png'}, PNG)
+    return stand_in_server
+
+
+def deck(site):
+    slides = [{'title': 'Fotos', 'type': 'content', 'content': [
+        {'type': 'image', 'src': '/img/foto.png', 'alt': 'foto'},
+        {'type': 'image', 'src': '/img/no-existe.png', 'alt': 'rota'},
+    ]}]
+    return SlideDeck('Galería', slides, url=site.url('/'))
+
+
+def bundle(site, tmp_path, mode, output='salida'):
+    pool = HttpPool(cache=None)
+    vendor_dir = deck_bundle.ensure_vendor(str(tmp_path / 'vendor'), site.url('/reveal'), pool)
+    return deck_bundle.bundle_deck(deck(site), str(tmp_path / output), mode=mode, vendor_dir=vendor_dir,
+                                   asset_dir=str(tmp_path / 'assets'), pool=pool)
+
+
+def test_files_mode_links_vendor_and_images(site, tmp_path):
+    path = bundle(site, tmp_path, 'files')
+
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    bundle_dir = os.path.dirname(path)
+    assets = os.listdir(os.path.join(bundle_dir, 'assets'))
+    assert len(assets) == 1 and f'assets/{assets[0]}' in html
+    assert os.path.exists(os.path.join(bundle_dir, 'vendor/reveal.js/reveal.js'))
+    # La imagen que da 404 se queda con su URL absoluta
+    assert site.url('/img/no-existe.png') in html
+
+
+def test_same_image_is_hard_linked_across_bundles(site, tmp_path):
+    first = bundle(site, tmp_path, 'files', 'uno')
+    second = bundle(site, tmp_path, 'files', 'dos')
+
+    first_asset, = [os.path.join(os.path.dirname(first), 'assets', name)
+                    for name in os.listdir(os.path.join(os.path.dirname(first), 'assets'))]
+    second_asset = os.path.join(os.path.dirname(second), 'assets', os.path.basename(first_asset))
+    assert os.path.samefile(first_asset, second_asset)
+    assert os.stat(first_asset).st_nlink == 3
+
+
+def test_inline_mode_embeds_everything_in_one_file(site, tmp_path):
+    path = bundle(site, tmp_path, 'inline')
+
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    assert path.endswith(deck_bundle.BUNDLE_DIRNAME + '.html')
+    assert 'data:image/png;base64,' in html
+    assert 'vendor/reveal.js/' not in html
+    # El </script> del código de reveal.js no puede cerrar la etiqueta que lo incrusta
+    assert 'document.write("<\\/script>")' in html
+    assert site.url('/img/no-existe.png') in html
+
+
+def test_truncated_vendor_download_fails_and_is_not_saved(site, tmp_path):
+    class SmallPool(HttpPool):
+        def get(self, url, **kwargs):
+            return super().get(url, max_bytes=10, **kwargs)
+
+    vendor_dir = str(tmp_path / 'vendor')
+    with pytest.raises(ValueError, match='incompleta'):
+        deck_bundle.ensure_vendor(vendor_dir, site.url('/reveal'), pool=SmallPool(cache=None))
+    assert not os.path.exists(os.path.join(vendor_dir, 'reveal.js'))
@@ -0,0 +1,60 @@
+import pytest
+
+import deck_pipeline
+import scraper
+
+URL = 'https://ejemplo.test/'
+SCRAPE = {'url': URL, 'title': 'Ejemplo', 'main_content': [{'type': 'p', 'content': 'hola'}], 'links': [], 'images': []}
+
+
+@pytest.fixture
+def scrapes(monkeypatch):
+    calls = []
+
+    def scrape_site(url):
+        calls.append(url)
+        return SCRAPE
+
+    monkeypatch.setattr(scraper, 'scrape_site', scrape_site)
+    monkeypatch.setattr(deck_pipeline, 'INCREMENTAL', True)
+    monkeypatch.setattr(deck_pipeline, '_prefetched', {})
+    return calls
+
+
+def test_scrape_error_counts_as_changed(monkeypatch, tmp_path):
+    def scrape_site(url):
+        raise ConnectionError('sin red')
+
+    monkeypatch.setattr(scraper, 'scrape_site', scrape_site)
+    monkeypatch.setattr(deck_pipeline, 'INCREMENTAL', True)
+
+    assert deck_pipeline.is_unchanged(URL, str(tmp_path), ['revealjs']) is False
+
+
+def test_changed_page_is_not_scraped_again_by_the_tool(scrapes, tmp_path):
+    assert deck_pipeline.is_unchanged(URL, str(tmp_path), ['revealjs']) is False
+
+    result = deck_pipeline.scrape(URL)
+
+    assert not result.startswith('Error')
+    assert scrapes == [URL]
+    # La descarga se reutiliza una sola vez; la siguiente vuelve a la red
+    deck_pipeline.scrape(URL)
+    assert scrapes == [URL, URL]
+
+
+def test_prefetched_page_expires(scrapes, monkeypatch, tmp_path):
+    monkeypatch.setattr(deck_pipeline, 'PREFETCH_TTL', 0)
+    assert deck_pipeline.is_unchanged(URL, str(tmp_path), ['revealjs']) is False
+
+    deck_pipeline.scrape(URL)
+
+    assert scrapes == [URL, URL]
+
+
+def test_expired_prefetches_are_dropped(scrapes, monkeypatch, tmp_path):
+    monkeypatch.setattr(deck_pipeline, 'PREFETCH_TTL', 0)
+    deck_pipeline.is_unchanged(URL, str(tmp_path), ['revealjs'])
+    deck_pipeline.is_unchanged(URL + 'otra', str(tmp_path / 'otra'), ['revealjs'])
+
+    assert list(deck_pipeline._prefetched) == [URL + 'otra']
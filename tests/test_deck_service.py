@@ -0,0 +1,72 @@
+import base64
+import os
+import threading
+import types
+
+import deck_service
+from deck_service import DeckService
+
+URL = 'https://ejemplo.test/'
+
+
+def service_with(run_direct, tmp_path):
+    service = DeckService([], mode='direct', base_dir=str(tmp_path))
+    service.modules['prueba'] = types.SimpleNamespace(run_direct=run_direct)
+    return service
+
+
+def test_sends_only_the_job_outputs_and_binary_as_base64(tmp_path):
+    def run_direct(url, output_dir, formats=None):
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, 'otro_trabajo.txt'), 'w') as f:
+            f.write('no es de este trabajo')
+        text_path = os.path.join(output_dir, 'presentacion.html')
+        binary_path = os.path.join(output_dir, 'presentacion.pptx')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write('<h1>Título</h1>')
+        with open(binary_path, 'wb') as f:
+            f.write(b'PK\x03\x04\xff\xfe')
+        return [text_path, binary_path]
+
+    events = list(service_with(run_direct, tmp_path).run(URL, 'prueba'))
+
+    files = {event['name']: event for event in events if event['event'] == 'file'}
+    assert sorted(files) == ['presentacion.html', 'presentacion.pptx']
+    assert files['presentacion.html']['content'] == '<h1>Título</h1>'
+    assert base64.b64decode(files['presentacion.pptx']['content_base64']) == b'PK\x03\x04\xff\xfe'
+    assert events[-1]['event'] == 'done'
+
+
+def test_jobs_for_the_same_url_do_not_overlap(tmp_path):
+    running = []
+    overlapped = []
+
+    def run_direct(url, output_dir, formats=None):
+        running.append(url)
+        overlapped.append(len(running) > 1)
+        threading.Event().wait(0.05)
+        running.remove(url)
+        return []
+
+    service = service_with(run_direct, tmp_path)
+    threads = [threading.Thread(target=lambda: list(service.run(URL, 'prueba'))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlapped == [False, False, False]
+
+
+def test_submit_passes_the_mode(monkeypatch):
+    sent = []
+
+    def submit(url, pipeline, mode, host, port, formats):
+        sent.append(mode)
+        return iter(())
+
+    monkeypatch.setattr(deck_service, 'submit', submit)
+    monkeypatch.setattr('sys.argv', ['deck_service.py', '--submit', URL, '--mode', 'direct'])
+    deck_service.main()
+
+    assert sent == ['direct']
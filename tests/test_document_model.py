@@ -0,0 +1,59 @@
+from document_model import MarkdownDocument, Page, SlideDeck, slides_from_markdown, slides_from_page
+from markdown_builder import build_markdown
+
+
+def page(*paragraphs):
+    return Page.from_scrape({
+        'url': 'https://ejemplo.test/',
+        'title': 'Hotel',
+        'main_content': [{'type': 'h2', 'content': 'Servicios'}] + [{'type': 'p', 'content': p} for p in paragraphs],
+        'links': [{'text': 'Reservar', 'href': '/reservar'}],
+        'images': [{'alt': 'Playa', 'src': 'https://ejemplo.test/playa.jpg'}],
+        'sections': [{'title': 'Spa', 'url': 'https://ejemplo.test/spa', 'content': [{'type': 'p', 'content': 'Masajes'}]}],
+    })
+
+
+def texts(slides, title):
+    slide, = [slide for slide in slides[1] if slide['title'] == title]
+    return [item['text'] for item in slide['content']]
+
+
+def test_plain_text_gives_the_same_slides_from_page_and_markdown():
+    source = page('Piscina y spa', 'Desayuno incluido en todas las tarifas.')
+
+    assert slides_from_page(source) == slides_from_markdown(build_markdown(source.to_scrape()))
+
+
+def test_markdown_like_text_gives_the_same_slides_from_page_and_markdown():
+    source = page('- Desayuno incluido', 'Línea 1\nLínea 2', '# No es un título', '    sangrado',
+                  '## Otra sección\nCon texto', '![Mapa](https://ejemplo.test/mapa.png)')
+
+    assert slides_from_page(source) == slides_from_markdown(build_markdown(source.to_scrape()))
+    assert texts(slides_from_page(source), 'Servicios') == [
+        'Desayuno incluido', 'Línea 1 Línea 2', 'No es un título', 'sangrado']
+
+
+def test_section_headings_and_errors_give_the_same_slides_from_page_and_markdown():
+    data = page('Piscina').to_scrape()
+    data['sections'] = [
+        {'title': 'Spa', 'url': 'https://ejemplo.test/spa',
+         'content': [{'type': 'h2', 'content': 'Tratamientos'}, {'type': 'p', 'content': '* Masajes\n* Sauna'}]},
+        {'title': 'Bar', 'url': 'https://ejemplo.test/bar', 'error': 'HTTP 503'},
+    ]
+    source = Page.from_scrape(data)
+
+    assert slides_from_page(source) == slides_from_markdown(build_markdown(data))
+
+
+def test_deck_comes_from_the_page_only_while_the_markdown_is_unchanged():
+    source = page('Piscina y spa')
+    markdown = build_markdown(source.to_scrape())
+
+    deck = SlideDeck.from_document(MarkdownDocument(markdown, source))
+    assert deck.url == source.url
+    assert (deck.title, deck.slides) == slides_from_page(source)
+
+    edited = markdown.replace('Piscina y spa', 'Piscina climatizada')
+    deck = SlideDeck.from_document(MarkdownDocument(edited, source))
+    assert deck.url is None
+    assert texts((deck.title, deck.slides), 'Servicios') == ['Piscina climatizada']
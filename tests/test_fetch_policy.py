@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from fetch_policy import BudgetExpiredError, CircuitBreaker, RetryPolicy, TimeBudget, parse_retry_after
+from http_pool import CircuitOpenError, HttpPool
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+def sequence(*responses):
+    """Ruta que responde con cada respuesta por turno y repite la última."""
+    remaining = list(responses)
+
+    def route(request):
+        return remaining.pop(0) if len(remaining) > 1 else remaining[0]
+    return route
+
+
+def pool(**kwargs):
+    kwargs.setdefault('retry_policy', RetryPolicy(retries=2, base=0))
+    return HttpPool(cache=None, **kwargs)
+
+
+def host(server):
+    return server.url().split('/')[2]
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_retries_after_the_delay_the_server_asks_for(stand_in_server, status):
+    stand_in_server.routes['/'] = sequence((status, {'Retry-After': '1'}, b''), (200, HTML, b'<p>ya</p>'))
+
+    start = time.perf_counter()
+    response = pool().get(stand_in_server.url())
+
+    assert response.content == b'<p>ya</p>'
+    assert stand_in_server.hits('/') == 2
+    assert time.perf_counter() - start >= 0.9
+
+
+def test_does_not_retry_when_retry_after_is_too_long(stand_in_server):
+    stand_in_server.routes['/'] = (429, {'Retry-After': '3600'}, b'')
+
+    response = pool().get(stand_in_server.url())
+
+    assert response.status_code == 429
+    assert stand_in_server.hits('/') == 1
+
+
+def test_gives_up_after_the_configured_retries(stand_in_server):
+    stand_in_server.routes['/'] = (503, {}, b'')
+
+    assert pool().get(stand_in_server.url()).status_code == 503
+    assert stand_in_server.hits('/') == 3
+
+
+def test_breaker_opens_and_recovers_after_cooldown(stand_in_server):
+    stand_in_server.routes['/'] = (500, {}, b'')
+    breaker = CircuitBreaker(failures=2, cooldown=0.3)
+    http = pool(retry_policy=RetryPolicy(retries=0), breaker=breaker)
+
+    http.get(stand_in_server.url())
+    http.get(stand_in_server.url())
+    with pytest.raises(CircuitOpenError):
+        http.get(stand_in_server.url())
+    assert stand_in_server.hits('/') == 2
+
+    # Pasado el periodo se deja pasar una petición de prueba; si va bien, el host se vuelve a abrir
+    time.sleep(0.35)
+    stand_in_server.routes['/'] = (200, HTML, b'<p>de vuelta</p>')
+    assert http.get(stand_in_server.url()).content == b'<p>de vuelta</p>'
+    assert http.get(stand_in_server.url()).status_code == 200
+    assert breaker.allow(host(stand_in_server))
+
+
+def test_failed_probe_reopens_the_breaker(stand_in_server):
+    stand_in_server.routes['/'] = (500, {}, b'')
+    breaker = CircuitBreaker(failures=1, cooldown=0.3)
+    http = pool(retry_policy=RetryPolicy(retries=0), breaker=breaker)
+
+    http.get(stand_in_server.url())
+    time.sleep(0.35)
+    http.get(stand_in_server.url())
+
+    with pytest.raises(CircuitOpenError):
+        http.get(stand_in_server.url())
+    assert stand_in_server.hits('/') == 2
+
+
+def test_budget_expiry_does_not_trip_the_breaker(stand_in_server):
+    def slow(request):
+        time.sleep(1)
+        return 200, HTML, b'<p>tarde</p>'
+
+    stand_in_server.routes['/lenta'] = slow
+    stand_in_server.routes['/'] = (200, HTML, b'<p>bien</p>')
+    breaker = CircuitBreaker(failures=1, cooldown=60)
+    http = pool(breaker=breaker)
+
+    start = time.perf_counter()
+    with pytest.raises(BudgetExpiredError):
+        http.get(stand_in_server.url('/lenta'), budget=TimeBudget(0.3))
+
+    assert time.perf_counter() - start < 0.9
+    assert breaker.allow(host(stand_in_server))
+    assert http.get(stand_in_server.url()).content == b'<p>bien</p>'
+
+
+def test_expired_budget_makes_no_request(stand_in_server):
+    budget = TimeBudget(0.05)
+    time.sleep(0.1)
+
+    with pytest.raises(BudgetExpiredError):
+        pool().get(stand_in_server.url(), budget=budget)
+    assert stand_in_server.requests == []
+
+
+def test_retry_delay_respects_budget_and_retry_after():
+    policy = RetryPolicy(retries=3, base=0.1, max_delay=1, retry_after_max=10)
+
+    assert 0 <= policy.delay(0) <= 0.1
+    assert policy.delay(0, '5') == 5
+    assert policy.delay(0, '11') is None
+    assert policy.delay(3) is None
+    assert policy.delay(0, '5', TimeBudget(1)) is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:10 GMT', now=1445412480) == 10
+    assert parse_retry_after('pronto') is None
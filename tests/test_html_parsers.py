@@ -0,0 +1,120 @@
+import pytest
+
+import html_parsers
+from html_parsers import HtmlParserBackendSoup, get_backend
+from scraper import MAIN_TAGS, SECTION_TAGS, extract_page
+
+FAST_BACKENDS = {'selectolax': 'selectolax.lexbor', 'lxml': 'lxml.html'}
+
+PAGE = '''<!DOCTYPE html>
+<html lang="es">
+<head>
+  <meta charset="utf-8">
+  <title>Hotel &ndash; Inicio</title>
+  <style>p > a { color: red }</style>
+  <script>if (a < b && c > d) { track("<p>"); }</script>
+</head>
+<body>
+  <nav>
+    <ul>
+      <li><a href="/habitaciones">Habitaciones</a></li>
+      <li><a href="/spa">Spa &amp; bienestar</a></li>
+    </ul>
+  </nav>
+  <main>
+    <h1>Grand Oasis</h1>
+    <p>Frente al mar <a href="/playa">ver <b>playa</b></a>
+      &amp; piscina&nbsp;&copy;</p>
+    <figure>
+      <img src="/img/suite.jpg" alt=" Suite ">
+      <img src="/img/sin-alt.jpg">
+    </figure>
+    <h2>Tarifas</h2>
+    <table>
+      <tr><td><p>Suite</p></td><td>120 &euro;</td></tr>
+    </table>
+    <pre>
+  precio   noche
+</pre>
+    <p><b>Desayuno</b>
+       <i>incluido</i></p>
+    <template><p>oculto</p></template>
+  </main>
+  <footer><p>&copy; Grand Oasis</p></footer>
+</body>
+</html>
+'''
+
+
+@pytest.fixture(params=sorted(FAST_BACKENDS))
+def backend(request):
+    pytest.importorskip(FAST_BACKENDS[request.param])
+    return html_parsers.BACKENDS[request.param][0]()
+
+
+def extract(html, backend):
+    return [
+        extract_page(html, MAIN_TAGS, backend=backend),
+        extract_page(html, SECTION_TAGS, per_tag_limit=5, backend=backend),
+    ]
+
+
+def contents(html, backend):
+    return [block['content'] for block in extract_page(html, ['p', 'h2'], backend=backend)['content']]
+
+
+def test_well_formed_page_matches_html_parser(backend):
+    assert extract(PAGE, backend) == extract(PAGE, HtmlParserBackendSoup())
+
+
+@pytest.mark.parametrize('html, expected', [
+    ('<p>uno <script>var x = "<p>no</p>";</script>dos</p>', ['uno dos']),
+    ('<p>a<style>p { color: red }</style>b</p>', ['ab']),
+    ('<template><p>oculto</p></template><p>visible</p>', ['visible']),
+    ('<p>a<template>b</template>c</p>', ['ac']),
+    ('<p><b>x</b>\n    <i>y</i></p>', ['x\ny']),
+    ('<pre>\n  a  </pre><p>b\n  c</p>', ['b\n  c']),
+    ('<p>a</p></body>\n<p>b</p>', ['a', 'b']),
+])
+def test_edge_cases_match_html_parser(html, expected, backend):
+    assert contents(html, HtmlParserBackendSoup()) == expected
+    assert contents(html, backend) == expected
+
+
+# Diferencias conocidas en HTML mal formado (ver html_parsers)
+@pytest.mark.parametrize('html, expected', [
+    # Un <p> sin cerrar se cierra al abrir un bloque
+    ('<p>a<p>b<div>c</div>', {'html.parser': ['abc', 'bc'], 'lxml': ['a', 'b'], 'selectolax': ['a', 'b']}),
+    ('<p>a<ul><li>x</li></ul>b</p>', {'html.parser': ['axb'], 'lxml': ['a'], 'selectolax': ['a']}),
+    # Encabezados y enlaces mal anidados
+    ('<h2>a<p>b</p></h2>', {'html.parser': ['ab', 'b'], 'lxml': ['a', 'b'], 'selectolax': ['ab', 'b']}),
+    ('<p><a href="/">uno<p>dos</a></p>',
+     {'html.parser': ['unodos', 'dos'], 'lxml': ['unodos', 'dos'], 'selectolax': ['uno', 'dos']}),
+    # Contenido suelto dentro de una tabla
+    ('<table><tr><td>x</td></tr><p>suelto</p></table><p>fin</p>',
+     {'html.parser': ['suelto', 'fin'], 'lxml': ['suelto', 'fin'], 'selectolax': ['suelto', 'fin']}),
+    ('<table><tr><td><p>celda</p></td></tr><p>suelto</p></table>',
+     {'html.parser': ['celda', 'suelto'], 'lxml': ['celda', 'suelto'], 'selectolax': ['suelto', 'celda']}),
+    # Texto tras </html>
+    ('<p>a</p></html>tras<p>b</p>', {'html.parser': ['a', 'b'], 'lxml': ['a'], 'selectolax': ['a', 'b']}),
+    # Entidades sin ';'
+    ('<p>&copy2024 x &lt3 y</p>',
+     {'html.parser': ['&copy2024 x &lt3 y'], 'lxml': ['©2024 x <3 y'], 'selectolax': ['©2024 x <3 y']}),
+])
+def test_known_differences_on_malformed_html(html, expected, backend):
+    assert contents(html, HtmlParserBackendSoup()) == expected['html.parser']
+    assert contents(html, backend) == expected[backend.name]
+
+
+def test_auto_uses_the_fastest_installed_backend(monkeypatch):
+    monkeypatch.setattr(html_parsers, '_backends', {})
+    monkeypatch.setattr(html_parsers, 'available_backends', lambda: ['lxml', 'html.parser'])
+    assert get_backend('auto').name == 'lxml'
+    assert get_backend('selectolax').name == 'html.parser'
+
+
+def test_auto_falls_back_to_html_parser(monkeypatch):
+    monkeypatch.setattr(html_parsers, '_backends', {})
+    monkeypatch.setattr(html_parsers, 'available_backends', lambda: ['html.parser'])
+    assert get_backend('auto').name == 'html.parser'
+    assert get_backend('no-existe').name == 'html.parser'
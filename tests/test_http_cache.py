@@ -0,0 +1,164 @@
+import hashlib
+import os
+
+import pytest
+import requests
+
+from disk_cache import DiskCache
+from http_pool import ContentTypeError, HttpPool
+
+HTML = {'Content-Type': 'text/html; charset=utf-8'}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / 'cache'), 1024 * 1024)
+
+
+def etag_route(body, etag='"v1"'):
+    def route(request):
+        if request.headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, dict(HTML, ETag=etag), body
+    return route
+
+
+def test_revalidates_with_etag_and_serves_304_from_cache(stand_in_server, cache):
+    stand_in_server.routes['/'] = etag_route(b'<p>hola</p>')
+    pool = HttpPool(cache=cache)
+
+    first = pool.get(stand_in_server.url())
+    second = pool.get(stand_in_server.url())
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == b'<p>hola</p>'
+    assert 'If-None-Match' not in stand_in_server.requests[0][1]
+    assert stand_in_server.requests[1][1]['If-None-Match'] == '"v1"'
+
+
+def test_revalidates_with_last_modified(stand_in_server, cache):
+    modified = 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    def route(request):
+        if request.headers.get('If-Modified-Since') == modified:
+            return 304, {}, b''
+        return 200, dict(HTML, **{'Last-Modified': modified}), b'<p>fecha</p>'
+
+    stand_in_server.routes['/'] = route
+    pool = HttpPool(cache=cache)
+    pool.get(stand_in_server.url())
+
+    assert pool.get(stand_in_server.url()).content == b'<p>fecha</p>'
+    assert stand_in_server.requests[1][1]['If-Modified-Since'] == modified
+
+
+def test_changed_page_replaces_cached_copy(stand_in_server, cache):
+    stand_in_server.routes['/'] = etag_route(b'<p>v1</p>')
+    pool = HttpPool(cache=cache)
+    pool.get(stand_in_server.url())
+
+    stand_in_server.routes['/'] = etag_route(b'<p>v2</p>', '"v2"')
+    assert pool.get(stand_in_server.url()).content == b'<p>v2</p>'
+    assert cache.get(stand_in_server.url())[0] == b'<p>v2</p>'
+
+
+def test_offline_mode_serves_only_cached_pages(stand_in_server, cache):
+    stand_in_server.routes['/'] = etag_route(b'<p>hola</p>')
+    HttpPool(cache=cache).get(stand_in_server.url())
+
+    offline = HttpPool(cache=cache, offline=True)
+    assert offline.get(stand_in_server.url()).content == b'<p>hola</p>'
+    with pytest.raises(requests.ConnectionError):
+        offline.get(stand_in_server.url('/otra'))
+    assert len(stand_in_server.requests) == 1
+
+
+def test_size_cap_truncates_and_is_not_cached(stand_in_server, cache):
+    stand_in_server.routes['/grande'] = (200, HTML, b'x' * 300_000)
+    pool = HttpPool(cache=cache)
+
+    response = pool.get(stand_in_server.url('/grande'), max_bytes=100_000)
+
+    assert response.truncated
+    assert len(response.content) == 100_000
+    assert cache.get(stand_in_server.url('/grande')) is None
+
+
+def test_unexpected_content_type_aborts_before_body(stand_in_server, cache):
+    stand_in_server.routes['/doc.pdf'] = (200, {'Content-Type': 'application/pdf'}, b'%PDF' * 1000)
+    pool = HttpPool(cache=cache)
+
+    with pytest.raises(ContentTypeError):
+        pool.get(stand_in_server.url('/doc.pdf'), content_types=('text/html',))
+    assert cache.get(stand_in_server.url('/doc.pdf')) is None
+
+
+def test_no_store_responses_are_not_cached(stand_in_server, cache):
+    stand_in_server.routes['/'] = (200, dict(HTML, **{'Cache-Control': 'no-store'}), b'<p>privado</p>')
+    HttpPool(cache=cache).get(stand_in_server.url())
+    assert cache.get(stand_in_server.url()) is None
+
+
+def test_eviction_removes_least_recently_used_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), 250)
+    cache.put('a', b'a' * 100)
+    cache.put('b', b'b' * 100)
+    os.utime(cache._entry_path('a'), (1, 1))
+    os.utime(cache._entry_path('b'), (2, 2))
+    cache.get('a')
+
+    cache.put('c', b'c' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+
+
+def test_identical_bodies_share_one_blob(tmp_path):
+    cache = DiskCache(str(tmp_path), 150)
+    cache.put('a', b'z' * 100)
+    cache.put('b', b'z' * 100)
+
+    assert cache.get('a')[0] == cache.get('b')[0] == b'z' * 100
+    assert cache._blobs_size() == 100
+
+
+def test_size_is_tracked_across_instances(tmp_path):
+    DiskCache(str(tmp_path), 250).put('a', b'a' * 200)
+
+    cache = DiskCache(str(tmp_path), 250)
+    cache.put('b', b'b' * 100)
+
+    assert cache.get('a') is None
+    assert cache._size == 100
+
+
+def test_rewriting_a_key_keeps_disk_use_under_the_cap(tmp_path):
+    cache = DiskCache(str(tmp_path), 1000)
+    for i in range(50):
+        cache.put('a', str(i).encode() * 300)
+
+    assert cache.get('a')[0] == b'49' * 300
+    assert cache._blobs_size() == cache._size <= 1000
+    assert len(cache._blob_files()) == 1
+
+
+def test_rewriting_a_key_keeps_a_blob_shared_with_another_key(tmp_path):
+    cache = DiskCache(str(tmp_path), 1000)
+    cache.put('a', b'z' * 100)
+    cache.put('b', b'z' * 100)
+
+    cache.put('a', b'y' * 100)
+
+    assert cache.get('b')[0] == b'z' * 100
+    assert cache._blobs_size() == cache._size == 200
+
+
+def test_eviction_sweeps_unreferenced_blobs(tmp_path):
+    cache = DiskCache(str(tmp_path), 250)
+    cache.put('a', b'a' * 100)
+    cache._write_atomic(cache._blob_path('0' * 64), b'huerfano' * 50)
+
+    cache.put('b', b'b' * 200)
+
+    assert set(cache._blob_files()) == {hashlib.sha256(b'b' * 200).hexdigest()}
+    assert cache._size == 200
@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+from disk_cache import DiskCache
+import image_pipeline
+from image_pipeline import optimize_image
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def png(width, height):
+    output = io.BytesIO()
+    Image.effect_noise((width, height), 64).convert('RGB').save(output, 'PNG')
+    return output.getvalue()
+
+
+def test_large_image_is_reduced_to_slide_size(tmp_path):
+    data, content_type = optimize_image(png(800, 400), 'image/png', max_size=(200, 200), image_format='jpeg')
+
+    assert content_type == 'image/jpeg'
+    assert Image.open(io.BytesIO(data)).size == (200, 100)
+
+
+def test_undecodable_image_is_kept_as_is():
+    assert optimize_image(b'no es una imagen', 'image/png') == (b'no es una imagen', 'image/png')
+
+
+def test_conversion_is_cached_by_content(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), 1024 * 1024)
+    original = png(400, 400)
+    first = optimize_image(original, 'image/png', cache, max_size=(100, 100), image_format='jpeg')
+
+    monkeypatch.setattr(image_pipeline, '_convert', None)
+    assert optimize_image(original, 'image/png', cache, max_size=(100, 100), image_format='jpeg') == first
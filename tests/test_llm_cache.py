@@ -0,0 +1,53 @@
+import pytest
+
+crewai = pytest.importorskip('crewai')
+
+from disk_cache import DiskCache  # noqa: E402
+from llm_cache import CachedLLM, stand_in_response  # noqa: E402
+
+MESSAGES = [{'role': 'user', 'content': 'Resume la página'}]
+
+
+@pytest.fixture
+def model_calls(monkeypatch):
+    calls = []
+
+    # Misma firma que LLM.call de crewai
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        calls.append(messages)
+        return f'respuesta {len(calls)}'
+
+    monkeypatch.setattr(crewai.LLM, 'call', call)
+    return calls
+
+
+def test_records_then_serves_from_cache(model_calls, tmp_path):
+    llm = CachedLLM('gpt-4o-mini', cache=DiskCache(str(tmp_path), 1024 * 1024))
+
+    assert llm.call(MESSAGES) == 'respuesta 1'
+    assert llm.call(MESSAGES) == 'respuesta 1'
+    assert len(model_calls) == 1
+
+
+def test_replay_serves_recorded_answers_without_the_model(model_calls, tmp_path):
+    cache = DiskCache(str(tmp_path), 1024 * 1024)
+    CachedLLM('gpt-4o-mini', cache=cache).call(MESSAGES)
+
+    # ttl=0: en replay las respuestas caducadas se siguen sirviendo
+    replay = CachedLLM('gpt-4o-mini', cache=cache, ttl=0, replay=True)
+    other = [{'role': 'user', 'content': 'Otra pregunta'}]
+
+    assert replay.call(MESSAGES) == 'respuesta 1'
+    assert replay.call(other) == stand_in_response(other)
+    assert len(model_calls) == 1
+    # La respuesta del modelo local no se guarda
+    assert CachedLLM('gpt-4o-mini', cache=cache).call(other) == 'respuesta 2'
+
+
+def test_tools_passed_by_position_are_part_of_the_key(model_calls, tmp_path):
+    llm = CachedLLM('gpt-4o-mini', cache=DiskCache(str(tmp_path), 1024 * 1024))
+    tools = [{'name': 'buscar'}]
+
+    assert llm.call(MESSAGES, tools) == 'respuesta 1'
+    assert llm.call(MESSAGES, tools=tools) == 'respuesta 1'
+    assert llm.call(MESSAGES) == 'respuesta 2'
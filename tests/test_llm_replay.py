@@ -0,0 +1,82 @@
+import pytest
+
+import crew_setup
+import llm_replay
+from disk_cache import DiskCache
+from llm_replay import cache_key, cached_response, record_response, stand_in_response
+
+MESSAGES = [{'role': 'user', 'content': 'Resume la página'}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / 'llm'), 1024 * 1024)
+
+
+def test_cache_key_depends_on_every_part_of_the_call():
+    key = cache_key('gpt-4o-mini', MESSAGES)
+
+    assert key.startswith('llm:')
+    assert cache_key('gpt-4o-mini', MESSAGES) == key
+    assert cache_key('gpt-4o', MESSAGES) != key
+    assert cache_key('gpt-4o-mini', MESSAGES, temperature=0.2) != key
+    assert cache_key('gpt-4o-mini', MESSAGES, stop=['Observation:']) != key
+    assert cache_key('gpt-4o-mini', MESSAGES, tools=[{'name': 'buscar'}]) != key
+    assert cache_key('gpt-4o-mini', [{'role': 'user', 'content': 'Otra pregunta'}]) != key
+
+
+def test_cache_key_treats_a_string_as_a_user_message():
+    assert cache_key('gpt-4o-mini', 'Resume la página') == cache_key('gpt-4o-mini', MESSAGES)
+
+
+def test_stand_in_response_answers_with_the_last_user_message():
+    messages = [
+        {'role': 'system', 'content': 'Eres un analista'},
+        {'role': 'user', 'content': 'Primera'},
+        {'role': 'user', 'content': '\n  Segunda pregunta\nmás detalle'},
+    ]
+
+    response = stand_in_response(messages)
+
+    assert response.endswith('Final Answer: Segunda pregunta')
+    assert stand_in_response(messages) == response
+
+
+def test_records_and_serves_text_responses(cache):
+    key = cache_key('gpt-4o-mini', MESSAGES)
+    assert cached_response(cache, key, ttl=60) is None
+
+    record_response(cache, key, 'respuesta', 'gpt-4o-mini')
+
+    assert cached_response(cache, key, ttl=60) == 'respuesta'
+
+
+def test_does_not_record_empty_or_non_text_responses(cache):
+    record_response(cache, 'llm:vacia', '', 'gpt-4o-mini')
+    record_response(cache, 'llm:funcion', {'tool': 'buscar'}, 'gpt-4o-mini')
+
+    assert cached_response(cache, 'llm:vacia', ttl=60) is None
+    assert cached_response(cache, 'llm:funcion', ttl=60) is None
+
+
+def test_replay_serves_expired_responses(cache):
+    key = cache_key('gpt-4o-mini', MESSAGES)
+    record_response(cache, key, 'respuesta', 'gpt-4o-mini')
+
+    assert cached_response(cache, key, ttl=0) is None
+    assert cached_response(cache, key, ttl=0, replay=True) == 'respuesta'
+
+
+def test_without_cache_nothing_is_served_or_recorded():
+    record_response(None, 'llm:x', 'respuesta', 'gpt-4o-mini')
+
+    assert cached_response(None, 'llm:x', ttl=60, replay=True) is None
+
+
+def test_crew_memory_is_disabled_in_replay(monkeypatch):
+    monkeypatch.setattr(llm_replay, 'LLM_REPLAY', False)
+    assert crew_setup.crew_memory(True) is True
+    assert crew_setup.crew_memory(False) is False
+
+    monkeypatch.setattr(llm_replay, 'LLM_REPLAY', True)
+    assert crew_setup.crew_memory(True) is False
@@ -0,0 +1,109 @@
+import io
+
+import pytest
+
+from markdown_builder import build_markdown, iter_markdown_parts, write_markdown
+
+
+def baseline_build_markdown(data):
+    """build_markdown anterior al generador por fragmentos, copiado tal cual como referencia."""
+    markdown = f"# {data['title']}\n\n"
+    markdown += f"*Contenido extraído de: {data['url']}*\n\n"
+
+    # Contenido principal
+    markdown += "## Contenido Principal\n\n"
+    for item in data['main_content']:
+        if item['type'] == 'h1':
+            markdown += f"# {item['content']}\n\n"
+        elif item['type'] == 'h2':
+            markdown += f"## {item['content']}\n\n"
+        elif item['type'] == 'h3':
+            markdown += f"### {item['content']}\n\n"
+        else:
+            markdown += f"{item['content']}\n\n"
+
+    # Secciones
+    if 'sections' in data:
+        markdown += "## Secciones Principales\n\n"
+        for section in data['sections']:
+            markdown += f"### {section['title']}\n\n"
+            if 'error' in section:
+                markdown += f"*No se pudo acceder a esta sección: {section['error']}*\n\n"
+            else:
+                for item in section['content']:
+                    if item['type'] == 'h1':
+                        markdown += f"#### {item['content']}\n\n"
+                    elif item['type'] == 'h2':
+                        markdown += f"#### {item['content']}\n\n"
+                    else:
+                        markdown += f"{item['content']}\n\n"
+
+            markdown += f"[Ver más en {section['url']}]({section['url']})\n\n"
+
+    # Imágenes destacadas
+    if data['images'] and len(data['images']) > 0:
+        markdown += "## Imágenes Destacadas\n\n"
+        for img in data['images']:
+            markdown += f"![{img['alt']}]({img['src']})\n\n"
+
+    # Enlaces importantes
+    if data['links'] and len(data['links']) > 0:
+        markdown += "## Enlaces Importantes\n\n"
+        for link in data['links'][:5]:
+            href = link['href']
+            if not href.startswith('http'):
+                base_url = '/'.join(data['url'].split('/')[:3])
+                href = base_url + href
+            markdown += f"- [{link['text']}]({href})\n"
+
+    return markdown
+
+
+FULL = {
+    'url': 'https://grand-oasis-cancun.com/es/hotel',
+    'title': 'Grand Oasis Cancún',
+    'main_content': [
+        {'type': 'h1', 'content': 'Bienvenidos'},
+        {'type': 'p', 'content': 'Todo incluido frente al mar.'},
+        {'type': 'h2', 'content': 'Habitaciones'},
+        {'type': 'h3', 'content': 'Suites'},
+        {'type': 'p', 'content': '- Desayuno incluido\nLínea 2'},
+    ],
+    'links': [
+        {'text': 'Reservar', 'href': '/es/reservar'},
+        {'text': 'Spa', 'href': 'https://grand-oasis-cancun.com/es/spa'},
+        {'text': 'Ofertas', 'href': 'ofertas'},
+        {'text': 'Golf', 'href': '/golf'},
+        {'text': 'Bodas', 'href': '/bodas'},
+        {'text': 'Sexto enlace', 'href': '/sexto'},
+    ],
+    'images': [
+        {'alt': 'Playa', 'src': 'https://grand-oasis-cancun.com/img/playa.jpg'},
+        {'alt': 'Piscina [noche]', 'src': '/img/piscina.jpg'},
+    ],
+    'sections': [
+        {'title': 'Spa', 'url': 'https://grand-oasis-cancun.com/es/spa', 'content': [
+            {'type': 'h1', 'content': 'Spa'},
+            {'type': 'h2', 'content': 'Tratamientos'},
+            {'type': 'h3', 'content': 'Masajes'},
+            {'type': 'p', 'content': 'Masajes y circuito de hidroterapia.'},
+        ]},
+        {'title': 'Golf', 'url': 'https://grand-oasis-cancun.com/es/golf', 'error': '503 Server Error'},
+        {'title': 'Vacía', 'url': 'https://grand-oasis-cancun.com/es/vacia', 'content': []},
+    ],
+}
+MINIMAL = {'url': 'https://ejemplo.test', 'title': '', 'main_content': [], 'links': [], 'images': []}
+NO_SECTIONS = {key: value for key, value in FULL.items() if key != 'sections'}
+EMPTY_SECTIONS = dict(FULL, sections=[], links=None, images=None)
+
+
+@pytest.mark.parametrize('data', [FULL, MINIMAL, NO_SECTIONS, EMPTY_SECTIONS],
+                         ids=['completa', 'minima', 'sin-secciones', 'secciones-vacias'])
+def test_output_is_identical_to_the_baseline_converter(data):
+    expected = baseline_build_markdown(data)
+    written = io.StringIO()
+    write_markdown(data, written)
+
+    assert build_markdown(data) == expected
+    assert written.getvalue() == expected
+    assert ''.join(''.join(fragments) for _, fragments in iter_markdown_parts(data)) == expected
@@ -0,0 +1,41 @@
+from revealjs_renderer import render_revealjs, render_slide
+
+NASTY = '<script>alert("x")</script> & \'co\''
+
+
+def test_titles_and_text_are_escaped():
+    html = render_slide({'title': NASTY, 'type': 'content', 'content': [{'type': 'text', 'text': NASTY}]})
+
+    assert '<script>' not in html
+    assert '<h2>&lt;script&gt;alert("x")&lt;/script&gt; &amp; \'co\'</h2>' in html
+    assert '<p>&lt;script&gt;alert("x")&lt;/script&gt; &amp; \'co\'</p>' in html
+
+
+def test_title_slide_and_document_title_are_escaped():
+    html = render_revealjs('Tom & Jerry <b>', [{'title': 'A & B', 'type': 'title', 'content': []}])
+
+    assert '<title>Tom &amp; Jerry &lt;b&gt;</title>' in html
+    assert '<h1>A &amp; B</h1>' in html
+
+
+def test_attributes_are_escaped_with_quotes():
+    html = render_slide({'title': 'Enlaces', 'type': 'content', 'content': [
+        {'type': 'image', 'src': '/img.png?a=1&b="2"', 'alt': 'foto" onerror="alert(1)'},
+        {'type': 'link', 'href': 'https://ejemplo.test/?q=\'x\'&r=<y>', 'text': 'Ver <más> & "todo"'},
+    ]})
+
+    assert '<img src="/img.png?a=1&amp;b=&quot;2&quot;" alt="foto&quot; onerror=&quot;alert(1)">' in html
+    assert ('<a href="https://ejemplo.test/?q=&#x27;x&#x27;&amp;r=&lt;y&gt;" target="_blank">'
+            'Ver &lt;más&gt; &amp; "todo"</a>') in html
+    assert 'onerror="' not in html
+
+
+def test_plain_values_are_left_untouched():
+    html = render_slide({'title': 'Piscina', 'type': 'content', 'content': [
+        {'type': 'text', 'text': 'Abierta de 8 a 20 h'},
+        {'type': 'link', 'href': 'https://ejemplo.test/spa', 'text': 'Spa'},
+    ]})
+
+    assert '<h2>Piscina</h2>' in html
+    assert '<p>Abierta de 8 a 20 h</p>' in html
+    assert '<a href="https://ejemplo.test/spa" target="_blank">Spa</a>' in html
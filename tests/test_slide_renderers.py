@@ -0,0 +1,74 @@
+from revealjs_renderer import render_revealjs
+from slide_renderers import paginate_slides
+
+
+def text(n, size=10):
+    return {'type': 'text', 'text': str(n) * size}
+
+
+def contents(slides):
+    return [[item['text'][0] for item in slide['content']] for slide in slides]
+
+
+def test_item_budget_splits_into_continuation_pages():
+    slide = {'title': 'Servicios', 'type': 'content', 'content': [text(i) for i in range(7)]}
+
+    pages = paginate_slides([slide], max_items=3, max_chars=0)
+
+    assert contents(pages) == [['0', '1', '2'], ['3', '4', '5'], ['6']]
+    assert [page['title'] for page in pages] == ['Servicios'] * 3
+    assert [page.get('continued', False) for page in pages] == [False, True, True]
+    # La diapositiva original no se modifica
+    assert len(slide['content']) == 7
+
+
+def test_char_budget_counts_text_and_alt():
+    slide = {'title': 'Galería', 'type': 'content', 'content': [
+        text(1, 40), {'type': 'image', 'src': '/a.jpg', 'alt': 'x' * 40}, text(2, 30), text(3, 10),
+    ]}
+
+    pages = paginate_slides([slide], max_items=0, max_chars=80)
+
+    assert [len(page['content']) for page in pages] == [2, 2]
+    assert pages[0]['content'][1]['type'] == 'image'
+
+
+def test_long_single_item_gets_a_page_of_its_own():
+    slide = {'title': 'Historia', 'type': 'content', 'content': [text(1), text(2, 500), text(3)]}
+
+    pages = paginate_slides([slide], max_items=8, max_chars=100)
+
+    assert contents(pages) == [['1'], ['2'], ['3']]
+
+
+def test_slides_within_budget_and_disabled_budget_are_unchanged():
+    slides = [{'title': 'Breve', 'type': 'content', 'content': [text(1)]}]
+
+    assert paginate_slides(slides, max_items=3, max_chars=100) == slides
+    big = [{'title': 'Larga', 'type': 'content', 'content': [text(i, 1000) for i in range(20)]}]
+    assert paginate_slides(big, max_items=0, max_chars=0) is big
+
+
+def test_title_slide_continues_as_content():
+    slide = {'title': 'Hotel', 'type': 'title', 'content': [text(i) for i in range(3)]}
+
+    pages = paginate_slides([slide], max_items=2, max_chars=0)
+
+    assert [page['type'] for page in pages] == ['title', 'content']
+
+
+def test_revealjs_stacks_continuation_pages_vertically():
+    slides = [
+        {'title': 'Portada', 'type': 'title', 'content': []},
+        {'title': 'Servicios', 'type': 'content', 'content': [text(i) for i in range(5)]},
+        {'title': 'Gracias', 'type': 'end', 'content': []},
+    ]
+
+    html = render_revealjs('Hotel', paginate_slides(slides, max_items=2, max_chars=0))
+    body = html[html.index('<div class="slides">'):html.index('<script src=')]
+
+    # Una pila con las tres páginas de Servicios entre la portada y el final
+    stack = body[body.index('            <section>\n'):body.index('            </section>\n            <section class="thanks-slide">')]
+    assert stack.count('<h2>Servicios</h2>') == 3
+    assert stack.count('<section class="">') == 3
+    assert body.count('            <section>\n') == 1